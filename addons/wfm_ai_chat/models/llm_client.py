@@ -303,7 +303,7 @@ When responding:
                 "type": "function",
                 "function": {
                     "name": "wfm_send_visit_notification",
-                    "description": "Send a predefined WhatsApp notification for a visit (assignment, confirmation, reminder, or cancellation)",
+                    "description": "Send a predefined WhatsApp notification for a visit (assignment, confirmation, reminder, or cancellation). Pass visit_ids to notify many visits at once; they are queued and sent in the background.",
                     "parameters": {
                         "type": "object",
                         "properties": {
@@ -311,13 +311,18 @@ When responding:
                                 "type": "integer",
                                 "description": "Visit ID to send notification for"
                             },
+                            "visit_ids": {
+                                "type": "array",
+                                "items": {"type": "integer"},
+                                "description": "Visit IDs for a bulk send (queued, returns a broadcast reference)"
+                            },
                             "type": {
                                 "type": "string",
                                 "enum": ["assignment", "confirmed", "reminder", "cancelled"],
                                 "description": "Type of notification to send"
                             }
                         },
-                        "required": ["visit_id", "type"]
+                        "required": ["type"]
                     }
                 }
             },
@@ -347,6 +352,10 @@ When responding:
                                 "enum": ["assignment", "confirmed", "reminder", "cancelled", "custom"],
                                 "description": "Filter by message type"
                             },
+                            "broadcast_ref": {
+                                "type": "string",
+                                "description": "Filter by bulk send reference and include its progress"
+                            },
                             "limit": {
                                 "type": "integer",
                                 "description": "Maximum number of messages to return (default 10)"
@@ -565,7 +574,7 @@ When responding:
                 "type": "function",
                 "function": {
                     "name": "wfm_log_retention_action",
-                    "description": "Log a retention intervention/action for a partner (call, email, meeting, etc.)",
+                    "description": "Log a retention intervention/action for a partner (call, email, meeting, etc.), or the same action for several partners",
                     "parameters": {
                         "type": "object",
                         "properties": {
@@ -573,6 +582,11 @@ When responding:
                                 "type": "integer",
                                 "description": "Health record ID for the partner"
                             },
+                            "health_ids": {
+                                "type": "array",
+                                "items": {"type": "integer"},
+                                "description": "Health record IDs, to log the same action for several partners at once"
+                            },
                             "intervention_type": {
                                 "type": "string",
                                 "enum": ["call", "whatsapp", "email", "meeting", "bonus", "workload"],
@@ -588,7 +602,7 @@ When responding:
                                 "description": "Outcome of the intervention"
                             }
                         },
-                        "required": ["health_id", "intervention_type"]
+                        "required": ["intervention_type"]
                     }
                 }
             },
@@ -691,7 +705,7 @@ When responding:
                 "type": "function",
                 "function": {
                     "name": "wfm_create_sepe_export",
-                    "description": "Create a new SEPE export batch for completed visits in a date range. Automatically generates Excel file.",
+                    "description": "Create a new SEPE export batch for completed visits in a date range. Queues generation of the export file in the background.",
                     "parameters": {
                         "type": "object",
                         "properties": {
@@ -709,7 +723,12 @@ When responding:
                             },
                             "generate_excel": {
                                 "type": "boolean",
-                                "description": "Generate Excel file immediately (default true)"
+                                "description": "Queue generation of the export file (default true)"
+                            },
+                            "export_format": {
+                                "type": "string",
+                                "enum": ["xlsx", "csv", "parquet"],
+                                "description": "File format: xlsx for SEPE submission (default), csv or parquet for reconciliation"
                             }
                         },
                         "required": ["date_from", "date_to"]
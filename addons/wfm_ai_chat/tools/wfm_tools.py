@@ -370,15 +370,18 @@ class WfmToolExecutor(models.AbstractModel):
             return {'error': str(e)}
 
     def _tool_wfm_send_visit_notification(self, args):
-        """Send a predefined WhatsApp notification for a visit."""
-        if not args.get('visit_id'):
-            return {'error': 'visit_id is required'}
+        """Send a predefined WhatsApp notification for one or many visits."""
+        if not args.get('visit_id') and not args.get('visit_ids'):
+            return {'error': 'visit_id or visit_ids is required'}
 
         notification_type = args.get('type', 'assignment')
         valid_types = ['assignment', 'confirmed', 'reminder', 'cancelled']
         if notification_type not in valid_types:
             return {'error': f"Invalid type. Must be one of: {', '.join(valid_types)}"}
 
+        if args.get('visit_ids'):
+            return self._send_bulk_visit_notification(args['visit_ids'], notification_type)
+
         Visit = self.env['wfm.visit']
         visit = Visit.browse(args['visit_id'])
 
@@ -415,6 +418,34 @@ class WfmToolExecutor(models.AbstractModel):
         except Exception as e:
             return {'error': str(e)}
 
+    def _send_bulk_visit_notification(self, visit_ids, notification_type):
+        """Enqueue one notification per visit; sending happens in the background."""
+        visits = self.env['wfm.visit'].browse(visit_ids).exists()
+        if not visits:
+            return {'error': 'None of the given visits were found'}
+
+        try:
+            messages, skipped = visits._enqueue_whatsapp_notifications(notification_type)
+        except Exception as e:
+            return {'error': str(e)}
+
+        if not messages:
+            return {
+                'success': False,
+                'error': 'None of the visits has a partner with a phone number',
+            }
+
+        broadcast_ref = messages[0].broadcast_ref
+        return {
+            'success': True,
+            'message': f"{len(messages)} {notification_type} notification(s) queued",
+            'type': notification_type,
+            'queued': len(messages),
+            'skipped_visits': skipped.mapped('name'),
+            'broadcast_ref': broadcast_ref,
+            'progress': self.env['wfm.whatsapp.message'].get_broadcast_progress(broadcast_ref),
+        }
+
     def _tool_wfm_list_whatsapp_messages(self, args):
         """List WhatsApp message history."""
         WhatsApp = self.env['wfm.whatsapp.message']
@@ -432,6 +463,9 @@ class WfmToolExecutor(models.AbstractModel):
         if args.get('message_type'):
             domain.append(('message_type', '=', args['message_type']))
 
+        if args.get('broadcast_ref'):
+            domain.append(('broadcast_ref', '=', args['broadcast_ref']))
+
         limit = args.get('limit', 10)
         messages = WhatsApp.search(domain, limit=limit, order='sent_at desc')
 
@@ -449,10 +483,13 @@ class WfmToolExecutor(models.AbstractModel):
                 'error': m.error_message if m.status == 'failed' else None,
             })
 
-        return {
+        response = {
             'count': len(result),
             'messages': result
         }
+        if args.get('broadcast_ref'):
+            response['progress'] = WhatsApp.get_broadcast_progress(args['broadcast_ref'])
+        return response
 
     # ==================== Workflow Tools ====================
 
@@ -659,6 +696,7 @@ class WfmToolExecutor(models.AbstractModel):
 
         limit = args.get('limit', 20)
         health_records = PartnerHealth.search(domain, limit=limit, order='churn_risk_score desc')
+        suggestions = health_records._get_ai_suggestions()
 
         result = []
         for h in health_records:
@@ -674,6 +712,9 @@ class WfmToolExecutor(models.AbstractModel):
                 'days_since_last_visit': h.days_since_last_visit,
                 'visits_declined_30d': h.visits_declined_30d,
                 'risk_trend': h.risk_trend,
+                'last_action_date': h.last_intervention_date.strftime('%d/%m/%Y') if h.last_intervention_date else None,
+                'last_action_type': h.last_intervention_type or None,
+                'suggested_action': suggestions[h.id][0],
             })
 
         return {
@@ -731,6 +772,8 @@ class WfmToolExecutor(models.AbstractModel):
             },
         }
 
+        suggested_action, suggestion_reason = health._get_ai_suggestion()
+
         return {
             'health_id': health.id,
             'partner': {
@@ -750,54 +793,72 @@ class WfmToolExecutor(models.AbstractModel):
                 'planned_action': health.planned_action,
             },
             'ai_advice': health.ai_advice_text or None,
+            'suggested_action': {
+                'action': suggested_action,
+                'reason': suggestion_reason,
+            },
         }
 
     def _tool_wfm_log_retention_action(self, args):
-        """Log a retention intervention/action for a partner."""
-        if not args.get('health_id') or not args.get('intervention_type'):
-            return {'error': 'Both health_id and intervention_type are required'}
+        """Log a retention intervention/action for one or several partners."""
+        health_ids = args.get('health_ids') or ([args['health_id']] if args.get('health_id') else [])
+        if not health_ids or not args.get('intervention_type'):
+            return {'error': 'health_id (or health_ids) and intervention_type are required'}
+        if not isinstance(health_ids, list) or not all(
+            isinstance(health_id, int) and not isinstance(health_id, bool) for health_id in health_ids
+        ):
+            return {'error': 'health_id must be an integer and health_ids a list of integers'}
+        health_ids = list(dict.fromkeys(health_ids))
 
         PartnerHealth = self.env['wfm.partner.health']
         Intervention = self.env['wfm.partner.intervention']
 
-        health = PartnerHealth.browse(args['health_id'])
-        if not health.exists():
-            return {'error': f"Health record {args['health_id']} not found"}
+        healths = PartnerHealth.browse(health_ids).exists()
+        missing = set(health_ids) - set(healths.ids)
+        if missing:
+            return {'error': f"Health record(s) {', '.join(map(str, sorted(missing)))} not found"}
 
         valid_types = ['call', 'whatsapp', 'email', 'meeting', 'bonus', 'workload']
         if args['intervention_type'] not in valid_types:
             return {'error': f"Invalid intervention_type. Must be one of: {', '.join(valid_types)}"}
 
-        # Create intervention record
-        intervention_vals = {
-            'health_id': health.id,
-            'partner_id': health.partner_id.id,
+        # Create all intervention records at once; create() moves open tickets to in_progress
+        base_vals = {
             'intervention_type': args['intervention_type'],
             'notes': args.get('notes', ''),
             'coordinator_id': self.env.uid,
         }
-
         if args.get('outcome'):
             valid_outcomes = ['positive', 'neutral', 'negative', 'pending']
             if args['outcome'] in valid_outcomes:
-                intervention_vals['outcome'] = args['outcome']
+                base_vals['outcome'] = args['outcome']
 
+        healths.fetch(['partner_id'])
         try:
-            intervention = Intervention.create(intervention_vals)
-
-            # Update ticket state to in_progress if it was open
-            if health.ticket_state == 'open':
-                health.write({'ticket_state': 'in_progress'})
+            interventions = Intervention.create([
+                dict(base_vals, health_id=health.id, partner_id=health.partner_id.id)
+                for health in healths
+            ])
+        except Exception as e:
+            return {'error': str(e)}
 
+        if len(healths) == 1:
             return {
                 'success': True,
-                'message': f"Logged {args['intervention_type']} intervention for {health.partner_id.name}",
-                'intervention_id': intervention.id,
-                'partner_name': health.partner_id.name,
-                'ticket_state': health.ticket_state,
+                'message': f"Logged {args['intervention_type']} intervention for {healths.partner_id.name}",
+                'intervention_id': interventions.id,
+                'partner_name': healths.partner_id.name,
+                'ticket_state': healths.ticket_state,
             }
-        except Exception as e:
-            return {'error': str(e)}
+        return {
+            'success': True,
+            'message': f"Logged {args['intervention_type']} intervention for {len(healths)} partners",
+            'intervention_ids': interventions.ids,
+            'partners': [
+                {'health_id': health.id, 'partner_name': health.partner_id.name, 'ticket_state': health.ticket_state}
+                for health in healths
+            ],
+        }
 
     def _tool_wfm_resolve_retention_ticket(self, args):
         """Resolve a retention ticket with outcome."""
@@ -1016,11 +1077,12 @@ class WfmToolExecutor(models.AbstractModel):
                 'date_from': args['date_from'],
                 'date_to': args['date_to'],
                 'visit_ids': [(6, 0, visits.ids)],
+                'export_format': args.get('export_format') or 'xlsx',
             })
 
-            # Generate Excel if requested
+            # Queue file generation if requested
             if args.get('generate_excel', True):
-                export.action_generate_excel()
+                export.action_queue_generation()
 
             return {
                 'success': True,
@@ -1032,6 +1094,8 @@ class WfmToolExecutor(models.AbstractModel):
                     'total_hours': round(export.total_hours, 1),
                     'total_amount': round(export.total_amount, 2),
                     'state': export.state,
+                    'generation': export.job_state,
+                    'format': export.export_format,
                 }
             }
         except Exception as e:
@@ -1072,6 +1136,9 @@ class WfmToolExecutor(models.AbstractModel):
             'total_amount': round(export.total_amount, 2),
             'state': export.state,
             'state_label': dict(SepeExport._fields['state'].selection).get(export.state, export.state),
+            'generation': export.job_state,
+            'generation_progress': round(export.job_progress, 1),
+            'generation_error': export.job_error or None,
             'export_date': export.export_date.strftime('%d/%m/%Y %H:%M') if export.export_date else None,
             'exported_by': export.exported_by.name if export.exported_by else None,
             'submitted_date': export.submitted_date.strftime('%d/%m/%Y %H:%M') if export.submitted_date else None,
@@ -1187,16 +1254,18 @@ class WfmToolExecutor(models.AbstractModel):
         if not visits.exists():
             return {'error': 'No valid visits found'}
 
-        vals = {'billing_status': args['billing_status']}
-        if args.get('invoice_reference'):
-            vals['invoice_reference'] = args['invoice_reference']
+        visits = visits.exists()
 
         try:
-            visits.write(vals)
+            changed = visits._set_billing_status(
+                args['billing_status'],
+                invoice_reference=args.get('invoice_reference'),
+            )
             return {
                 'success': True,
-                'message': f"Updated {len(visits)} visit(s) to billing status: {args['billing_status']}",
-                'visit_count': len(visits),
+                'message': f"Updated {len(changed)} visit(s) to billing status: {args['billing_status']}",
+                'visit_count': len(changed),
+                'unchanged_count': len(visits) - len(changed),
                 'new_status': args['billing_status'],
             }
         except Exception as e:
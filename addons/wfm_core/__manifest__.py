@@ -1,6 +1,6 @@
 {
     'name': 'WFM Core',
-    'version': '19.0.2.1.0',
+    'version': '19.0.2.2.0',
     'category': 'Services/Field Service',
     'summary': 'Core models for GEP OHS Workforce Management',
     'description': """
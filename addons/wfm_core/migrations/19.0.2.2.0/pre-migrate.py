@@ -0,0 +1,61 @@
+"""Backfill the contract statistics that became stored fields.
+
+The columns are created and filled with one SQL statement before the
+module update, so the ORM does not recompute every contract on upgrade.
+Mirrors wfm.contract._compute_statistics.
+"""
+
+
+def migrate(cr, version):
+    if not version:
+        return
+
+    cr.execute("""
+        ALTER TABLE wfm_contract
+            ADD COLUMN IF NOT EXISTS total_visits integer,
+            ADD COLUMN IF NOT EXISTS completed_visits integer,
+            ADD COLUMN IF NOT EXISTS pending_visits integer,
+            ADD COLUMN IF NOT EXISTS total_hours double precision,
+            ADD COLUMN IF NOT EXISTS total_revenue numeric,
+            ADD COLUMN IF NOT EXISTS completion_rate double precision,
+            ADD COLUMN IF NOT EXISTS assigned_hours double precision,
+            ADD COLUMN IF NOT EXISTS utilization_rate double precision
+    """)
+
+    cr.execute("""
+        WITH visit_stats AS (
+            SELECT c.id AS contract_id,
+                   COUNT(v.id) AS total,
+                   COUNT(v.id) FILTER (WHERE v.state = 'done') AS completed,
+                   COALESCE(SUM(v.duration) FILTER (WHERE v.state = 'done'), 0) AS hours,
+                   COALESCE(SUM(v.partner_payment_amount) FILTER (WHERE v.state = 'done'), 0) AS revenue
+              FROM wfm_contract c
+              JOIN wfm_visit v
+                ON v.client_id = c.client_id
+               AND v.active
+               AND (c.start_date IS NULL OR v.visit_date >= c.start_date)
+               AND (c.end_date IS NULL OR v.visit_date <= c.end_date)
+             GROUP BY c.id
+        ),
+        service_hours AS (
+            SELECT contract_id, COALESCE(SUM(assigned_hours), 0) AS hours
+              FROM wfm_contract_service
+             WHERE active
+             GROUP BY contract_id
+        )
+        UPDATE wfm_contract c
+           SET total_visits = COALESCE(vs.total, 0),
+               completed_visits = COALESCE(vs.completed, 0),
+               pending_visits = COALESCE(vs.total - vs.completed, 0),
+               total_hours = COALESCE(vs.hours, 0),
+               total_revenue = COALESCE(vs.revenue, 0),
+               completion_rate = CASE WHEN vs.total > 0
+                                      THEN vs.completed * 100.0 / vs.total ELSE 0 END,
+               assigned_hours = COALESCE(sh.hours, 0),
+               utilization_rate = CASE WHEN sh.hours > 0
+                                       THEN COALESCE(vs.hours, 0) * 100.0 / sh.hours ELSE 0 END
+          FROM wfm_contract c2
+     LEFT JOIN visit_stats vs ON vs.contract_id = c2.id
+     LEFT JOIN service_hours sh ON sh.contract_id = c2.id
+         WHERE c2.id = c.id
+    """)
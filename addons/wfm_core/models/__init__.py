@@ -8,3 +8,4 @@ from . import visit
 from . import sepe_export
 from . import workflow
 from . import workflow_log
+from . import visit_index_advisor
@@ -1,6 +1,17 @@
 from odoo import models, fields, api, _
+from odoo.tools import SQL
 from datetime import date
 
+# Visit columns the contract statistics are aggregated from
+CONTRACT_STAT_VISIT_FIELDS = [
+    'client_id', 'visit_date', 'state', 'duration', 'partner_payment_amount', 'active',
+]
+
+CONTRACT_STAT_FIELDS = [
+    'total_visits', 'completed_visits', 'pending_visits', 'total_hours',
+    'total_revenue', 'completion_rate', 'assigned_hours', 'utilization_rate',
+]
+
 
 class WfmContract(models.Model):
     _name = 'wfm.contract'
@@ -99,47 +110,47 @@ class WfmContract(models.Model):
         ('cancelled', 'Cancelled'),
     ], string='Status', default='draft', tracking=True)
 
-    # Statistics fields (computed for active state view)
+    # Statistics fields (stored, recomputed when the contract's visits change)
     total_visits = fields.Integer(
         string='Total Visits',
         compute='_compute_statistics',
-        store=False
+        store=True
     )
     completed_visits = fields.Integer(
         string='Completed Visits',
         compute='_compute_statistics',
-        store=False
+        store=True
     )
     pending_visits = fields.Integer(
         string='Pending Visits',
         compute='_compute_statistics',
-        store=False
+        store=True
     )
     total_hours = fields.Float(
         string='Total Hours',
         compute='_compute_statistics',
-        store=False
+        store=True
     )
     total_revenue = fields.Monetary(
         string='Total Revenue',
         compute='_compute_statistics',
         currency_field='currency_id',
-        store=False
+        store=True
     )
     completion_rate = fields.Float(
         string='Completion Rate (%)',
         compute='_compute_statistics',
-        store=False
+        store=True
     )
     assigned_hours = fields.Float(
         string='Assigned Hours',
         compute='_compute_statistics',
-        store=False
+        store=True
     )
     utilization_rate = fields.Float(
         string='Utilization Rate (%)',
         compute='_compute_statistics',
-        store=False
+        store=True
     )
     days_remaining = fields.Integer(
         string='Days Remaining',
@@ -181,40 +192,26 @@ class WfmContract(models.Model):
     def action_reset_draft(self):
         self.write({'state': 'draft'})
 
-    @api.depends('client_id', 'start_date', 'end_date')
+    @api.depends('client_id', 'start_date', 'end_date', 'service_ids.assigned_hours')
     def _compute_statistics(self):
-        """Compute visit statistics for the contract period."""
-        Visit = self.env['wfm.visit']
-        for contract in self:
-            if not contract.client_id:
-                contract.total_visits = 0
-                contract.completed_visits = 0
-                contract.pending_visits = 0
-                contract.total_hours = 0.0
-                contract.total_revenue = 0.0
-                contract.completion_rate = 0.0
-                contract.assigned_hours = 0.0
-                contract.utilization_rate = 0.0
-                continue
+        """Compute visit statistics for the contract period.
 
-            # Build domain for visits within contract period
-            domain = [('client_id', '=', contract.client_id.id)]
-            if contract.start_date:
-                domain.append(('visit_date', '>=', contract.start_date))
-            if contract.end_date:
-                domain.append(('visit_date', '<=', contract.end_date))
-
-            visits = Visit.search(domain)
-            completed = visits.filtered(lambda v: v.state == 'done')
+        Stored: visits schedule a recomputation of their client's contracts
+        when they change (see _recompute_statistics_for_clients), and all
+        contracts of a batch are aggregated in one query.
+        """
+        visit_stats = self._read_visit_statistics()
+        for contract in self:
+            total, completed, hours, revenue = visit_stats.get(contract.id, (0, 0, 0.0, 0.0))
 
-            contract.total_visits = len(visits)
-            contract.completed_visits = len(completed)
-            contract.pending_visits = len(visits) - len(completed)
-            contract.total_hours = sum(completed.mapped('duration'))
-            contract.total_revenue = sum(completed.mapped('partner_payment_amount'))
+            contract.total_visits = total
+            contract.completed_visits = completed
+            contract.pending_visits = total - completed
+            contract.total_hours = hours
+            contract.total_revenue = revenue
 
-            if contract.total_visits > 0:
-                contract.completion_rate = (contract.completed_visits / contract.total_visits) * 100
+            if total > 0:
+                contract.completion_rate = (completed / total) * 100
             else:
                 contract.completion_rate = 0.0
 
@@ -222,10 +219,58 @@ class WfmContract(models.Model):
             contract.assigned_hours = sum(contract.service_ids.mapped('assigned_hours'))
 
             if contract.assigned_hours > 0:
-                contract.utilization_rate = (contract.total_hours / contract.assigned_hours) * 100
+                contract.utilization_rate = (hours / contract.assigned_hours) * 100
             else:
                 contract.utilization_rate = 0.0
 
+    def _read_visit_statistics(self):
+        """Aggregate the visits of each contract period in a single query.
+
+        Returns:
+            dict of contract ID -> (total visits, completed visits,
+            completed hours, completed revenue)
+        """
+        rows = [
+            (contract.id, contract.client_id.id, contract.start_date, contract.end_date)
+            for contract in self
+            if isinstance(contract.id, int) and contract.client_id
+        ]
+        if not rows:
+            return {}
+
+        self.env['wfm.visit'].flush_model(CONTRACT_STAT_VISIT_FIELDS)
+        self.env.cr.execute(SQL(
+            """
+            SELECT c.id,
+                   COUNT(v.id),
+                   COUNT(v.id) FILTER (WHERE v.state = 'done'),
+                   COALESCE(SUM(v.duration) FILTER (WHERE v.state = 'done'), 0),
+                   COALESCE(SUM(v.partner_payment_amount) FILTER (WHERE v.state = 'done'), 0)
+              FROM (VALUES %s) AS c(id, client_id, start_date, end_date)
+              JOIN wfm_visit v
+                ON v.client_id = c.client_id
+               AND v.active
+               AND (c.start_date IS NULL OR v.visit_date >= c.start_date)
+               AND (c.end_date IS NULL OR v.visit_date <= c.end_date)
+             GROUP BY c.id
+            """,
+            SQL(", ").join(SQL("(%s, %s, %s::date, %s::date)", *row) for row in rows),
+        ))
+        return {
+            contract_id: (total, completed, float(hours), float(revenue))
+            for contract_id, total, completed, hours, revenue in self.env.cr.fetchall()
+        }
+
+    @api.model
+    def _recompute_statistics_for_clients(self, client_ids):
+        """Schedule a statistics recomputation for the contracts of these clients."""
+        client_ids = list({cid for cid in client_ids if cid})
+        if not client_ids:
+            return
+        contracts = self.with_context(active_test=False).search([('client_id', 'in', client_ids)])
+        for fname in CONTRACT_STAT_FIELDS:
+            self.env.add_to_compute(self._fields[fname], contracts)
+
     @api.depends('start_date', 'end_date', 'state')
     def _compute_days_remaining(self):
         """Compute days remaining and days active."""
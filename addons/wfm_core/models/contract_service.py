@@ -130,8 +130,13 @@ class WfmContractService(models.Model):
 
     @api.depends('installation_service_ids')
     def _compute_installation_service_count(self):
+        counts = dict(self.env['wfm.installation.service']._read_group(
+            [('contract_service_id', 'in', [rid for rid in self._origin.ids if rid])],
+            ['contract_service_id'],
+            ['__count'],
+        ))
         for record in self:
-            record.installation_service_count = len(record.installation_service_ids)
+            record.installation_service_count = counts.get(record._origin, 0)
 
     @api.model_create_multi
     def create(self, vals_list):
@@ -58,7 +58,8 @@ class WfmInstallation(models.Model):
     )
     visit_count = fields.Integer(
         string='Visit Count',
-        compute='_compute_visit_count'
+        compute='_compute_visit_count',
+        store=True
     )
 
     active = fields.Boolean(default=True)
@@ -71,10 +72,15 @@ class WfmInstallation(models.Model):
                 parts.append(record.country_id.name)
             record.address = ', '.join(filter(None, parts))
 
-    @api.depends('visit_ids')
+    @api.depends('visit_ids', 'visit_ids.active')
     def _compute_visit_count(self):
+        counts = dict(self.env['wfm.visit']._read_group(
+            [('installation_id', 'in', [rid for rid in self._origin.ids if rid])],
+            ['installation_id'],
+            ['__count'],
+        ))
         for record in self:
-            record.visit_count = len(record.visit_ids)
+            record.visit_count = counts.get(record._origin, 0)
 
     def name_get(self):
         result = []
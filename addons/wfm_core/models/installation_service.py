@@ -88,13 +88,13 @@ class WfmInstallationService(models.Model):
     )
     programmed_hours = fields.Float(
         string='Programmed Hours',
-        compute='_compute_programmed_hours',
+        compute='_compute_visit_rollups',
         store=True,
         help='Sum of visit durations (scheduled)'
     )
     completed_hours = fields.Float(
         string='Completed Hours',
-        compute='_compute_completed_hours',
+        compute='_compute_visit_rollups',
         store=True,
         help='Sum of completed visit durations'
     )
@@ -122,7 +122,8 @@ class WfmInstallationService(models.Model):
     )
     visit_count = fields.Integer(
         string='Visits',
-        compute='_compute_visit_count'
+        compute='_compute_visit_rollups',
+        store=True
     )
 
     @api.depends('installation_id', 'contract_service_id.service_type', 'partner_id')
@@ -138,27 +139,36 @@ class WfmInstallationService(models.Model):
                 parts.append(record.partner_id.name)
             record.name = ' - '.join(parts) if parts else record.code or _('New')
 
-    @api.depends('visit_ids', 'visit_ids.duration')
-    def _compute_programmed_hours(self):
-        for record in self:
-            record.programmed_hours = sum(record.visit_ids.mapped('duration'))
+    @api.depends('visit_ids', 'visit_ids.active', 'visit_ids.duration', 'visit_ids.state')
+    def _compute_visit_rollups(self):
+        """Aggregate visit count and hours with one grouped query per batch.
+
+        Only the services of the modified visits are recomputed, and their
+        visits are never loaded.
+        """
+        groups = self.env['wfm.visit']._read_group(
+            [('installation_service_id', 'in', [rid for rid in self._origin.ids if rid])],
+            ['installation_service_id', 'state'],
+            ['duration:sum', '__count'],
+        )
+        rollups = {}
+        for service, state, duration, count in groups:
+            programmed, completed, visits = rollups.get(service.id, (0.0, 0.0, 0))
+            if state == 'done':
+                completed += duration
+            rollups[service.id] = (programmed + duration, completed, visits + count)
 
-    @api.depends('visit_ids', 'visit_ids.duration', 'visit_ids.state')
-    def _compute_completed_hours(self):
         for record in self:
-            completed_visits = record.visit_ids.filtered(lambda v: v.state == 'done')
-            record.completed_hours = sum(completed_visits.mapped('duration'))
+            programmed, completed, visits = rollups.get(record._origin.id, (0.0, 0.0, 0))
+            record.programmed_hours = programmed
+            record.completed_hours = completed
+            record.visit_count = visits
 
     @api.depends('assigned_hours', 'programmed_hours')
     def _compute_remaining_hours(self):
         for record in self:
             record.remaining_hours = (record.assigned_hours or 0) - (record.programmed_hours or 0)
 
-    @api.depends('visit_ids')
-    def _compute_visit_count(self):
-        for record in self:
-            record.visit_count = len(record.visit_ids)
-
     @api.model_create_multi
     def create(self, vals_list):
         for vals in vals_list:
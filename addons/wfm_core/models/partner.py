@@ -48,6 +48,19 @@ class ResPartner(models.Model):
         compute='_compute_visit_count'
     )
 
+    def write(self, vals):
+        result = super().write(vals)
+        if 'hourly_rate' in vals:
+            # Contract revenue sums the partner payment of completed visits
+            groups = self.env['wfm.visit']._read_group(
+                [('partner_id', 'in', self.ids), ('state', '=', 'done')],
+                ['client_id'],
+            )
+            self.env['wfm.contract']._recompute_statistics_for_clients(
+                [client.id for client, in groups]
+            )
+        return result
+
     @api.depends('installation_ids')
     def _compute_installation_count(self):
         for partner in self:
@@ -1,11 +1,83 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.tools import SQL, split_every
 from datetime import timedelta
-import base64
+import csv
+import io
 import logging
+import tempfile
 
 _logger = logging.getLogger(__name__)
 
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Export format -> (file extension, mimetype, writer method)
+EXPORT_FORMATS = {
+    'xlsx': ('xlsx', XLSX_MIMETYPE, '_write_sepe_xlsx'),
+    'csv': ('csv', 'text/csv', '_write_sepe_csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet', '_write_sepe_parquet'),
+}
+
+# Visits read from the database per chunk while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+VISIT_EXPORT_FIELDS = [
+    'visit_date', 'client_id', 'installation_id', 'partner_id',
+    'start_time', 'end_time', 'duration', 'visit_type', 'state',
+]
+
+# Headers (Greek SEPE format)
+SEPE_HEADERS = [
+    'Α/Α',
+    'Ημερομηνία Επίσκεψης',
+    'Επωνυμία Πελάτη',
+    'ΑΦΜ Πελάτη',
+    'Εγκατάσταση',
+    'Διεύθυνση',
+    'Πόλη',
+    'Ώρα Έναρξης',
+    'Ώρα Λήξης',
+    'Διάρκεια (ώρες)',
+    'Τύπος Υπηρεσίας',
+    'Ονοματεπώνυμο Συνεργάτη',
+    'Ειδικότητα',
+    'Τηλέφωνο Συνεργάτη',
+    'Κατάσταση',
+]
+
+# Specialty labels in Greek
+SPECIALTY_LABELS = {
+    'physician': 'Ιατρός Εργασίας',
+    'safety_engineer': 'Τεχνικός Ασφαλείας',
+    'health_scientist': 'Επιστήμονας Υγείας',
+}
+
+# Visit type labels in Greek
+VISIT_TYPE_LABELS = {
+    'regular': 'Τακτική Επίσκεψη',
+    'urgent': 'Επείγουσα',
+    'follow_up': 'Επανεξέταση',
+}
+
+# State labels in Greek
+STATE_LABELS = {
+    'draft': 'Πρόχειρο',
+    'assigned': 'Ανατεθειμένο',
+    'confirmed': 'Επιβεβαιωμένο',
+    'in_progress': 'Σε Εξέλιξη',
+    'done': 'Ολοκληρωμένο',
+    'cancelled': 'Ακυρωμένο',
+}
+
+
+def _format_hhmm(time_float):
+    """Format float time as HH:MM."""
+    return f"{int(time_float):02d}:{int((time_float % 1) * 60):02d}"
+
+
+class _GenerationInterrupted(Exception):
+    """The cron ran out of time; the job is restarted by its next run."""
+
 
 class WfmSepeExport(models.Model):
     _name = 'wfm.sepe.export'
@@ -45,14 +117,33 @@ class WfmSepeExport(models.Model):
     ], default='draft', tracking=True, string='Status')
 
     # Export file
+    export_format = fields.Selection([
+        ('xlsx', 'Excel (XLSX)'),
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet (compressed, columnar)'),
+    ], default='xlsx', required=True, string='Format',
+        help='XLSX for submission to SEPE; CSV and Parquet for reconciliation scripts')
     export_file = fields.Binary(
-        string='Excel File',
+        string='Export File',
         attachment=True
     )
     export_filename = fields.Char(string='Filename')
 
     # Audit fields
     exported_by = fields.Many2one('res.users', readonly=True, string='Exported By')
+
+    # Background generation job
+    job_state = fields.Selection([
+        ('none', 'Not Started'),
+        ('queued', 'Queued'),
+        ('running', 'Generating'),
+        ('done', 'Ready'),
+        ('failed', 'Failed'),
+    ], default='none', readonly=True, copy=False, string='Generation')
+    job_processed = fields.Integer(readonly=True, copy=False, string='Processed Visits')
+    job_progress = fields.Float(compute='_compute_job_progress', string='Progress (%)')
+    job_error = fields.Text(readonly=True, copy=False, string='Generation Error')
+    job_requested_by = fields.Many2one('res.users', readonly=True, copy=False, string='Requested By')
     export_date = fields.Datetime(readonly=True, string='Export Date')
     submitted_date = fields.Datetime(readonly=True, string='Submitted Date')
 
@@ -78,6 +169,16 @@ class WfmSepeExport(models.Model):
         for record in self:
             record.visit_count = len(record.visit_ids)
 
+    @api.depends('job_processed', 'visit_count')
+    def _compute_job_progress(self):
+        for record in self:
+            if record.job_state == 'done':
+                record.job_progress = 100.0
+            elif record.visit_count:
+                record.job_progress = min(record.job_processed / record.visit_count * 100, 100.0)
+            else:
+                record.job_progress = 0.0
+
     @api.depends('visit_ids', 'visit_ids.duration', 'visit_ids.partner_payment_amount')
     def _compute_totals(self):
         for record in self:
@@ -92,146 +193,404 @@ class WfmSepeExport(models.Model):
         return super().create(vals_list)
 
     def action_generate_excel(self):
-        """Generate SEPE-compliant Excel export."""
+        """Generate the SEPE export file in the batch's format.
+
+        Streams rows into the writer (constant memory in the number of
+        visits) and stores the file as a filestore attachment.
+        Runs in the current transaction; use action_queue_generation for
+        large batches.
+        """
+        self.ensure_one()
+
+        visit_ids = self._generate_export_file()
+        self._mark_visits_exported(visit_ids)
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Export Complete'),
+                'message': _('Successfully exported %s visits.') % len(visit_ids),
+                'type': 'success',
+                'sticky': False,
+            }
+        }
+
+    def action_queue_generation(self):
+        """Generate the export file in the background.
+
+        The generation cron processes the visits in chunks, records progress
+        on the batch and notifies the requesting user when the file is ready.
+        """
+        for record in self:
+            if record.job_state in ('queued', 'running'):
+                continue
+            record.write({
+                'job_state': 'queued',
+                'job_processed': 0,
+                'job_error': False,
+                'job_requested_by': self.env.user.id,
+            })
+
+        cron = self.env.ref('wfm_core.ir_cron_sepe_generate', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Export Queued'),
+                'message': _('The SEPE file is being generated. You will be notified when it is ready.'),
+                'type': 'info',
+                'sticky': False,
+            }
+        }
+
+    @api.model
+    def _cron_generate_exports(self):
+        """Cron: run queued (and restart interrupted) export generations."""
+        IrCron = self.env['ir.cron']
+        exports = self.search([('job_state', 'in', ['queued', 'running'])], order='id')
+
+        for index, export in enumerate(exports, 1):
+            try:
+                export._run_generation_job()
+            except _GenerationInterrupted:
+                # Out of time; the cron is re-triggered for the remainder
+                _logger.info(f"SEPE export {export.name} interrupted, restarting on next run")
+                IrCron._commit_progress(remaining=len(exports) - index + 1)
+                break
+            except Exception as e:
+                _logger.exception(f"SEPE export {export.name} generation failed")
+                self.env.cr.rollback()
+                export.write({'job_state': 'failed', 'job_error': str(e)})
+                export._notify_generation_result()
+            if not IrCron._commit_progress(1, remaining=len(exports) - index):
+                break
+
+        return True
+
+    def _run_generation_job(self):
+        """Generate the file and mark visits, committing after each chunk.
+
+        The job is restartable, not resumable: when the cron time budget
+        runs out it stops with _GenerationInterrupted and stays 'running',
+        and the next cron run generates the file again from the first
+        visit. Visit marking is idempotent, so visits flagged by the
+        interrupted run are simply skipped.
+        """
+        self.ensure_one()
+        IrCron = self.env['ir.cron']
+
+        self.write({'job_state': 'running', 'job_processed': 0, 'job_error': False})
+        IrCron._commit_progress()
+
+        def progress(processed=None):
+            if processed is not None:
+                self.job_processed = processed
+            if not IrCron._commit_progress():
+                raise _GenerationInterrupted()
+
+        visit_ids = self._generate_export_file(progress=progress)
+        self._mark_visits_exported(visit_ids, progress=lambda done: progress())
+
+        self.write({'job_state': 'done', 'job_processed': len(visit_ids)})
+        self._notify_generation_result()
+
+    def _notify_generation_result(self):
+        """Tell the requesting user that the export finished or failed."""
+        self.ensure_one()
+        partner_ids = self.job_requested_by.partner_id.ids
+        if self.job_state == 'done':
+            body = _('SEPE export %(name)s is ready: %(count)s visits exported.',
+                     name=self.name, count=self.job_processed)
+        else:
+            body = _('SEPE export %(name)s failed: %(error)s',
+                     name=self.name, error=self.job_error or '')
+        self.message_post(
+            body=body,
+            partner_ids=partner_ids,
+            message_type='notification',
+            subtype_xmlid='mail.mt_comment' if partner_ids else 'mail.mt_note',
+        )
+
+    def _generate_export_file(self, progress=None):
+        """Build the export file in the batch's format and store it.
+
+        All formats consume the same streaming row generator
+        (_iter_sepe_rows), so labels and formatting are identical.
+
+        Args:
+            progress: optional callable receiving the number of rows written,
+                called after each chunk
+
+        Returns:
+            list of exported visit IDs, in export order
+        """
         self.ensure_one()
 
+        extension, mimetype, writer = EXPORT_FORMATS[self.export_format]
+        visit_ids = self._get_export_visit_ids()
+        dimensions = self._get_sepe_dimension_values()
+        rows = self._iter_sepe_rows(visit_ids, dimensions, progress=progress)
+
+        with tempfile.TemporaryFile() as output:
+            getattr(self, writer)(output, rows, dimensions, len(visit_ids))
+            output.seek(0)
+            self._store_export_file(output.read(), mimetype)
+
+        self.write({
+            'export_filename': f"SEPE_Export_{self.date_from}_{self.date_to}.{extension}",
+            'state': 'exported',
+            'export_date': fields.Datetime.now(),
+            'exported_by': (self.job_requested_by or self.env.user).id,
+        })
+        return visit_ids
+
+    def _write_sepe_xlsx(self, output, rows, dimensions, row_count):
+        """Write rows to a styled, write-only XLSX workbook."""
         try:
             import openpyxl
+            from openpyxl.cell import WriteOnlyCell
             from openpyxl.styles import Font, Alignment, PatternFill
+            from openpyxl.utils import get_column_letter
         except ImportError:
             raise UserError(_('openpyxl library is required. Install with: pip install openpyxl'))
 
-        from io import BytesIO
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('SEPE Export')
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = 'SEPE Export'
+        # Write-only sheets emit column widths before any row, so they are
+        # derived up front from the (small) client/installation/partner sets
+        # and the fixed-width visit columns.
+        widths = self._get_sepe_column_widths(dimensions, row_count)
+        for col, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
 
         # Header styling
         header_font = Font(bold=True, color='FFFFFF')
         header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
         header_alignment = Alignment(horizontal='center', wrap_text=True)
 
-        # Headers (Greek SEPE format)
-        headers = [
-            'Α/Α',
-            'Ημερομηνία Επίσκεψης',
-            'Επωνυμία Πελάτη',
-            'ΑΦΜ Πελάτη',
-            'Εγκατάσταση',
-            'Διεύθυνση',
-            'Πόλη',
-            'Ώρα Έναρξης',
-            'Ώρα Λήξης',
-            'Διάρκεια (ώρες)',
-            'Τύπος Υπηρεσίας',
-            'Ονοματεπώνυμο Συνεργάτη',
-            'Ειδικότητα',
-            'Τηλέφωνο Συνεργάτη',
-            'Κατάσταση',
-        ]
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
+        header_row = []
+        for header in SEPE_HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
+            header_row.append(cell)
+        ws.append(header_row)
 
-        # Specialty labels in Greek
-        specialty_labels = {
-            'physician': 'Ιατρός Εργασίας',
-            'safety_engineer': 'Τεχνικός Ασφαλείας',
-            'health_scientist': 'Επιστήμονας Υγείας',
-        }
+        for row in rows:
+            ws.append(row)
 
-        # Visit type labels in Greek
-        visit_type_labels = {
-            'regular': 'Τακτική Επίσκεψη',
-            'urgent': 'Επείγουσα',
-            'follow_up': 'Επανεξέταση',
-        }
+        wb.save(output)
 
-        # State labels in Greek
-        state_labels = {
-            'draft': 'Πρόχειρο',
-            'assigned': 'Ανατεθειμένο',
-            'confirmed': 'Επιβεβαιωμένο',
-            'in_progress': 'Σε Εξέλιξη',
-            'done': 'Ολοκληρωμένο',
-            'cancelled': 'Ακυρωμένο',
+    def _write_sepe_csv(self, output, rows, dimensions, row_count):
+        """Write rows as UTF-8 CSV with the SEPE headers."""
+        text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(SEPE_HEADERS)
+        writer.writerows(rows)
+        text.flush()
+        text.detach()
+
+    def _write_sepe_parquet(self, output, rows, dimensions, row_count):
+        """Write rows as a zstd-compressed Parquet file, one row group per chunk."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise UserError(_('pyarrow library is required for Parquet exports. Install with: pip install pyarrow'))
+
+        # Α/Α and duration are numeric, every other column is text
+        column_types = {0: pa.int64(), 9: pa.float64()}
+        schema = pa.schema([
+            (header, column_types.get(idx, pa.string()))
+            for idx, header in enumerate(SEPE_HEADERS)
+        ])
+        with pq.ParquetWriter(output, schema, compression='zstd') as writer:
+            for chunk in split_every(EXPORT_CHUNK_SIZE, rows):
+                columns = list(zip(*chunk))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema,
+                ))
+
+    def _mark_visits_exported(self, visit_ids, progress=None):
+        """Flag visits as exported to SEPE, one chunk at a time."""
+        Visit = self.env['wfm.visit']
+        now = fields.Datetime.now()
+        done = 0
+        for chunk_ids in split_every(EXPORT_CHUNK_SIZE, visit_ids):
+            visits = Visit.browse(chunk_ids).filtered(lambda v: not v.sepe_exported)
+            visits.write({
+                'sepe_exported': True,
+                'sepe_export_date': now,
+            })
+            done += len(chunk_ids)
+            if progress:
+                progress(done)
+
+    def _get_export_visit_ids(self):
+        """IDs of the visits in this batch, in export order (by visit date)."""
+        self.ensure_one()
+        self.env['wfm.visit'].flush_model(['visit_date'])
+        self.flush_recordset(['visit_ids'])
+        self.env.cr.execute(SQL(
+            """
+            SELECT v.id
+              FROM wfm_sepe_export_visit_rel r
+              JOIN wfm_visit v ON v.id = r.visit_id
+             WHERE r.export_id = %s
+             ORDER BY v.visit_date, v.id
+            """,
+            self.id,
+        ))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def _get_sepe_dimension_values(self):
+        """Prefetch the clients, installations and partners of this batch.
+
+        Returns:
+            dict with 'client', 'installation' and 'partner' keys, each a
+            dict of record ID -> tuple of the exported string values
+        """
+        self.ensure_one()
+        self.env.cr.execute(SQL(
+            """
+            SELECT array_agg(DISTINCT v.client_id),
+                   array_agg(DISTINCT v.installation_id),
+                   array_agg(DISTINCT v.partner_id)
+              FROM wfm_sepe_export_visit_rel r
+              JOIN wfm_visit v ON v.id = r.visit_id
+             WHERE r.export_id = %s
+            """,
+            self.id,
+        ))
+        client_ids, installation_ids, partner_ids = (
+            [rid for rid in (ids or []) if rid] for ids in self.env.cr.fetchone()
+        )
+
+        Partner = self.env['res.partner']
+        clients = {
+            rec.id: (rec.name or '', rec.vat or '')
+            for rec in Partner.browse(client_ids)
+        }
+        installations = {
+            rec.id: (rec.name or '', rec.address or '', rec.city or '')
+            for rec in self.env['wfm.installation'].browse(installation_ids)
+        }
+        partners = {
+            rec.id: (
+                rec.name or '',
+                SPECIALTY_LABELS.get(rec.specialty, rec.specialty or ''),
+                rec.phone or '',
+            )
+            for rec in Partner.browse(partner_ids)
         }
+        return {'client': clients, 'installation': installations, 'partner': partners}
 
-        # Data rows
-        for idx, visit in enumerate(self.visit_ids.sorted(key=lambda v: v.visit_date), 1):
-            # Format time as HH:MM
-            start_hours = int(visit.start_time)
-            start_mins = int((visit.start_time % 1) * 60)
-            end_hours = int(visit.end_time)
-            end_mins = int((visit.end_time % 1) * 60)
-            start_time = f"{start_hours:02d}:{start_mins:02d}"
-            end_time = f"{end_hours:02d}:{end_mins:02d}"
-
-            ws.append([
-                idx,
-                visit.visit_date.strftime('%d/%m/%Y') if visit.visit_date else '',
-                visit.client_id.name or '',
-                visit.client_id.vat or '',
-                visit.installation_id.name or '',
-                visit.installation_id.address or '',
-                visit.installation_id.city or '',
-                start_time,
-                end_time,
-                round(visit.duration, 2),
-                visit_type_labels.get(visit.visit_type, visit.visit_type or ''),
-                visit.partner_id.name or '',
-                specialty_labels.get(visit.partner_id.specialty, visit.partner_id.specialty or ''),
-                visit.partner_id.phone or '',
-                state_labels.get(visit.state, visit.state or ''),
-            ])
-
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-        # Save to binary
-        output = BytesIO()
-        wb.save(output)
+    def _iter_sepe_rows(self, visit_ids, dimensions, progress=None):
+        """Yield one SEPE row per visit, reading visits in prefetched chunks.
 
-        filename = f"SEPE_Export_{self.date_from}_{self.date_to}.xlsx"
+        Only scalar visit columns are read per chunk; related values come
+        from the prefetched dimensions. The ORM cache is cleared after each
+        chunk so memory does not grow with the batch size.
 
-        self.write({
-            'export_file': base64.b64encode(output.getvalue()),
-            'export_filename': filename,
-            'state': 'exported',
-            'export_date': fields.Datetime.now(),
-            'exported_by': self.env.user.id,
-        })
+        progress, if given, is called with the row count after each chunk.
+        """
+        Visit = self.env['wfm.visit']
+        no_client = ('', '')
+        no_installation = ('', '', '')
+        no_partner = ('', '', '')
+
+        idx = 0
+        for chunk_ids in split_every(EXPORT_CHUNK_SIZE, visit_ids):
+            visits = Visit.browse(chunk_ids)
+            visits.fetch(VISIT_EXPORT_FIELDS)
+            for visit in visits:
+                idx += 1
+                client = dimensions['client'].get(visit.client_id.id, no_client)
+                installation = dimensions['installation'].get(visit.installation_id.id, no_installation)
+                partner = dimensions['partner'].get(visit.partner_id.id, no_partner)
+                yield [
+                    idx,
+                    visit.visit_date.strftime('%d/%m/%Y') if visit.visit_date else '',
+                    client[0],
+                    client[1],
+                    installation[0],
+                    installation[1],
+                    installation[2],
+                    _format_hhmm(visit.start_time),
+                    _format_hhmm(visit.end_time),
+                    round(visit.duration, 2),
+                    VISIT_TYPE_LABELS.get(visit.visit_type, visit.visit_type or ''),
+                    partner[0],
+                    partner[1],
+                    partner[2],
+                    STATE_LABELS.get(visit.state, visit.state or ''),
+                ]
+            visits.invalidate_recordset()
+            if progress:
+                progress(idx)
 
-        # Mark visits as exported
-        self.visit_ids.write({
-            'sepe_exported': True,
-            'sepe_export_date': fields.Datetime.now(),
-        })
+    @api.model
+    def _get_sepe_column_widths(self, dimensions, row_count):
+        """Column widths (max content length + 2, capped at 50) per SEPE column."""
+        def longest(values):
+            return max((len(value) for value in values), default=0)
+
+        clients = dimensions['client'].values()
+        installations = dimensions['installation'].values()
+        partners = dimensions['partner'].values()
+
+        content = [
+            len(str(row_count)),                          # Α/Α
+            10,                                           # dd/mm/YYYY
+            longest(c[0] for c in clients),
+            longest(c[1] for c in clients),
+            longest(i[0] for i in installations),
+            longest(i[1] for i in installations),
+            longest(i[2] for i in installations),
+            5,                                            # HH:MM
+            5,
+            5,                                            # e.g. 10.25
+            longest(VISIT_TYPE_LABELS.values()),
+            longest(p[0] for p in partners),
+            longest(p[1] for p in partners),
+            longest(p[2] for p in partners),
+            longest(STATE_LABELS.values()),
+        ]
+        return [
+            min(max(len(header), length) + 2, 50)
+            for header, length in zip(SEPE_HEADERS, content)
+        ]
 
-        return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('Export Complete'),
-                'message': _('Successfully exported %s visits to Excel.') % len(self.visit_ids),
-                'type': 'success',
-                'sticky': False,
-            }
-        }
+    def _store_export_file(self, data, mimetype):
+        """Store raw file content as the export_file attachment.
+
+        Writes the bytes straight to the filestore instead of assigning a
+        base64 string to the Binary field.
+        """
+        self.ensure_one()
+        Attachment = self.env['ir.attachment'].sudo()
+        Attachment.search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'export_file'),
+            ('res_id', '=', self.id),
+        ]).unlink()
+        Attachment.create({
+            'name': 'export_file',
+            'res_model': self._name,
+            'res_field': 'export_file',
+            'res_id': self.id,
+            'type': 'binary',
+            'raw': data,
+            'mimetype': mimetype,
+        })
+        self.invalidate_recordset(['export_file'])
 
     def action_submit_to_sepe(self):
         """Mark as submitted to SEPE."""
@@ -246,9 +605,7 @@ class WfmSepeExport(models.Model):
         })
 
         # Update billing status of visits to 'invoiced' (ready for invoicing)
-        self.visit_ids.write({
-            'billing_status': 'invoiced',
-        })
+        self.visit_ids._set_billing_status('invoiced', export_batches=self)
 
         return {
             'type': 'ir.actions.client',
@@ -265,6 +622,9 @@ class WfmSepeExport(models.Model):
         self.ensure_one()
         self.write({
             'state': 'draft',
+            'job_state': 'none',
+            'job_processed': 0,
+            'job_error': False,
             'export_file': False,
             'export_filename': False,
             'export_date': False,
@@ -312,9 +672,9 @@ class WfmSepeExport(models.Model):
             'visit_ids': [(6, 0, visits.ids)],
         })
 
-        # Generate Excel
-        export.action_generate_excel()
+        # Generate Excel in the background generation job
+        export.action_queue_generation()
 
-        _logger.info(f"SEPE cron: Successfully created export {export.name}")
+        _logger.info(f"SEPE cron: Queued export {export.name}")
 
         return True
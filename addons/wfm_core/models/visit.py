@@ -1,5 +1,15 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.models import Index
+from odoo.tools import SQL, split_every
+
+# Visits written per statement in bulk billing transitions
+BILLING_CHUNK_SIZE = 1000
+
+# Visit fields that change the statistics of the client's contracts
+CONTRACT_STAT_TRIGGER_FIELDS = {
+    'client_id', 'visit_date', 'state', 'start_time', 'end_time', 'partner_id', 'active',
+}
 
 
 class WfmVisit(models.Model):
@@ -8,6 +18,20 @@ class WfmVisit(models.Model):
     _inherit = ['mail.thread', 'mail.activity.mixin']
     _order = 'visit_date desc, id desc'
 
+    # Indexes for the hot query shapes; wfm.visit.index.advisor checks
+    # with EXPLAIN that they are used.
+    # Partner workload/health counts, assignment conflicts, WhatsApp commands
+    _partner_state_date_idx = Index('(partner_id, state, visit_date)')
+    # Contract statistics and client history by period
+    _client_date_idx = Index('(client_id, visit_date)')
+    # Dashboards, 24h reminders and date-range reports by state
+    _state_date_idx = Index('(state, visit_date)')
+    # Billing dashboard and unbilled lists
+    _billing_state_idx = Index('(billing_status, state)')
+    # Completed visits still waiting for a SEPE export: dashboard count,
+    # daily export cron and export wizard
+    _sepe_pending_idx = Index("(visit_date) WHERE state = 'done' AND sepe_exported IS NOT TRUE")
+
     name = fields.Char(
         string='Visit Reference',
         required=True,
@@ -177,6 +201,65 @@ class WfmVisit(models.Model):
             hourly_rate = visit.partner_id.hourly_rate if visit.partner_id else 0.0
             visit.partner_payment_amount = visit.duration * hourly_rate
 
+    def _set_billing_status(self, billing_status, invoice_reference=None, export_batches=None):
+        """Move visits to a billing status with set-based writes.
+
+        Visits already in the target status are skipped, and per-visit
+        tracking and follower subscription are disabled: the transition is
+        recorded by one chatter message per SEPE export batch instead.
+
+        Args:
+            billing_status: target billing_status value
+            invoice_reference: optional invoice reference to set on all visits
+            export_batches: wfm.sepe.export records to post the summary on;
+                defaults to every batch containing a changed visit
+
+        Returns:
+            wfm.visit recordset of the visits that changed
+        """
+        vals = {'billing_status': billing_status}
+        domain = [('id', 'in', self.ids)]
+        if invoice_reference:
+            vals['invoice_reference'] = invoice_reference
+        else:
+            domain.append(('billing_status', '!=', billing_status))
+
+        changed = self.with_context(active_test=False).search(domain, order='id')
+        if not changed:
+            return changed
+
+        Visit = self.with_context(tracking_disable=True)
+        for chunk_ids in split_every(BILLING_CHUNK_SIZE, changed.ids):
+            Visit.browse(chunk_ids).write(vals)
+
+        changed._post_billing_summary(billing_status, export_batches)
+        return changed
+
+    def _post_billing_summary(self, billing_status, export_batches=None):
+        """Post one chatter message per export batch for a billing transition."""
+        SepeExport = self.env['wfm.sepe.export']
+        SepeExport.flush_model(['visit_ids'])
+        batch_filter = SQL("AND export_id = ANY(%s)", export_batches.ids) if export_batches else SQL()
+        self.env.cr.execute(SQL(
+            """
+            SELECT export_id, COUNT(*)
+              FROM wfm_sepe_export_visit_rel
+             WHERE visit_id = ANY(%s) %s
+             GROUP BY export_id
+            """,
+            self.ids, batch_filter,
+        ))
+        counts = dict(self.env.cr.fetchall())
+
+        status_label = dict(self._fields['billing_status'].selection).get(billing_status, billing_status)
+        for batch in SepeExport.browse(list(counts)):
+            batch.message_post(
+                body=_('%(count)s visits moved to billing status %(status)s.',
+                       count=counts[batch.id], status=status_label),
+                message_type='notification',
+                subtype_xmlid='mail.mt_note',
+            )
+
     @api.model
     def _get_billing_dashboard_data(self):
         """Return billing statistics for dashboard."""
@@ -251,18 +334,34 @@ class WfmVisit(models.Model):
         for vals in vals_list:
             if vals.get('name', _('New')) == _('New'):
                 vals['name'] = self.env['ir.sequence'].next_by_code('wfm.visit') or _('New')
-        return super().create(vals_list)
+        visits = super().create(vals_list)
+        self.env['wfm.contract']._recompute_statistics_for_clients(visits.client_id.ids)
+        return visits
 
     def write(self, vals):
         """Override write to trigger notifications on partner assignment."""
+        stats_changed = not CONTRACT_STAT_TRIGGER_FIELDS.isdisjoint(vals)
+        old_client_ids = self.client_id.ids if stats_changed and 'client_id' in vals else []
+
         result = super().write(vals)
 
+        if stats_changed:
+            self.env['wfm.contract']._recompute_statistics_for_clients(
+                old_client_ids + self.client_id.ids
+            )
+
         # Trigger notification agent when partner is assigned
         if 'partner_id' in vals and vals['partner_id']:
             self._trigger_notification_agent()
 
         return result
 
+    def unlink(self):
+        client_ids = self.client_id.ids
+        result = super().unlink()
+        self.env['wfm.contract']._recompute_statistics_for_clients(client_ids)
+        return result
+
     def _trigger_notification_agent(self):
         """
         Autonomous Notification Agent - called when partner is assigned.
@@ -0,0 +1,176 @@
+import logging
+import re
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Index names reported by EXPLAIN, e.g. "Index Scan using x on t", "Bitmap Index Scan on x"
+_INDEX_RE = re.compile(r'(?:Index(?: Only)? Scan(?: Backward)? using|Bitmap Index Scan on) (\w+)')
+
+
+class WfmVisitIndexAdvisor(models.AbstractModel):
+    """EXPLAIN diagnostic for the hot wfm.visit query shapes.
+
+    Builds each query with the ORM, exactly as the calling code does, and
+    captures its plan, optionally against synthetic visits created through
+    the ORM inside a savepoint that is rolled back afterwards.
+    """
+
+    _name = 'wfm.visit.index.advisor'
+    _description = 'Visit Index Advisor'
+
+    @api.model
+    def _get_hot_query_shapes(self, partner_id, client_id, today):
+        """(name, domain, order, limit, count) of the hot wfm.visit queries."""
+        month_ago = today - timedelta(days=30)
+        week_end = today + timedelta(days=6)
+        return [
+            ('partner_health_done_30d', [
+                ('partner_id', '=', partner_id), ('state', '=', 'done'),
+                ('visit_date', '>=', month_ago), ('visit_date', '<=', today),
+            ], None, None, True),
+            ('partner_last_done_visit', [
+                ('partner_id', '=', partner_id), ('state', '=', 'done'),
+            ], 'visit_date desc', 1, False),
+            ('assignment_conflicts', [
+                ('partner_id', '=', partner_id), ('visit_date', '=', today),
+                ('state', 'not in', ['cancelled', 'done']),
+            ], None, None, True),
+            ('assignment_week_load', [
+                ('partner_id', '=', partner_id),
+                ('visit_date', '>=', today), ('visit_date', '<=', week_end),
+                ('state', 'not in', ['cancelled']),
+            ], None, None, True),
+            ('whatsapp_pending_assignment', [
+                ('partner_id', '=', partner_id), ('state', '=', 'assigned'),
+            ], 'create_date desc', 1, False),
+            ('whatsapp_24h_reminders', [
+                ('visit_date', '=', today + timedelta(days=1)),
+                ('state', 'in', ['assigned', 'confirmed']), ('partner_id', '!=', False),
+            ], None, None, False),
+            ('contract_client_period', [
+                ('client_id', '=', client_id),
+                ('visit_date', '>=', today - timedelta(days=365)), ('visit_date', '<=', today),
+            ], None, None, True),
+            ('billing_not_billed', [
+                ('state', '=', 'done'), ('billing_status', '=', 'not_billed'),
+            ], None, None, True),
+            ('sepe_daily_export', [
+                ('visit_date', '=', today - timedelta(days=1)),
+                ('state', '=', 'done'), ('sepe_exported', '=', False),
+            ], None, None, False),
+            ('sepe_wizard_period', [
+                ('visit_date', '>=', month_ago), ('visit_date', '<=', today),
+                ('state', '=', 'done'), ('sepe_exported', '=', False),
+            ], None, None, False),
+            ('dashboard_sepe_pending', [
+                ('state', '=', 'done'), ('sepe_exported', '=', False),
+            ], None, None, True),
+        ]
+
+    @api.model
+    def explain_hot_queries(self, seed_rows=0, analyze=True):
+        """Capture EXPLAIN plans for the hot wfm.visit queries.
+
+        Args:
+            seed_rows: number of synthetic visits to insert (spread over two
+                years, across existing clients, installations and partners)
+                through the ORM before explaining; everything is rolled back
+                afterwards
+            analyze: run EXPLAIN ANALYZE (executes the queries)
+
+        Returns:
+            list of dicts with the query name, SQL, plan lines and the
+            indexes the plan uses
+        """
+        Visit = self.env['wfm.visit']
+        Visit.flush_model()
+        cr = self.env.cr
+        today = fields.Date.context_today(self)
+
+        with cr.savepoint(flush=False) as savepoint:
+            if seed_rows:
+                self._seed_visits(seed_rows)
+                cr.execute(SQL("ANALYZE wfm_visit"))
+
+            sample = Visit.search([('partner_id', '!=', False)], limit=1)
+            partner_id = sample.partner_id.id or 0
+            client_id = sample.client_id.id or 0
+
+            report = []
+            for name, domain, order, limit, count in self._get_hot_query_shapes(partner_id, client_id, today):
+                query = Visit._search(domain, order=order, limit=limit)
+                sql = query.select(SQL("COUNT(*)")) if count else query.select()
+                cr.execute(SQL("EXPLAIN (ANALYZE %s, FORMAT TEXT) %s", SQL("TRUE" if analyze else "FALSE"), sql))
+                plan = [row[0] for row in cr.fetchall()]
+                indexes = sorted({match for line in plan for match in _INDEX_RE.findall(line)})
+                report.append({
+                    'name': name,
+                    'sql': cr.mogrify(sql.code, sql.params).decode(),
+                    'plan': plan,
+                    'indexes': indexes,
+                    'uses_index': bool(indexes),
+                })
+
+            savepoint.rollback()
+        self.env.invalidate_all()
+
+        for entry in report:
+            _logger.info(f"Visit query {entry['name']}: {', '.join(entry['indexes']) or 'sequential scan'}")
+        return report
+
+    @api.model
+    def _seed_visits(self, count, batch_size=1000):
+        """Create synthetic visits through the ORM, for plans on a realistic volume.
+
+        Visits cycle over the existing installations (with their client) and
+        WFM partners, two years back to two months ahead: past visits are
+        mostly done and billed, future ones draft, assigned or confirmed.
+        Going through create() fills every required column, the sequence
+        and the stored computes as for real visits.
+
+        Returns:
+            number of visits created
+        """
+        installations = self.env['wfm.installation'].search_fetch([('client_id', '!=', False)], ['client_id'])
+        partners = self.env['res.partner'].search([('is_wfm_partner', '=', True)])
+        if not installations or not partners:
+            return 0
+
+        Visit = self.env['wfm.visit'].with_context(
+            tracking_disable=True, mail_create_nolog=True, mail_notrack=True,
+        )
+        today = fields.Date.context_today(self)
+        past_states = ['done'] * 9 + ['cancelled']
+        future_states = ['draft', 'assigned', 'confirmed', 'confirmed', 'confirmed']
+        billing_statuses = ['settled', 'client_paid', 'invoiced', 'not_billed']
+
+        created = 0
+        for start in range(0, count, batch_size):
+            vals_list = []
+            for g in range(start, min(start + batch_size, count)):
+                installation = installations[g % len(installations)]
+                visit_date = today - timedelta(days=730 - g * 790 // count)
+                age = (today - visit_date).days
+                vals_list.append({
+                    'client_id': installation.client_id.id,
+                    'installation_id': installation.id,
+                    'partner_id': partners[g % len(partners)].id,
+                    'visit_date': visit_date,
+                    'start_time': 9.0,
+                    'end_time': 11.0,
+                    'state': past_states[g % 10] if age > 0 else future_states[g % 5],
+                    'billing_status': billing_statuses[min(3, max(0, 3 - age // 30))],
+                    'sepe_exported': age > 1,
+                })
+            Visit.create(vals_list)
+            created += len(vals_list)
+            # Keep memory flat on large seeds
+            Visit.flush_model()
+            self.env.invalidate_all()
+
+        _logger.info(f"Seeded {created} synthetic visits for EXPLAIN")
+        return created
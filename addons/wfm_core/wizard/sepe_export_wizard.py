@@ -41,6 +41,12 @@ class SepeExportWizard(models.TransientModel):
         help='Include visits that were previously exported to SEPE'
     )
 
+    export_format = fields.Selection([
+        ('xlsx', 'Excel (XLSX)'),
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet (compressed, columnar)'),
+    ], default='xlsx', required=True, string='Format')
+
     currency_id = fields.Many2one(
         'res.currency',
         default=lambda self: self.env.company.currency_id
@@ -66,7 +72,7 @@ class SepeExportWizard(models.TransientModel):
         return domain
 
     def action_create_export(self):
-        """Create SEPE export batch and generate Excel."""
+        """Create SEPE export batch and queue its Excel generation."""
         self.ensure_one()
 
         domain = self._get_visit_domain()
@@ -79,9 +85,10 @@ class SepeExportWizard(models.TransientModel):
             'date_from': self.date_from,
             'date_to': self.date_to,
             'visit_ids': [(6, 0, visits.ids)],
+            'export_format': self.export_format,
         })
 
-        export.action_generate_excel()
+        export.action_queue_generation()
 
         return {
             'type': 'ir.actions.act_window',
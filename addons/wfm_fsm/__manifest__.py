@@ -1,6 +1,6 @@
 {
     'name': 'WFM Field Service Management',
-    'version': '19.0.4.0.0',
+    'version': '19.0.4.3.0',
     'category': 'Services/Field Service',
     'summary': 'Kanban, Dashboard, Smart Assignment, Churn Prediction, AI Retention for GEP OHS Workforce Management',
     'description': """
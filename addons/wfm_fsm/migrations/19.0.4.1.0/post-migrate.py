@@ -0,0 +1,33 @@
+"""Fill the visited-installation set of existing relationships.
+
+installations_visited is now maintained incrementally from this set, so
+it has to contain every installation already visited before the upgrade.
+"""
+
+
+def migrate(cr, version):
+    if not version:
+        return
+
+    cr.execute("""
+        INSERT INTO wfm_relationship_installation_rel (relationship_id, installation_id)
+        SELECT DISTINCT rel.id, v.installation_id
+          FROM wfm_partner_client_relationship rel
+          JOIN wfm_visit v
+            ON v.partner_id = rel.partner_id
+           AND v.client_id = rel.client_id
+         WHERE v.state = 'done'
+           AND v.installation_id IS NOT NULL
+        ON CONFLICT DO NOTHING
+    """)
+
+    cr.execute("""
+        UPDATE wfm_partner_client_relationship rel
+           SET installations_visited = COALESCE(counts.n, 0)
+          FROM wfm_partner_client_relationship rel2
+     LEFT JOIN (SELECT relationship_id, COUNT(*) AS n
+                  FROM wfm_relationship_installation_rel
+                 GROUP BY relationship_id) AS counts
+            ON counts.relationship_id = rel2.id
+         WHERE rel2.id = rel.id
+    """)
@@ -0,0 +1,31 @@
+"""Fill the partner health score history from existing health records.
+
+The health cron now reads the previous score from this history, so it
+must hold the scores computed before the upgrade: daily points for the
+recent months, monthly averages for older ones (see HISTORY_DAILY_DAYS).
+"""
+
+
+def migrate(cr, version):
+    if not version:
+        return
+
+    cr.execute("""
+        INSERT INTO wfm_partner_health_history
+               (partner_id, period_start, granularity, churn_risk_score, max_risk_score, sample_count)
+        SELECT partner_id, computed_date, 'day', churn_risk_score, churn_risk_score, 1
+          FROM wfm_partner_health
+         WHERE computed_date >= date_trunc('month', CURRENT_DATE - 90)::date
+        ON CONFLICT DO NOTHING
+    """)
+
+    cr.execute("""
+        INSERT INTO wfm_partner_health_history
+               (partner_id, period_start, granularity, churn_risk_score, max_risk_score, sample_count)
+        SELECT partner_id, date_trunc('month', computed_date)::date, 'month',
+               AVG(churn_risk_score), MAX(churn_risk_score), COUNT(*)
+          FROM wfm_partner_health
+         WHERE computed_date < date_trunc('month', CURRENT_DATE - 90)::date
+         GROUP BY partner_id, date_trunc('month', computed_date)
+        ON CONFLICT DO NOTHING
+    """)
@@ -0,0 +1,39 @@
+"""Backfill the last action of partner health records.
+
+last_intervention_date and last_intervention_type became stored fields.
+The columns are created and filled with one SQL statement before the
+module update, so the ORM does not recompute every health record (and
+the stored needs_intervention depending on them) on upgrade. Mirrors
+wfm.partner.health._compute_last_intervention and
+_compute_needs_intervention.
+"""
+
+
+def migrate(cr, version):
+    if not version:
+        return
+
+    cr.execute("""
+        ALTER TABLE wfm_partner_health
+            ADD COLUMN IF NOT EXISTS last_intervention_date date,
+            ADD COLUMN IF NOT EXISTS last_intervention_type varchar
+    """)
+
+    cr.execute("""
+        UPDATE wfm_partner_health h
+           SET last_intervention_date = last.date,
+               last_intervention_type = last.intervention_type
+          FROM (SELECT DISTINCT ON (health_id) health_id, date::date AS date, intervention_type
+                  FROM wfm_partner_intervention
+                 WHERE health_id IS NOT NULL
+                 ORDER BY health_id, date DESC, id DESC) AS last
+         WHERE last.health_id = h.id
+    """)
+
+    # needs_intervention could not follow new actions before, refresh it
+    cr.execute("""
+        UPDATE wfm_partner_health
+           SET needs_intervention = risk_level IN ('high', 'critical')
+                                    AND (last_intervention_date IS NULL
+                                         OR CURRENT_DATE - last_intervention_date > 14)
+    """)
@@ -3,4 +3,7 @@ from . import assignment_engine
 from . import visit_fsm
 from . import dashboard
 from . import partner_health
+from . import partner_health_history
 from . import ai_retention_engine
+from . import llm_cache
+from . import churn_backtest
@@ -1,6 +1,15 @@
 import json
 import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
 from odoo import models, fields, api
+from odoo.tools import SQL, split_every
+
+from .llm_json import LLMOutputError, parse_json_object, request_json
 
 _logger = logging.getLogger(__name__)
 
@@ -9,6 +18,91 @@ LITELLM_API_KEY = "sk-nJE8QNo249xmGq1KMFJAIw"
 LITELLM_BASE_URL = "https://prod.litellm.deeprunner.ai"
 CLAUDE_MODEL = "claude-3-5-haiku-latest"
 
+# Bulk outreach: concurrent LLM calls, request rate, retries and write batches
+BULK_MAX_WORKERS = 4
+BULK_REQUESTS_PER_MINUTE = 60
+BULK_MAX_RETRIES = 3
+BULK_RETRY_BACKOFF = 2.0  # seconds, doubled after each failed attempt
+BULK_WRITE_BATCH = 20
+
+# Partner context sent to the LLM: most recent / strongest rows per partner
+CONTEXT_VISIT_LIMIT = 10
+CONTEXT_INTERVENTION_LIMIT = 5
+CONTEXT_RELATIONSHIP_LIMIT = 5
+
+RETENTION_SYSTEM_PROMPT = """You are an expert retention specialist for GEP Group, Greece's largest Occupational Health & Safety (OHS) service provider.
+
+Your job is to analyze partner (external contractor) data and create personalized retention strategies. Partners are physicians and safety engineers who conduct OHS visits for GEP's clients.
+
+You must respond in JSON format with these exact keys:
+- analysis: Your understanding of why this partner might leave (2-3 sentences)
+- risk_factors: Array of specific risk factors identified
+- recommended_action: The single best action to take right now
+- urgency: "immediate", "this_week", or "monitor"
+- whatsapp_message: A warm, personalized WhatsApp message in GREEK to re-engage them (use their name, reference specific data)
+- email_subject: Email subject line in Greek
+- email_body: Full email body in Greek (professional but warm)
+- talking_points: Array of 3-4 points for a phone call
+
+Keep messages genuine, not salesy. Reference specific data points to show you understand their situation."""
+RETENTION_TEMPERATURE = 0.7
+
+# Keys a partner recommendation must contain to be shown as AI output
+RECOMMENDATION_KEYS = ('recommended_partner', 'reasoning')
+
+
+def _retention_messages(prompt):
+    return [
+        {"role": "system", "content": RETENTION_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+class _RateLimiter:
+    """Thread-safe limiter spacing requests evenly to at most N per minute."""
+
+    def __init__(self, per_minute):
+        self._interval = 60.0 / per_minute
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+def _request_retention_strategy(client, prompt, limiter=None, max_retries=BULK_MAX_RETRIES):
+    """Call the LLM for one retention prompt, retrying failures with backoff.
+
+    Runs in worker threads: it must not touch the Odoo environment.
+
+    Returns:
+        raw response text
+    """
+    attempt = 0
+    while True:
+        if limiter:
+            limiter.wait()
+        try:
+            response = client.chat.completions.create(
+                model=CLAUDE_MODEL,
+                messages=_retention_messages(prompt),
+                temperature=RETENTION_TEMPERATURE,
+                max_tokens=2000
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            delay = BULK_RETRY_BACKOFF * 2 ** (attempt - 1)
+            _logger.warning(f"Retention LLM call failed ({e}), retry {attempt}/{max_retries} in {delay:.0f}s")
+            time.sleep(delay)
+
 
 class AIRetentionEngine(models.Model):
     """
@@ -25,13 +119,14 @@ class AIRetentionEngine(models.Model):
 
     name = fields.Char(default='AI Retention Engine')
 
-    def get_ai_partner_recommendation(self, visit_id, candidates):
+    def get_ai_partner_recommendation(self, visit_id, candidates, bypass_cache=False):
         """
         Use Claude to analyze candidates and recommend the best partner for a visit.
 
         Args:
             visit_id: The visit record ID
             candidates: List of dicts with partner info and scores from the rule-based engine
+            bypass_cache: ask the LLM even if the same question was answered recently
 
         Returns:
             dict with AI analysis and recommendation
@@ -89,12 +184,10 @@ class AIRetentionEngine(models.Model):
             return {'error': 'Could not initialize AI client'}
 
         try:
-            response = client.chat.completions.create(
-                model=CLAUDE_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert OHS coordinator for GEP Group, Greece's largest Occupational Health & Safety provider.
+            messages = [
+                {
+                    "role": "system",
+                    "content": """You are an expert OHS coordinator for GEP Group, Greece's largest Occupational Health & Safety provider.
 
 Your task: Analyze partner candidates and recommend the BEST one for a client visit.
 
@@ -117,43 +210,40 @@ OUTPUT FORMAT - Respond with ONLY valid JSON (no markdown, no explanation outsid
   "concerns": "Any issues to watch out for, or null if none",
   "summary": "One-line summary for the coordinator"
 }"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.5,
-                max_tokens=800
-            )
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+
+            def request():
+                result = request_json(
+                    client, CLAUDE_MODEL, messages, 0.5, 800, required_keys=RECOMMENDATION_KEYS
+                )
+                return json.dumps(result, ensure_ascii=False)
 
-            ai_response = response.choices[0].message.content
+            ai_response = self.env['wfm.llm.cache']._get_completion(
+                CLAUDE_MODEL, messages, 0.5, request,
+                purpose='partner_recommendation', bypass=bypass_cache,
+            )
             _logger.info(f"Claude AI response: {ai_response[:500]}...")
 
-            # Parse JSON response
-            try:
-                json_str = ai_response
-                # Extract JSON from markdown code blocks
-                if '```json' in ai_response:
-                    json_str = ai_response.split('```json')[1].split('```')[0]
-                elif '```' in ai_response:
-                    json_str = ai_response.split('```')[1].split('```')[0]
-
-                result = json.loads(json_str.strip())
-                result['success'] = True
-                _logger.info(f"Parsed AI result: {result}")
-                return result
-            except json.JSONDecodeError as je:
-                _logger.warning(f"JSON parse failed: {je}. Raw response: {ai_response}")
-                # Try to extract info from raw text response
-                return {
-                    'success': True,
-                    'raw_response': ai_response,
-                    'recommended_partner': candidates[0]['partner_name'] if candidates else None,
-                    'reasoning': ai_response[:300] if ai_response else 'AI analysis completed',
-                    'confidence': 'medium',
-                }
+            result = parse_json_object(ai_response, RECOMMENDATION_KEYS)
+            result['success'] = True
+            _logger.info(f"Parsed AI result: {result}")
+            return result
 
+        except LLMOutputError as e:
+            _logger.warning(f"AI recommendation unusable after repair: {e}. Raw response: {e.raw}")
+            # Fall back to the rule-based top candidate
+            return {
+                'success': True,
+                'raw_response': e.raw,
+                'recommended_partner': candidates[0]['partner_name'] if candidates else None,
+                'reasoning': e.raw[:300] if e.raw else 'AI analysis completed',
+                'confidence': 'low',
+            }
         except Exception as e:
             _logger.error(f"AI recommendation failed: {str(e)}")
             return {'error': str(e), 'success': False}
@@ -217,75 +307,130 @@ Respond with JSON only."""
         Gather comprehensive context about a partner for AI analysis.
         Returns a structured dict with all relevant data.
         """
-        partner = partner_health.partner_id
-
-        # Get visit history
-        visits = self.env['wfm.visit'].search([
-            ('partner_id', '=', partner.id)
-        ], order='visit_date desc', limit=20)
-
-        visit_summary = []
-        for v in visits:
-            visit_summary.append({
-                'date': str(v.visit_date),
-                'client': v.client_id.name if v.client_id else 'Unknown',
-                'status': v.state,
-                'cancelled': v.state == 'cancelled',
-            })
+        return self._gather_partner_contexts(partner_health)[partner_health.id]
 
-        # Get past interventions
-        interventions = self.env['wfm.partner.intervention'].search([
-            ('partner_id', '=', partner.id)
-        ], order='date desc', limit=5)
-
-        intervention_history = []
-        for i in interventions:
-            intervention_history.append({
-                'date': str(i.date),
-                'type': dict(i._fields['intervention_type'].selection).get(i.intervention_type),
-                'outcome': dict(i._fields['outcome'].selection).get(i.outcome),
-                'notes': i.notes or '',
-            })
+    def _fetch_top_rows_per_partner(self, model_name, columns, order, limit, partner_ids):
+        """Read the first `limit` rows per partner of a model in one query.
 
-        # Get relationship data
-        relationships = self.env['wfm.partner.client.relationship'].search([
-            ('partner_id', '=', partner.id)
-        ], order='relationship_score desc', limit=5)
-
-        top_clients = []
-        for r in relationships:
-            top_clients.append({
-                'client': r.client_id.name,
-                'total_visits': r.total_visits,
-                'score': r.relationship_score,
-            })
+        Rows are ranked with ROW_NUMBER() over the record's partner_id, in
+        the given ORM order; record rules apply as with search().
 
-        return {
-            'partner': {
-                'name': partner.name,
-                'specialty': partner.specialty if hasattr(partner, 'specialty') else 'Unknown',
-                'city': partner.city or 'Unknown',
-                'phone': partner.phone or partner.mobile or 'No phone',
-                'email': partner.email or 'No email',
-            },
-            'health_metrics': {
-                'risk_score': partner_health.churn_risk_score,
-                'risk_level': partner_health.risk_level,
-                'visits_last_30d': partner_health.visits_last_30d,
-                'visits_previous_30d': partner_health.visits_previous_30d,
-                'visits_declined': partner_health.visits_declined_30d,
-                'days_since_last_visit': partner_health.days_since_last_visit,
-                'decline_rate_score': partner_health.decline_rate_score,
-                'inactivity_score': partner_health.inactivity_score,
-                'volume_change_score': partner_health.volume_change_score,
-                'payment_issue_score': partner_health.payment_issue_score,
-            },
-            'recent_visits': visit_summary[:10],
-            'past_interventions': intervention_history,
-            'top_client_relationships': top_clients,
+        Returns:
+            dict of partner ID -> list of row tuples (columns order)
+        """
+        Model = self.env[model_name]
+        Model.flush_model(['partner_id', *columns])
+        query = Model._search([('partner_id', 'in', partner_ids)])
+        partner_column = SQL.identifier(Model._table, 'partner_id')
+        ranked = query.select(
+            partner_column,
+            *(SQL.identifier(Model._table, column) for column in columns),
+            SQL(
+                "ROW_NUMBER() OVER (PARTITION BY %s ORDER BY %s) AS partner_rank",
+                partner_column, Model._order_to_sql(order, query),
+            ),
+        )
+        self.env.cr.execute(SQL(
+            "SELECT * FROM (%s) AS ranked WHERE partner_rank <= %s ORDER BY partner_id, partner_rank",
+            ranked, limit,
+        ))
+        rows_by_partner = defaultdict(list)
+        for partner_id, *values, _rank in self.env.cr.fetchall():
+            rows_by_partner[partner_id].append(values)
+        return rows_by_partner
+
+    def _gather_partner_contexts(self, health_records):
+        """Gather the AI context of many partners with one query per data kind.
+
+        Recent visits, interventions and top relationships are read top-k
+        per partner with window queries; client names and selection labels
+        are resolved once for the whole batch.
+
+        Returns:
+            dict of health record ID -> context dict (see _gather_partner_context)
+        """
+        partner_ids = health_records.partner_id.ids
+
+        visit_rows = self._fetch_top_rows_per_partner(
+            'wfm.visit', ['visit_date', 'client_id', 'state'],
+            'visit_date desc, id desc', CONTEXT_VISIT_LIMIT, partner_ids,
+        )
+        intervention_rows = self._fetch_top_rows_per_partner(
+            'wfm.partner.intervention', ['date', 'intervention_type', 'outcome', 'notes'],
+            'date desc, id desc', CONTEXT_INTERVENTION_LIMIT, partner_ids,
+        )
+        relationship_rows = self._fetch_top_rows_per_partner(
+            'wfm.partner.client.relationship', ['client_id', 'total_visits', 'relationship_score'],
+            'relationship_score desc, id', CONTEXT_RELATIONSHIP_LIMIT, partner_ids,
+        )
+
+        client_ids = {row[1] for rows in visit_rows.values() for row in rows if row[1]}
+        client_ids.update(row[0] for rows in relationship_rows.values() for row in rows)
+        clients = self.env['res.partner'].browse(client_ids)
+        clients.fetch(['name'])
+        client_names = {client.id: client.name for client in clients}
+
+        Intervention = self.env['wfm.partner.intervention']
+        type_labels = dict(Intervention._fields['intervention_type'].selection)
+        outcome_labels = dict(Intervention._fields['outcome'].selection)
+
+        visits_by_partner = {
+            partner_id: [{
+                'date': str(visit_date),
+                'client': client_names.get(client_id) or 'Unknown',
+                'status': state,
+                'cancelled': state == 'cancelled',
+            } for visit_date, client_id, state in rows]
+            for partner_id, rows in visit_rows.items()
+        }
+        interventions_by_partner = {
+            partner_id: [{
+                'date': str(date),
+                'type': type_labels.get(intervention_type),
+                'outcome': outcome_labels.get(outcome),
+                'notes': notes or '',
+            } for date, intervention_type, outcome, notes in rows]
+            for partner_id, rows in intervention_rows.items()
         }
+        clients_by_partner = {
+            partner_id: [{
+                'client': client_names.get(client_id),
+                'total_visits': total_visits,
+                'score': score,
+            } for client_id, total_visits, score in rows]
+            for partner_id, rows in relationship_rows.items()
+        }
+
+        contexts = {}
+        for partner_health in health_records:
+            partner = partner_health.partner_id
+            contexts[partner_health.id] = {
+                'partner': {
+                    'name': partner.name,
+                    'specialty': partner.specialty if hasattr(partner, 'specialty') else 'Unknown',
+                    'city': partner.city or 'Unknown',
+                    'phone': partner.phone or partner.mobile or 'No phone',
+                    'email': partner.email or 'No email',
+                },
+                'health_metrics': {
+                    'risk_score': partner_health.churn_risk_score,
+                    'risk_level': partner_health.risk_level,
+                    'visits_last_30d': partner_health.visits_last_30d,
+                    'visits_previous_30d': partner_health.visits_previous_30d,
+                    'visits_declined': partner_health.visits_declined_30d,
+                    'days_since_last_visit': partner_health.days_since_last_visit,
+                    'decline_rate_score': partner_health.decline_rate_score,
+                    'inactivity_score': partner_health.inactivity_score,
+                    'volume_change_score': partner_health.volume_change_score,
+                    'payment_issue_score': partner_health.payment_issue_score,
+                },
+                'recent_visits': visits_by_partner.get(partner.id, []),
+                'past_interventions': interventions_by_partner.get(partner.id, []),
+                'top_client_relationships': clients_by_partner.get(partner.id, []),
+            }
+        return contexts
 
-    def analyze_partner_and_generate_outreach(self, partner_health_id):
+    def analyze_partner_and_generate_outreach(self, partner_health_id, bypass_cache=False):
         """
         Main method: Analyze partner and generate personalized retention strategy.
 
@@ -296,6 +441,9 @@ Respond with JSON only."""
         - whatsapp_message: Ready-to-send Greek message
         - email_subject: Email subject line
         - email_body: Email content
+
+        Unchanged partner data is answered from the LLM cache unless
+        bypass_cache is set. Only replies holding a JSON object are cached.
         """
         partner_health = self.env['wfm.partner.health'].browse(partner_health_id)
         if not partner_health.exists():
@@ -312,65 +460,42 @@ Respond with JSON only."""
         if not client:
             return {'error': 'Could not initialize AI client'}
 
-        try:
-            response = client.chat.completions.create(
-                model=CLAUDE_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert retention specialist for GEP Group, Greece's largest Occupational Health & Safety (OHS) service provider.
+        def request():
+            ai_response = _request_retention_strategy(client, prompt, max_retries=0)
+            # Raises before _get_completion stores an unusable reply
+            parse_json_object(ai_response)
+            return ai_response
 
-Your job is to analyze partner (external contractor) data and create personalized retention strategies. Partners are physicians and safety engineers who conduct OHS visits for GEP's clients.
-
-You must respond in JSON format with these exact keys:
-- analysis: Your understanding of why this partner might leave (2-3 sentences)
-- risk_factors: Array of specific risk factors identified
-- recommended_action: The single best action to take right now
-- urgency: "immediate", "this_week", or "monitor"
-- whatsapp_message: A warm, personalized WhatsApp message in GREEK to re-engage them (use their name, reference specific data)
-- email_subject: Email subject line in Greek
-- email_body: Full email body in Greek (professional but warm)
-- talking_points: Array of 3-4 points for a phone call
-
-Keep messages genuine, not salesy. Reference specific data points to show you understand their situation."""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000
+        try:
+            ai_response = self.env['wfm.llm.cache']._get_completion(
+                CLAUDE_MODEL, _retention_messages(prompt), RETENTION_TEMPERATURE, request,
+                purpose='retention_strategy', bypass=bypass_cache,
             )
-
-            # Parse response
-            ai_response = response.choices[0].message.content
-
-            # Try to parse as JSON
-            try:
-                # Handle potential markdown code blocks
-                if '```json' in ai_response:
-                    ai_response = ai_response.split('```json')[1].split('```')[0]
-                elif '```' in ai_response:
-                    ai_response = ai_response.split('```')[1].split('```')[0]
-
-                result = json.loads(ai_response.strip())
-                result['success'] = True
-                result['partner_name'] = context['partner']['name']
-                result['risk_score'] = context['health_metrics']['risk_score']
-                return result
-            except json.JSONDecodeError:
-                # Return raw response if JSON parsing fails
-                return {
-                    'success': True,
-                    'raw_response': ai_response,
-                    'partner_name': context['partner']['name'],
-                }
-
+        except LLMOutputError as e:
+            _logger.warning(f"AI retention strategy is not JSON, not cached: {e}")
+            ai_response = e.raw
         except Exception as e:
             _logger.error(f"AI retention analysis failed: {str(e)}")
             return {'error': str(e), 'success': False}
 
+        return self._parse_retention_response(ai_response, context)
+
+    def _parse_retention_response(self, ai_response, context):
+        """Parse the JSON strategy returned by the LLM for one partner."""
+        try:
+            result = parse_json_object(ai_response)
+            result['success'] = True
+            result['partner_name'] = context['partner']['name']
+            result['risk_score'] = context['health_metrics']['risk_score']
+            return result
+        except LLMOutputError:
+            # Return raw response if JSON parsing fails
+            return {
+                'success': True,
+                'raw_response': ai_response,
+                'partner_name': context['partner']['name'],
+            }
+
     def _build_retention_prompt(self, context):
         """Build a detailed prompt for Claude with all partner context"""
 
@@ -423,23 +548,131 @@ Remember: Write WhatsApp and email messages in GREEK. Be genuine and reference s
 
         return prompt
 
-    def generate_bulk_outreach(self, risk_level='critical'):
+    def generate_bulk_outreach(self, risk_level='critical', max_workers=BULK_MAX_WORKERS,
+                               commit_progress=False, skip_fresh_hours=None, bypass_cache=False):
         """
-        Generate outreach for all partners at a given risk level.
+        Generate outreach for all partners at the given risk level(s).
+
+        Context for all partners is prefetched in grouped queries, then the
+        LLM calls run on a bounded thread pool with rate limiting and
+        retries, BULK_WRITE_BATCH prompts at a time. Prompts already
+        answered are served from the LLM cache (looked up and stored in the
+        main thread). The AI fields of each chunk are written back before
+        the next one starts; with commit_progress the transaction is
+        committed first, so it is never held open while waiting for the LLM.
+
+        Args:
+            risk_level: risk level or list of risk levels
+            max_workers: concurrent LLM calls
+            commit_progress: commit after each written batch (cron only)
+            skip_fresh_hours: skip partners analyzed within this many hours
+            bypass_cache: call the LLM even for cached prompts
+
         Returns list of generated strategies.
         """
-        health_records = self.env['wfm.partner.health'].search([
-            ('risk_level', '=', risk_level),
+        risk_levels = [risk_level] if isinstance(risk_level, str) else list(risk_level)
+        domain = [
+            ('risk_level', 'in', risk_levels),
             ('needs_intervention', '=', True),
-        ])
+        ]
+        if skip_fresh_hours:
+            fresh_since = fields.Datetime.now() - timedelta(hours=skip_fresh_hours)
+            domain += ['|', ('ai_generated_date', '=', False), ('ai_generated_date', '<', fresh_since)]
+        health_records = self.env['wfm.partner.health'].search(domain)
+        if not health_records:
+            return []
+
+        client = self._get_claude_client()
+        if not client:
+            return [{'error': 'Could not initialize AI client', 'success': False}]
+
+        contexts = self._gather_partner_contexts(health_records)
+        limiter = _RateLimiter(BULK_REQUESTS_PER_MINUTE)
+        Health = self.env['wfm.partner.health']
+        IrCron = self.env['ir.cron']
+        Cache = self.env['wfm.llm.cache']
+        bypass_cache = bypass_cache or self.env.context.get('llm_cache_bypass')
+
+        prompts = {}
+        cache_keys = {}
+        cached_responses = {}
+        for health_id, context in contexts.items():
+            prompt = prompts[health_id] = self._build_retention_prompt(context)
+            key = cache_keys[health_id] = Cache._make_key(
+                CLAUDE_MODEL, _retention_messages(prompt), RETENTION_TEMPERATURE
+            )
+            cached = None if bypass_cache else Cache._lookup(key)
+            if cached is not None:
+                cached_responses[health_id] = cached
 
         results = []
-        for health in health_records:
-            result = self.analyze_partner_and_generate_outreach(health.id)
+        pending = {}
+
+        def write_pending():
+            """Write the collected strategies; False when the cron must stop."""
+            if pending:
+                Health.browse(list(pending))._write_ai_strategies(pending)
+            written = len(pending)
+            pending.clear()
+            if commit_progress:
+                return IrCron._commit_progress(written, remaining=len(contexts) - len(results))
+            return True
+
+        def collect(health_id, ai_response):
+            result = self._parse_retention_response(ai_response, contexts[health_id])
+            result['health_id'] = health_id
             results.append(result)
-
+            if result.get('success'):
+                pending[health_id] = result
+            return result
+
+        for health_id, ai_response in cached_responses.items():
+            collect(health_id, ai_response)
+        if not write_pending():
+            return results
+
+        to_request = [health_id for health_id in prompts if health_id not in cached_responses]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for chunk in split_every(BULK_WRITE_BATCH, to_request):
+                # No database access until the whole chunk is answered
+                futures = {
+                    pool.submit(_request_retention_strategy, client, prompts[health_id], limiter): health_id
+                    for health_id in chunk
+                }
+                responses = {}
+                for future in as_completed(futures):
+                    health_id = futures[future]
+                    try:
+                        responses[health_id] = future.result()
+                    except Exception as e:
+                        partner_name = contexts[health_id]['partner']['name']
+                        _logger.error(f"AI retention analysis failed for {partner_name}: {e}")
+                        results.append({'error': str(e), 'success': False, 'partner_name': partner_name, 'health_id': health_id})
+
+                for health_id, ai_response in responses.items():
+                    # Replies without a JSON object are kept as raw text but not cached
+                    if 'raw_response' not in collect(health_id, ai_response):
+                        Cache._store(cache_keys[health_id], CLAUDE_MODEL, RETENTION_TEMPERATURE, ai_response,
+                                     purpose='retention_strategy')
+                if not write_pending():
+                    # Out of cron time: the rest is picked up by the next run
+                    break
+
+        _logger.info(
+            f"Bulk retention outreach: {sum(1 for r in results if r.get('success'))}/{len(contexts)} strategies generated"
+        )
         return results
 
+    @api.model
+    def _cron_generate_bulk_outreach(self):
+        """Cron: generate strategies for critical and high risk partners not analyzed today."""
+        self.generate_bulk_outreach(
+            risk_level=['critical', 'high'],
+            commit_progress=True,
+            skip_fresh_hours=20,
+        )
+        return True
+
 
 class WfmPartnerHealthAI(models.Model):
     """Extend Partner Health with AI capabilities"""
@@ -456,6 +689,56 @@ class WfmPartnerHealthAI(models.Model):
     ], string='AI Urgency', readonly=True)
     ai_generated_date = fields.Datetime(string='AI Analysis Date', readonly=True)
 
+    def _prepare_ai_strategy_values(self, result):
+        """AI field values to store from an analyze_partner_and_generate_outreach result."""
+        return {
+            'ai_analysis': result.get('analysis', ''),
+            'ai_whatsapp_message': result.get('whatsapp_message', ''),
+            'ai_recommended_action': result.get('recommended_action', ''),
+            'ai_urgency': result.get('urgency', 'monitor'),
+            'ai_generated_date': fields.Datetime.now(),
+        }
+
+    def _write_ai_strategies(self, results_by_id):
+        """Store the AI strategies of many health records in one UPDATE.
+
+        Every record gets different texts, so write() and flush would still
+        issue one UPDATE per record. The AI fields have no dependents and no
+        tracking; values go through the fields' cache conversion, so they
+        are validated as write() would.
+        """
+        if not self:
+            return
+        field_names = ['ai_analysis', 'ai_whatsapp_message', 'ai_recommended_action', 'ai_urgency', 'ai_generated_date']
+        self.flush_recordset(field_names)
+
+        rows = []
+        for record in self:
+            vals = self._prepare_ai_strategy_values(results_by_id[record.id])
+            rows.append(SQL(
+                "(%s, %s, %s, %s, %s, %s::timestamp)",
+                record.id,
+                *(self._fields[name].convert_to_cache(vals[name], record) for name in field_names),
+            ))
+
+        self.env.cr.execute(SQL(
+            """
+            UPDATE wfm_partner_health h
+               SET ai_analysis = v.ai_analysis,
+                   ai_whatsapp_message = v.ai_whatsapp_message,
+                   ai_recommended_action = v.ai_recommended_action,
+                   ai_urgency = v.ai_urgency,
+                   ai_generated_date = v.ai_generated_date,
+                   write_uid = %s,
+                   write_date = %s
+              FROM (VALUES %s) AS v(id, ai_analysis, ai_whatsapp_message, ai_recommended_action,
+                                    ai_urgency, ai_generated_date)
+             WHERE h.id = v.id
+            """,
+            self.env.uid, fields.Datetime.now(), SQL(", ").join(rows),
+        ))
+        self.invalidate_recordset(field_names + ['write_uid', 'write_date'])
+
     def action_generate_ai_retention_strategy(self):
         """Button action to generate AI retention strategy"""
         self.ensure_one()
@@ -464,13 +747,7 @@ class WfmPartnerHealthAI(models.Model):
         result = engine.analyze_partner_and_generate_outreach(self.id)
 
         if result.get('success'):
-            self.write({
-                'ai_analysis': result.get('analysis', ''),
-                'ai_whatsapp_message': result.get('whatsapp_message', ''),
-                'ai_recommended_action': result.get('recommended_action', ''),
-                'ai_urgency': result.get('urgency', 'monitor'),
-                'ai_generated_date': fields.Datetime.now(),
-            })
+            self.write(self._prepare_ai_strategy_values(result))
 
             # Return action to show the result
             return {
@@ -0,0 +1,259 @@
+import logging
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Churn risk factors, in the order of the reconstructed feature columns
+CHURN_FACTORS = ('decline', 'volume', 'inactivity', 'payment', 'feedback')
+
+# Maximum points per factor used by wfm.partner.health._compute_component_scores
+CURRENT_CHURN_WEIGHTS = {
+    'decline': 30,
+    'volume': 25,
+    'inactivity': 20,
+    'payment': 15,
+    'feedback': 10,
+}
+
+# Risk score thresholds evaluated by default: high and critical risk levels
+BACKTEST_THRESHOLDS = (50, 70)
+
+
+def _roc_auc(scores, labels):
+    """Area under the ROC curve (Mann-Whitney U, ties averaged)."""
+    positives = sum(labels)
+    negatives = len(labels) - positives
+    if not positives or not negatives:
+        return None
+    order = sorted(range(len(scores)), key=scores.__getitem__)
+    rank_sum = 0.0
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and scores[order[j + 1]] == scores[order[i]]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum += average_rank * sum(labels[order[k]] for k in range(i, j + 1))
+        i = j + 1
+    return (rank_sum - positives * (positives + 1) / 2) / (positives * negatives)
+
+
+class WfmChurnBacktest(models.AbstractModel):
+    """Offline backtest of the churn risk weights against observed churn.
+
+    Replays wfm.visit history into weekly (or any step) snapshots of the
+    health features of every partner, in one set-based query, and scores
+    weight sets against the churn recorded on health tickets
+    (resolution_outcome) and interventions (outcome).
+    """
+
+    _name = 'wfm.churn.backtest'
+    _description = 'Churn Model Backtest'
+
+    @api.model
+    def _reconstruct_features(self, date_from, date_to, step_days, horizon_days):
+        """Rebuild the normalized churn factors of every partner per snapshot.
+
+        A partner is snapshotted from its first visit until it churns. The
+        factors follow _compute_component_scores, scaled to 0..1, over the
+        visits before the snapshot day; payment and feedback have no
+        history and stay 0, as in the live computation.
+
+        Visits are read once: daily counts per partner become running
+        totals over a dense calendar (window functions), and each snapshot
+        takes the differences of three running rows found by equality
+        joins, instead of scanning its partner's visits again.
+
+        Known gap: the live computation counts assigned and declined visits
+        from 30 days ago without an upper bound, so it includes visits
+        planned after today; snapshots only see visits before the snapshot
+        day, as the future schedule of a past day is not known.
+
+        Returns:
+            (labels, features): labels[i] is 1 when the partner churned
+            within horizon_days after snapshot i, features[i] the tuple of
+            CHURN_FACTORS values
+        """
+        self.env['wfm.visit'].flush_model(['partner_id', 'visit_date', 'state'])
+        self.env['wfm.partner.health'].flush_model(['partner_id', 'resolution_outcome', 'resolution_date', 'computed_date'])
+        self.env['wfm.partner.intervention'].flush_model(['partner_id', 'outcome', 'date'])
+
+        self.env.cr.execute(SQL(
+            """
+            WITH churn AS (
+                SELECT partner_id, MIN(churn_date) AS churn_date
+                  FROM (SELECT partner_id, COALESCE(resolution_date::date, computed_date) AS churn_date
+                          FROM wfm_partner_health
+                         WHERE resolution_outcome = 'churned'
+                         UNION ALL
+                        SELECT partner_id, date::date
+                          FROM wfm_partner_intervention
+                         WHERE outcome = 'churned') AS events
+                 GROUP BY partner_id
+            ), first AS (
+                SELECT partner_id, MIN(visit_date) AS first_day
+                  FROM wfm_visit
+                 WHERE partner_id IS NOT NULL
+                 GROUP BY partner_id
+            ), grid AS (
+                SELECT first.partner_id, snapshot.day::date AS day, churn.churn_date
+                  FROM first
+            CROSS JOIN generate_series(%(date_from)s::date, %(date_to)s::date,
+                                       make_interval(days => %(step_days)s)) AS snapshot(day)
+             LEFT JOIN churn ON churn.partner_id = first.partner_id
+                 WHERE first.first_day < snapshot.day
+                   AND (churn.churn_date IS NULL OR churn.churn_date > snapshot.day)
+            ), daily AS (
+                SELECT partner_id, visit_date,
+                       COUNT(*) FILTER (WHERE state = 'done') AS done,
+                       COUNT(*) FILTER (WHERE state = 'cancelled') AS cancelled,
+                       COUNT(*) AS assigned
+                  FROM wfm_visit
+                 WHERE partner_id IS NOT NULL
+                   AND visit_date < %(date_to)s
+                 GROUP BY partner_id, visit_date
+            ), running AS (
+                -- Totals of the visits up to and including each calendar day
+                SELECT first.partner_id, calendar.day::date AS day,
+                       SUM(COALESCE(daily.done, 0)) OVER w AS done,
+                       SUM(COALESCE(daily.cancelled, 0)) OVER w AS cancelled,
+                       SUM(COALESCE(daily.assigned, 0)) OVER w AS assigned,
+                       MAX(CASE WHEN daily.done > 0 THEN daily.visit_date END) OVER w AS last_done
+                  FROM first
+            CROSS JOIN generate_series(first.first_day, %(date_to)s::date - 1, '1 day') AS calendar(day)
+             LEFT JOIN daily
+                    ON daily.partner_id = first.partner_id
+                   AND daily.visit_date = calendar.day
+                WINDOW w AS (PARTITION BY first.partner_id ORDER BY calendar.day)
+            ), features AS (
+                -- Running rows of the day before the snapshot, 31 and 61 days
+                -- before; missing rows precede the partner's first visit
+                SELECT grid.churn_date IS NOT NULL
+                           AND grid.churn_date <= grid.day + %(horizon_days)s AS churned,
+                       COALESCE(r1.done, 0) - COALESCE(r31.done, 0) AS done_30d,
+                       COALESCE(r31.done, 0) - COALESCE(r61.done, 0) AS done_prev_30d,
+                       COALESCE(r1.cancelled, 0) - COALESCE(r31.cancelled, 0) AS declined_30d,
+                       COALESCE(r1.assigned, 0) - COALESCE(r31.assigned, 0) AS assigned_30d,
+                       grid.day - r1.last_done AS days_inactive
+                  FROM grid
+             LEFT JOIN running r1 ON r1.partner_id = grid.partner_id AND r1.day = grid.day - 1
+             LEFT JOIN running r31 ON r31.partner_id = grid.partner_id AND r31.day = grid.day - 31
+             LEFT JOIN running r61 ON r61.partner_id = grid.partner_id AND r61.day = grid.day - 61
+            )
+            SELECT churned::int,
+                   CASE WHEN assigned_30d > 0
+                        THEN LEAST(declined_30d * 60.0 / assigned_30d, 30) / 30
+                        ELSE 0 END,
+                   CASE WHEN done_prev_30d > 0
+                        THEN LEAST(GREATEST((done_prev_30d - done_30d) * 50.0 / done_prev_30d, 0), 25) / 25
+                        WHEN done_30d = 0 THEN 0.6
+                        ELSE 0 END,
+                   CASE WHEN days_inactive IS NULL OR days_inactive > 60 THEN 1.0
+                        WHEN days_inactive > 30 THEN 0.75
+                        WHEN days_inactive > 14 THEN 0.5
+                        WHEN days_inactive > 7 THEN 0.25
+                        ELSE 0 END
+              FROM features
+            """,
+            date_from=date_from, date_to=date_to, step_days=step_days, horizon_days=horizon_days,
+        ))
+        rows = self.env.cr.fetchall()
+        labels = [row[0] for row in rows]
+        features = [(float(decline), float(volume), float(inactivity), 0.0, 0.0)
+                    for _churned, decline, volume, inactivity in rows]
+        return labels, features
+
+    @api.model
+    def _score_weight_set(self, weights, labels, features, thresholds):
+        """Evaluate one weight set on reconstructed snapshots.
+
+        Weights are rescaled to a 100 point total so the risk level
+        thresholds stay comparable between sets.
+        """
+        total = sum(weights.get(factor, 0) for factor in CHURN_FACTORS) or 1
+        coef = [weights.get(factor, 0) * 100.0 / total for factor in CHURN_FACTORS]
+        c0, c1, c2, c3, c4 = coef
+        scores = [c0 * d + c1 * v + c2 * i + c3 * p + c4 * f for d, v, i, p, f in features]
+
+        positives = sum(labels)
+        by_threshold = {}
+        for threshold in thresholds:
+            flagged = true_positives = 0
+            for score, label in zip(scores, labels):
+                if score >= threshold:
+                    flagged += 1
+                    true_positives += label
+            precision = true_positives / flagged if flagged else 0.0
+            recall = true_positives / positives if positives else 0.0
+            by_threshold[threshold] = {
+                'flagged': flagged,
+                'precision': round(precision, 4),
+                'recall': round(recall, 4),
+                'f1': round(2 * precision * recall / (precision + recall), 4) if precision + recall else 0.0,
+            }
+        auc = _roc_auc(scores, labels)
+        return {
+            'weights': dict(weights),
+            'auc': round(auc, 4) if auc is not None else None,
+            'by_threshold': by_threshold,
+        }
+
+    @api.model
+    def run_backtest(self, weight_sets=None, date_from=None, date_to=None,
+                     step_days=7, horizon_days=60, thresholds=BACKTEST_THRESHOLDS):
+        """Score churn weight sets against the churn observed in history.
+
+        Args:
+            weight_sets: dict of name -> {factor: points}; the current
+                weights are always included as 'current'
+            date_from: first snapshot day (default: first visit)
+            date_to: last snapshot day (default: horizon_days ago, so every
+                snapshot has a fully observed outcome window)
+            step_days: days between snapshots
+            horizon_days: churn within this many days after a snapshot
+                counts as a positive
+            thresholds: risk scores evaluated as "flagged" cut-offs
+
+        Returns:
+            dict with the snapshot counts, timings and one result per
+            weight set (AUC, precision/recall/F1 per threshold), best first
+        """
+        started = time.perf_counter()
+        weight_sets = dict(weight_sets or {})
+        weight_sets.setdefault('current', CURRENT_CHURN_WEIGHTS)
+
+        if not date_from:
+            self.env.cr.execute(SQL("SELECT MIN(visit_date) FROM wfm_visit"))
+            date_from = self.env.cr.fetchone()[0]
+        date_to = date_to or fields.Date.today() - timedelta(days=horizon_days)
+        if not date_from or date_from > date_to:
+            return {'snapshots': 0, 'positives': 0, 'results': []}
+
+        labels, features = self._reconstruct_features(date_from, date_to, step_days, horizon_days)
+        reconstructed = time.perf_counter()
+
+        results = []
+        for name, weights in weight_sets.items():
+            result = self._score_weight_set(weights, labels, features, thresholds)
+            result['name'] = name
+            results.append(result)
+        results.sort(key=lambda r: r['auc'] if r['auc'] is not None else -1, reverse=True)
+        scored = time.perf_counter()
+
+        _logger.info(
+            f"Churn backtest: {len(labels)} snapshots, {sum(labels)} churned, "
+            f"{len(weight_sets)} weight sets in {scored - started:.2f}s"
+        )
+        return {
+            'date_from': fields.Date.to_string(date_from),
+            'date_to': fields.Date.to_string(date_to),
+            'snapshots': len(labels),
+            'positives': sum(labels),
+            'reconstruct_seconds': round(reconstructed - started, 3),
+            'scoring_seconds': round(scored - reconstructed, 3),
+            'results': results,
+        }
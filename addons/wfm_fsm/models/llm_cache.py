@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import re
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.models import Constraint
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Defaults, overridable with the wfm_fsm.llm_cache_ttl_hours and
+# wfm_fsm.llm_cache_max_entries system parameters
+LLM_CACHE_TTL_HOURS = 24
+LLM_CACHE_MAX_ENTRIES = 5000
+
+# Inserts only trigger an eviction once the cache outgrows its maximum by
+# this fraction; the daily autovacuum trims it back to the maximum anyway
+LLM_CACHE_EVICT_SLACK = 0.1
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class WfmLlmCache(models.Model):
+    """Persistent cache of LLM completions, addressed by their content.
+
+    The key is a SHA-256 of the model name, the temperature and the
+    whitespace-normalized messages: asking the same question about an
+    unchanged partner or visit returns the stored answer instead of calling
+    the LLM again. Entries expire after a TTL and the least recently used
+    ones are evicted beyond a maximum number of entries, by the daily
+    autovacuum or when inserts overflow the maximum by a margin.
+    """
+
+    _name = 'wfm.llm.cache'
+    _description = 'LLM Response Cache'
+    _rec_name = 'key'
+    _order = 'last_used_at desc'
+    _log_access = False
+
+    key = fields.Char(
+        string='Key',
+        required=True,
+        readonly=True,
+        help='SHA-256 of model, temperature and normalized messages'
+    )
+    llm_model = fields.Char(string='Model', readonly=True)
+    temperature = fields.Float(string='Temperature', readonly=True)
+    purpose = fields.Char(
+        string='Purpose',
+        readonly=True,
+        help='Calling feature, for statistics'
+    )
+    response = fields.Text(string='Response', readonly=True)
+    hit_count = fields.Integer(
+        string='Hits',
+        readonly=True,
+        help='Requests answered from this entry'
+    )
+    miss_count = fields.Integer(
+        string='Misses',
+        readonly=True,
+        help='Requests for this key that had to call the LLM'
+    )
+    last_used_at = fields.Datetime(string='Last Used', readonly=True, index=True)
+    expires_at = fields.Datetime(string='Expires At', readonly=True, index=True)
+
+    _key_unique = Constraint(
+        'UNIQUE(key)',
+        'An LLM cache entry already exists for this key.'
+    )
+
+    @api.model
+    def _make_key(self, llm_model, messages, temperature):
+        """Content hash of a chat completion request."""
+        normalized = [
+            (message['role'], _WHITESPACE.sub(' ', message['content'] or '').strip())
+            for message in messages
+        ]
+        payload = json.dumps([llm_model, round(float(temperature), 3), normalized], ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @api.model
+    def _lookup(self, key):
+        """Return the live cached response for key, counting the hit, or None."""
+        now = fields.Datetime.now()
+        self.env.cr.execute(SQL(
+            """
+            UPDATE wfm_llm_cache
+               SET hit_count = hit_count + 1,
+                   last_used_at = %(now)s
+             WHERE key = %(key)s
+               AND expires_at > %(now)s
+         RETURNING response
+            """,
+            key=key, now=now,
+        ))
+        row = self.env.cr.fetchone()
+        if row is None:
+            return None
+        self.invalidate_model(['hit_count', 'last_used_at'])
+        return row[0]
+
+    @api.model
+    def _store(self, key, llm_model, temperature, response, purpose=None):
+        """Insert or refresh the response for key, evicting if the cache overflows."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        ttl_hours = int(ICP.get_param('wfm_fsm.llm_cache_ttl_hours', LLM_CACHE_TTL_HOURS))
+        now = fields.Datetime.now()
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO wfm_llm_cache AS cache
+                   (key, llm_model, temperature, purpose, response,
+                    hit_count, miss_count, last_used_at, expires_at)
+            VALUES (%(key)s, %(llm_model)s, %(temperature)s, %(purpose)s, %(response)s,
+                    0, 1, %(now)s, %(expires_at)s)
+            ON CONFLICT (key) DO UPDATE
+               SET response = EXCLUDED.response,
+                   miss_count = cache.miss_count + 1,
+                   last_used_at = EXCLUDED.last_used_at,
+                   expires_at = EXCLUDED.expires_at
+            """,
+            key=key, llm_model=llm_model, temperature=temperature, purpose=purpose,
+            response=response, now=now, expires_at=now + timedelta(hours=ttl_hours),
+        ))
+        self.invalidate_model()
+
+        max_entries = self._get_max_entries()
+        self.env.cr.execute(SQL("SELECT COUNT(*) FROM wfm_llm_cache"))
+        if self.env.cr.fetchone()[0] > max_entries * (1 + LLM_CACHE_EVICT_SLACK):
+            self._evict()
+
+    @api.model
+    def _get_max_entries(self):
+        """Maximum number of cache entries (wfm_fsm.llm_cache_max_entries)."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        return int(ICP.get_param('wfm_fsm.llm_cache_max_entries', LLM_CACHE_MAX_ENTRIES))
+
+    @api.model
+    def _get_completion(self, llm_model, messages, temperature, request, purpose=None, bypass=False):
+        """Answer a chat completion from the cache, or call the LLM and store it.
+
+        Args:
+            llm_model, messages, temperature: the request, used for the key
+            request: callable performing the LLM call, returning the text
+            purpose: calling feature, for statistics
+            bypass: skip the lookup (the fresh answer still refreshes the
+                entry); also enabled by the llm_cache_bypass context key
+
+        Returns:
+            response text
+        """
+        key = self._make_key(llm_model, messages, temperature)
+        if not (bypass or self.env.context.get('llm_cache_bypass')):
+            cached = self._lookup(key)
+            if cached is not None:
+                _logger.info(f"LLM cache hit ({purpose or llm_model})")
+                return cached
+        response = request()
+        self._store(key, llm_model, temperature, response, purpose=purpose)
+        return response
+
+    @api.model
+    def _evict(self):
+        """Delete expired entries and the least recently used beyond the size bound.
+
+        Returns:
+            number of deleted entries
+        """
+        max_entries = self._get_max_entries()
+        self.env.cr.execute(SQL(
+            """
+            DELETE FROM wfm_llm_cache
+             WHERE expires_at <= %s
+                OR id IN (SELECT id FROM wfm_llm_cache
+                           ORDER BY last_used_at DESC, id DESC
+                          OFFSET %s)
+            """,
+            fields.Datetime.now(), max_entries,
+        ))
+        deleted = self.env.cr.rowcount
+        if deleted:
+            self.invalidate_model()
+        return deleted
+
+    @api.autovacuum
+    def _gc_llm_cache(self):
+        """Delete expired and overflowing cache entries (daily autovacuum)."""
+        deleted = self._evict()
+        _logger.info(f"Removed {deleted} LLM cache entries")
+
+    @api.model
+    def get_stats(self):
+        """Hit rate of the cached LLM calls, overall and per purpose.
+
+        Counters live on the entries, so they cover the requests answered
+        by entries still in the cache.
+        """
+        self.env.cr.execute(SQL(
+            """
+            SELECT COALESCE(purpose, ''),
+                   COUNT(*),
+                   COUNT(*) FILTER (WHERE expires_at > %s),
+                   COALESCE(SUM(hit_count), 0),
+                   COALESCE(SUM(miss_count), 0)
+              FROM wfm_llm_cache
+             GROUP BY 1
+            """,
+            fields.Datetime.now(),
+        ))
+
+        def summary(entries, live, hits, misses):
+            requests = hits + misses
+            return {
+                'entries': entries,
+                'live_entries': live,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / requests, 4) if requests else 0.0,
+            }
+
+        by_purpose = {}
+        totals = [0, 0, 0, 0]
+        for purpose, *counts in self.env.cr.fetchall():
+            by_purpose[purpose or 'other'] = summary(*counts)
+            totals = [total + count for total, count in zip(totals, counts)]
+        return dict(summary(*totals), by_purpose=by_purpose)
@@ -0,0 +1,98 @@
+"""Structured JSON output for LLM calls.
+
+request_json asks the model for a JSON object (OpenAI response_format
+json_object, passed through by LiteLLM), parses the reply tolerantly and,
+only when it is still unusable, makes one short repair call that resends
+the broken output instead of the whole prompt. Callers keep their
+rule-based fallback for the LLMOutputError raised when that fails too.
+"""
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+
+# Models whose endpoint rejected response_format; asked in plain mode after
+_PLAIN_MODE_MODELS = set()
+
+
+class LLMOutputError(ValueError):
+    """The LLM reply does not contain the expected JSON object."""
+
+    def __init__(self, message, raw=''):
+        super().__init__(message)
+        self.raw = raw
+
+
+def parse_json_object(text, required_keys=()):
+    """Return the first JSON object of text holding all required_keys.
+
+    Markdown fences and prose around the object are skipped: decoding
+    starts at each '{' in turn and stops at the end of the object.
+
+    Raises:
+        LLMOutputError: no such object in text
+    """
+    text = text or ''
+    start = text.find('{')
+    while start != -1:
+        try:
+            value, _end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            value = None
+        if isinstance(value, dict) and all(key in value for key in required_keys):
+            return value
+        start = text.find('{', start + 1)
+    raise LLMOutputError(
+        f"No JSON object with keys {', '.join(required_keys) or '(any)'} in LLM response", text
+    )
+
+
+def _complete(client, model, messages, temperature, max_tokens):
+    """One chat completion in JSON mode when the endpoint supports it."""
+    kwargs = dict(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+    if model not in _PLAIN_MODE_MODELS:
+        try:
+            response = client.chat.completions.create(response_format={'type': 'json_object'}, **kwargs)
+            return response.choices[0].message.content
+        except Exception as e:
+            # Only a rejected parameter is worth a second call
+            if getattr(e, 'status_code', None) != 400:
+                raise
+            _logger.info(f"JSON mode not supported for {model}, using plain completions: {e}")
+            _PLAIN_MODE_MODELS.add(model)
+    response = client.chat.completions.create(**kwargs)
+    return response.choices[0].message.content
+
+
+def request_json(client, model, messages, temperature, max_tokens, required_keys=()):
+    """Chat completion parsed as a JSON object, with one repair attempt.
+
+    Returns:
+        dict parsed from the reply
+
+    Raises:
+        LLMOutputError: the reply and its repair are both unusable
+    """
+    raw = _complete(client, model, messages, temperature, max_tokens)
+    try:
+        return parse_json_object(raw, required_keys)
+    except LLMOutputError as e:
+        _logger.warning(f"Unusable LLM JSON, attempting repair: {e}")
+
+    repair_messages = [
+        {
+            "role": "system",
+            "content": "You repair malformed JSON. Reply with the corrected JSON object only, keeping its content.",
+        },
+        {
+            "role": "user",
+            "content": f"Required keys: {', '.join(required_keys) or 'keep the existing keys'}\n\n{raw}",
+        },
+    ]
+    repaired = _complete(client, model, repair_messages, 0, max_tokens)
+    try:
+        return parse_json_object(repaired, required_keys)
+    except LLMOutputError as e:
+        raise LLMOutputError(str(e), raw) from None
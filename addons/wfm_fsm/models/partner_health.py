@@ -1,7 +1,80 @@
+import logging
+
+from markupsafe import Markup
+
 from odoo import models, fields, api
 from odoo.models import Constraint
 from datetime import timedelta
 
+_logger = logging.getLogger(__name__)
+
+# Groups whose members receive churn alerts, first non-empty group wins
+ALERT_COORDINATOR_GROUPS = ('wfm_portal.group_wfm_coordinator', 'wfm_core.group_wfm_admin')
+# Partners listed per risk level in a coordinator digest
+ALERT_DIGEST_MAX_LINES = 20
+
+# AI advisor: risk factor -> component score field
+AI_ADVISOR_FACTORS = {
+    'decline': 'decline_rate_score',
+    'volume': 'volume_change_score',
+    'inactivity': 'inactivity_score',
+    'payment': 'payment_issue_score',
+    'feedback': 'feedback_score',
+}
+
+# Fields the advisor reads; reasons are formatted with their values
+AI_ADVISOR_FIELDS = (
+    *AI_ADVISOR_FACTORS.values(),
+    'visits_declined_30d', 'days_since_last_visit', 'payment_complaints', 'negative_feedback_count',
+)
+
+# Dominant factor rules, first match wins:
+# (factor, minimum score, extra condition on the values, action, reason)
+AI_ADVISOR_RULES = (
+    ('decline', 15, None, 'workload',
+     "Partner declined {visits_declined_30d} visits recently. "
+     "They may be overwhelmed. Review and adjust their workload to better fit their availability."),
+    ('inactivity', 15, lambda values: values['days_since_last_visit'] > 30, 'meeting',
+     "Partner inactive for {days_since_last_visit} days. "
+     "An in-person meeting shows commitment and helps rebuild the relationship."),
+    ('inactivity', 15, None, 'call',
+     "Early disengagement signs detected. A quick call can help understand issues before they escalate."),
+    ('payment', 10, None, 'bonus',
+     "Partner has {payment_complaints} payment-related complaints. "
+     "Consider discussing compensation, offering a bonus, or reviewing payment terms."),
+    ('volume', 15, None, 'call',
+     "Visit volume dropped significantly. Call to understand if there are issues with assignments or personal circumstances."),
+    ('feedback', 5, None, 'meeting',
+     "Partner received {negative_feedback_count} negative feedback. Meet to discuss concerns and create improvement plan."),
+)
+
+# Fallback by risk level when no factor rule matches
+AI_ADVISOR_RISK_LEVEL_RULES = {
+    'critical': ('call', "CRITICAL risk level! Call the partner TODAY to understand their situation and prevent churn. Be prepared to offer solutions."),
+    'high': ('whatsapp', "High risk level. Send a WhatsApp message - it's quick, personal, and opens the door for conversation."),
+    'medium': ('email', "Medium risk. Send a friendly check-in email to maintain the relationship and show you value their partnership."),
+}
+AI_ADVISOR_DEFAULT = ('email', "Low risk - maintain relationship with periodic check-ins. A brief email keeps communication open.")
+
+# Intervention partner response -> legacy outcome
+PARTNER_RESPONSE_OUTCOME = {
+    'positive': 'positive',
+    'neutral': 'neutral',
+    'negative': 'negative',
+    'no_answer': 'pending',
+    'callback': 'pending',
+}
+
+# Intervention suggestion key -> label
+INTERVENTION_SUGGESTION_LABELS = {
+    'call': '📞 Phone Call',
+    'meeting': '🤝 Meeting',
+    'email': '📧 Email',
+    'bonus': '💰 Bonus/Incentive',
+    'training': '📚 Training Offer',
+    'workload': '📊 Workload Adjustment',
+}
+
 
 class WfmPartnerHealth(models.Model):
     """
@@ -200,7 +273,14 @@ class WfmPartnerHealth(models.Model):
     )
     last_intervention_date = fields.Date(
         string='Last Action',
-        compute='_compute_last_intervention'
+        compute='_compute_last_intervention',
+        store=True
+    )
+    last_intervention_type = fields.Selection(
+        selection=lambda self: self.env['wfm.partner.intervention']._fields['intervention_type'].selection,
+        string='Last Action Type',
+        compute='_compute_last_intervention',
+        store=True
     )
 
     # Related fields for quick actions
@@ -236,104 +316,6 @@ class WfmPartnerHealth(models.Model):
             else:
                 record.partner_mobile = False
 
-    @api.depends('decline_rate_score', 'volume_change_score', 'inactivity_score',
-                 'payment_issue_score', 'feedback_score', 'risk_level')
-    def _compute_ai_suggestion(self):
-        """
-        AI Advisor: Analyze risk factors and suggest the best action.
-        This is a rule-based recommendation engine that looks at the
-        dominant risk factor to suggest the most appropriate intervention.
-        """
-        for record in self:
-            # Default suggestion
-            action = 'call'
-            reason = "Start with a phone call to understand the partner's concerns."
-
-            # Find the dominant risk factor
-            scores = {
-                'decline': record.decline_rate_score or 0,
-                'volume': record.volume_change_score or 0,
-                'inactivity': record.inactivity_score or 0,
-                'payment': record.payment_issue_score or 0,
-                'feedback': record.feedback_score or 0,
-            }
-
-            dominant_factor = max(scores, key=scores.get) if any(scores.values()) else None
-
-            # Generate suggestion based on dominant risk factor
-            if dominant_factor == 'decline' and scores['decline'] >= 15:
-                action = 'workload'
-                reason = (
-                    f"Partner declined {record.visits_declined_30d or 0} visits recently. "
-                    "They may be overwhelmed or have scheduling conflicts. "
-                    "Review and adjust their workload to better fit their availability."
-                )
-            elif dominant_factor == 'inactivity' and scores['inactivity'] >= 15:
-                if record.days_since_last_visit and record.days_since_last_visit > 30:
-                    action = 'meeting'
-                    reason = (
-                        f"Partner inactive for {record.days_since_last_visit} days. "
-                        "An in-person meeting shows commitment and helps rebuild the relationship. "
-                        "Personal touch works best for re-engagement."
-                    )
-                else:
-                    action = 'call'
-                    reason = (
-                        f"Partner showing early signs of disengagement. "
-                        "A quick call to check in and understand any issues before they escalate."
-                    )
-            elif dominant_factor == 'payment' and scores['payment'] >= 10:
-                action = 'bonus'
-                reason = (
-                    f"Partner has {record.payment_complaints or 0} payment-related complaints. "
-                    "Consider discussing compensation, offering a bonus, or reviewing payment terms. "
-                    "Financial concerns are often a key driver of churn."
-                )
-            elif dominant_factor == 'volume' and scores['volume'] >= 15:
-                action = 'call'
-                reason = (
-                    "Visit volume dropped significantly compared to previous period. "
-                    "Call to understand if there are issues with client assignments, "
-                    "travel requirements, or personal circumstances."
-                )
-            elif dominant_factor == 'feedback' and scores['feedback'] >= 5:
-                action = 'meeting'
-                reason = (
-                    f"Partner received {record.negative_feedback_count or 0} negative feedback items. "
-                    "Meet to discuss concerns, provide support, and create improvement plan. "
-                    "Show you care about their success."
-                )
-            elif record.risk_level == 'critical':
-                action = 'call'
-                reason = (
-                    "CRITICAL risk level - immediate action required! "
-                    "Call the partner today to understand their situation and prevent churn. "
-                    "Be prepared to offer solutions."
-                )
-            elif record.risk_level == 'high':
-                action = 'whatsapp'
-                reason = (
-                    "High risk level. Send a WhatsApp message as a quick touchpoint. "
-                    "It's less intrusive than a call but more personal than email. "
-                    "Opens the door for further conversation."
-                )
-            elif record.risk_level == 'medium':
-                action = 'email'
-                reason = (
-                    "Medium risk - proactive outreach recommended. "
-                    "Send a friendly check-in email to maintain the relationship "
-                    "and show you value their partnership."
-                )
-            else:
-                action = 'email'
-                reason = (
-                    "Low risk - maintain relationship with periodic check-ins. "
-                    "A brief email keeps communication open without being intrusive."
-                )
-
-            record.ai_suggested_action = action
-            record.ai_suggestion_reason = reason
-
     _partner_date_unique = Constraint(
         'UNIQUE(partner_id, computed_date)',
         'Health record already exists for this partner and date.'
@@ -458,19 +440,34 @@ class WfmPartnerHealth(models.Model):
             else:
                 record.needs_intervention = False
 
+    @api.depends('intervention_ids.date', 'intervention_ids.intervention_type')
     def _compute_last_intervention(self):
-        """Get date of last intervention"""
+        """Date and type of the latest logged action, one query for all records"""
+        last_by_health = {}
+        health_ids = [rid for rid in self._origin.ids if rid]
+        if health_ids:
+            interventions = self.env['wfm.partner.intervention'].search_fetch(
+                [('health_id', 'in', health_ids)],
+                ['health_id', 'date', 'intervention_type'],
+                order='date desc, id desc',
+            )
+            for intervention in interventions:
+                last_by_health.setdefault(intervention.health_id.id, intervention)
         for record in self:
-            last = self.env['wfm.partner.intervention'].search([
-                ('health_id', '=', record.id)
-            ], order='date desc', limit=1)
-            record.last_intervention_date = last.date if last else False
+            last = last_by_health.get(record._origin.id)
+            record.last_intervention_date = last.date.date() if last else False
+            record.last_intervention_type = last.intervention_type if last else False
 
     @api.model
-    def compute_partner_health(self, partner_id):
+    def compute_partner_health(self, partner_id, previous_scores=None):
         """
         Compute health metrics for a specific partner.
         Called by cron job or manually.
+
+        The cron passes previous_scores (partner ID -> last recorded score,
+        see wfm.partner.health.history) for all partners at once and
+        records the new history points in one batch; a manual call looks up
+        and records its own point.
         """
         partner = self.env['res.partner'].browse(partner_id)
         if not partner.exists() or not partner.is_wfm_partner:
@@ -527,13 +524,12 @@ class WfmPartnerHealth(models.Model):
             if user.login_date:
                 days_since_last_login = (today - user.login_date.date()).days
 
-        # Get previous health record for trend
-        previous_health = self.search([
-            ('partner_id', '=', partner_id),
-            ('computed_date', '<', today),
-        ], order='computed_date desc', limit=1)
-
-        previous_risk_score = previous_health.churn_risk_score if previous_health else 0
+        # Previous score for trend
+        History = self.env['wfm.partner.health.history']
+        record_history = previous_scores is None
+        if record_history:
+            previous_scores = History._get_previous_scores([partner_id], today)
+        previous_risk_score = previous_scores.get(partner_id, 0)
 
         # Create or update health record
         existing = self.search([
@@ -557,9 +553,12 @@ class WfmPartnerHealth(models.Model):
 
         if existing:
             existing.write(values)
-            return existing
+            health = existing
         else:
-            return self.create(values)
+            health = self.create(values)
+        if record_history:
+            History._record_scores(health)
+        return health
 
     @api.model
     def _cron_compute_all_partner_health(self):
@@ -574,11 +573,15 @@ class WfmPartnerHealth(models.Model):
 
         critical_partners = []
         high_risk_partners = []
+        History = self.env['wfm.partner.health.history']
+        previous_scores = History._get_previous_scores(partners.ids, fields.Date.today())
+        computed_ids = []
 
         for partner in partners:
             try:
-                health = self.compute_partner_health(partner.id)
+                health = self.compute_partner_health(partner.id, previous_scores=previous_scores)
                 if health:
+                    computed_ids.append(health.id)
                     if health.risk_level == 'critical' and health.needs_intervention:
                         critical_partners.append(health)
                     elif health.risk_level == 'high' and health.needs_intervention:
@@ -588,71 +591,135 @@ class WfmPartnerHealth(models.Model):
                 self.env.cr.rollback()
                 continue
 
+        History._record_scores(self.browse(computed_ids).exists())
+
         # Send alerts for critical and high-risk partners
         if critical_partners or high_risk_partners:
             self._send_risk_alerts(critical_partners, high_risk_partners)
 
         return True
 
-    def _send_risk_alerts(self, critical_partners, high_risk_partners):
+    def _get_alert_coordinators(self):
+        """Internal users who receive churn alerts: coordinators, else WFM admins."""
+        for xmlid in ALERT_COORDINATOR_GROUPS:
+            group = self.env.ref(xmlid, raise_if_not_found=False)
+            users = group and group.user_ids.filtered(lambda u: u.active and not u.share)
+            if users:
+                return users.sorted('id')
+        return self.env['res.users']
+
+    def _route_risk_alerts(self, coordinators):
+        """Assign each health record to the coordinator who receives its alert.
+
+        Records keep their assigned coordinator when that user receives
+        alerts; the others are spread over the least loaded coordinators.
+
+        Returns:
+            dict of res.users record -> wfm.partner.health recordset
         """
-        Send notifications to coordinators about at-risk partners.
-        Creates activities for follow-up.
+        routed = {user: self.browse() for user in coordinators}
+        unassigned = self.browse()
+        for health in self:
+            if health.assigned_coordinator_id in routed:
+                routed[health.assigned_coordinator_id] |= health
+            else:
+                unassigned |= health
+        for health in unassigned:
+            user = min(routed, key=lambda u: (len(routed[u]), u.id))
+            routed[user] |= health
+        return {user: records for user, records in routed.items() if records}
+
+    def _send_risk_alerts(self, critical_partners, high_risk_partners):
         """
-        # Get coordinators (users with specific group or all internal users)
-        coordinators = self.env['res.users'].search([
-            ('share', '=', False),
-            ('active', '=', True),
-        ], limit=5)  # Limit to first 5 coordinators
+        Send one digest per coordinator about the run's at-risk partners.
 
-        if not coordinators:
+        Critical partners get a follow-up activity, created in one batch
+        without per-activity notifications, and a chatter note logged
+        without follower fan-out. Each coordinator then receives a single
+        digest email, queued for the mail scheduler instead of sent inline.
+        """
+        critical = self.browse([h.id for h in critical_partners])
+        high = self.browse([h.id for h in high_risk_partners])
+        coordinators = self._get_alert_coordinators()
+        if not coordinators or not (critical or high):
             return
 
-        # Build alert message
-        message_parts = []
-
-        if critical_partners:
-            message_parts.append(f"🔴 <b>CRITICAL RISK ({len(critical_partners)} partners):</b><br/>")
-            for health in critical_partners[:5]:  # Limit to 5
-                message_parts.append(
-                    f"• {health.partner_id.name} - Score: {health.churn_risk_score:.0f}/100<br/>"
-                )
+        routed = (critical | high)._route_risk_alerts(coordinators)
+        alerts = critical | high
+        alerts.fetch(['partner_id', 'churn_risk_score', 'risk_level'])
+
+        # Follow-up activities for critical partners. The cron creates a new
+        # health record per partner every day, so an open to-do on any health
+        # record of the partner counts as a duplicate.
+        todo = self.env.ref('mail.mail_activity_data_todo')
+        open_todos = self.env['mail.activity'].search_fetch([
+            ('res_model', '=', self._name),
+            ('res_id', 'in', self._search([('partner_id', 'in', critical.partner_id.ids)])),
+            ('activity_type_id', '=', todo.id),
+        ], ['res_id'])
+        followed_partner_ids = set(self.browse(set(open_todos.mapped('res_id'))).partner_id.ids)
+        res_model_id = self.env['ir.model']._get_id(self._name)
+        activity_vals = [{
+            'res_model_id': res_model_id,
+            'res_id': health.id,
+            'activity_type_id': todo.id,
+            'summary': f'🔴 Critical churn risk: {health.partner_id.name}',
+            'note': f"Risk score {health.churn_risk_score:.0f}/100. Immediate intervention recommended.",
+            'user_id': user.id,
+            'date_deadline': fields.Date.today(),
+        } for user, records in routed.items() for health in records & critical
+            if health.partner_id.id not in followed_partner_ids]
+        if activity_vals:
+            self.env['mail.activity'].with_context(mail_activity_quick_update=True).create(activity_vals)
+
+        if critical:
+            critical._message_log_batch({
+                health.id: Markup(
+                    "⚠️ <b>Churn Risk Alert</b><br/>Partner %s has reached CRITICAL risk level "
+                    "(Score: %.0f/100). Immediate intervention recommended."
+                ) % (health.partner_id.name, health.churn_risk_score)
+                for health in critical
+            })
 
-        if high_risk_partners:
-            message_parts.append(f"<br/>🟠 <b>HIGH RISK ({len(high_risk_partners)} partners):</b><br/>")
-            for health in high_risk_partners[:5]:  # Limit to 5
-                message_parts.append(
-                    f"• {health.partner_id.name} - Score: {health.churn_risk_score:.0f}/100<br/>"
-                )
+        # One queued digest email per coordinator
+        mail_vals = []
+        for user, records in routed.items():
+            if not user.partner_id.email:
+                continue
+            user_critical = records & critical
+            user_high = records & high
+            mail_vals.append({
+                'subject': f'Churn risk digest: {len(user_critical)} critical, {len(user_high)} high',
+                'body_html': self._render_risk_digest(user_critical, user_high),
+                'recipient_ids': [fields.Command.link(user.partner_id.id)],
+                'auto_delete': True,
+            })
+        if mail_vals:
+            self.env['mail.mail'].sudo().create(mail_vals)
 
-        message_parts.append(
-            "<br/><a href='/web#action=wfm_fsm.action_at_risk_partners'>View All At-Risk Partners →</a>"
+        _logger.info(
+            f"Churn alerts: {len(critical)} critical and {len(high)} high risk partners routed to "
+            f"{len(routed)} coordinators, {len(activity_vals)} activities, {len(mail_vals)} digests queued"
         )
 
-        message = ''.join(message_parts)
-
-        # Create activity for first coordinator
-        if critical_partners:
-            first_critical = critical_partners[0]
-            self.env['mail.activity'].create({
-                'res_model_id': self.env['ir.model']._get('wfm.partner.health').id,
-                'res_id': first_critical.id,
-                'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
-                'summary': f'🔴 {len(critical_partners)} Critical Risk Partners Need Intervention',
-                'note': message,
-                'user_id': coordinators[0].id,
-                'date_deadline': fields.Date.today(),
-            })
-
-        # Post message to first critical partner's chatter
-        for health in critical_partners[:3]:
-            health.message_post(
-                body=f"⚠️ <b>Churn Risk Alert</b><br/>"
-                     f"Partner {health.partner_id.name} has reached CRITICAL risk level "
-                     f"(Score: {health.churn_risk_score:.0f}/100). Immediate intervention recommended.",
-                message_type='notification',
-                subtype_xmlid='mail.mt_note',
-            )
+    def _render_risk_digest(self, critical, high):
+        """HTML body of a coordinator's churn risk digest."""
+        message_parts = []
+        for label, records in (('🔴 <b>CRITICAL RISK', critical), ('🟠 <b>HIGH RISK', high)):
+            if not records:
+                continue
+            message_parts.append(Markup(f"{label} ({len(records)} partners):</b><br/>"))
+            for health in records.sorted('churn_risk_score', reverse=True)[:ALERT_DIGEST_MAX_LINES]:
+                message_parts.append(
+                    Markup("• %s - Score: %.0f/100<br/>") % (health.partner_id.name, health.churn_risk_score)
+                )
+            if len(records) > ALERT_DIGEST_MAX_LINES:
+                message_parts.append(Markup(f"• … and {len(records) - ALERT_DIGEST_MAX_LINES} more<br/>"))
+            message_parts.append(Markup("<br/>"))
+        message_parts.append(Markup(
+            "<a href='/web#action=wfm_fsm.action_at_risk_partners'>View All At-Risk Partners →</a>"
+        ))
+        return Markup('').join(message_parts)
 
     def action_view_partner(self):
         """Open the partner form view"""
@@ -1008,52 +1075,37 @@ Please discuss:
             'context': {'search_default_upcoming': 1},
         }
 
+    def _get_ai_suggestions(self):
+        """
+        Evaluate the advisor rules for every record in one pass.
+        Returns dict: record ID -> (suggested_action_key, reason_text)
+        """
+        suggestions = {}
+        for record in self:
+            values = {fname: record[fname] or 0 for fname in AI_ADVISOR_FIELDS}
+            scores = {factor: values[fname] for factor, fname in AI_ADVISOR_FACTORS.items()}
+            dominant_factor = max(scores, key=scores.get) if any(scores.values()) else None
+
+            for factor, min_score, condition, action, reason in AI_ADVISOR_RULES:
+                if factor == dominant_factor and scores[factor] >= min_score and (
+                    condition is None or condition(values)
+                ):
+                    suggestion = action, reason
+                    break
+            else:
+                suggestion = AI_ADVISOR_RISK_LEVEL_RULES.get(record.risk_level, AI_ADVISOR_DEFAULT)
+
+            action, reason = suggestion
+            suggestions[record.id] = (action, reason.format(**values))
+        return suggestions
+
     def _get_ai_suggestion(self):
         """
         Compute AI suggestion based on risk factors.
         Returns tuple: (suggested_action_key, reason_text)
         """
-        # Analyze risk factors
-        scores = {
-            'decline': self.decline_rate_score or 0,
-            'volume': self.volume_change_score or 0,
-            'inactivity': self.inactivity_score or 0,
-            'payment': self.payment_issue_score or 0,
-            'feedback': self.feedback_score or 0,
-        }
-
-        dominant_factor = max(scores, key=scores.get) if any(scores.values()) else None
-
-        if dominant_factor == 'decline' and scores['decline'] >= 15:
-            return 'workload', (
-                f"Partner declined {self.visits_declined_30d or 0} visits recently. "
-                "They may be overwhelmed. Review and adjust their workload to better fit their availability."
-            )
-        elif dominant_factor == 'inactivity' and scores['inactivity'] >= 15:
-            if self.days_since_last_visit and self.days_since_last_visit > 30:
-                return 'meeting', (
-                    f"Partner inactive for {self.days_since_last_visit} days. "
-                    "An in-person meeting shows commitment and helps rebuild the relationship."
-                )
-            else:
-                return 'call', "Early disengagement signs detected. A quick call can help understand issues before they escalate."
-        elif dominant_factor == 'payment' and scores['payment'] >= 10:
-            return 'bonus', (
-                f"Partner has {self.payment_complaints or 0} payment-related complaints. "
-                "Consider discussing compensation, offering a bonus, or reviewing payment terms."
-            )
-        elif dominant_factor == 'volume' and scores['volume'] >= 15:
-            return 'call', "Visit volume dropped significantly. Call to understand if there are issues with assignments or personal circumstances."
-        elif dominant_factor == 'feedback' and scores['feedback'] >= 5:
-            return 'meeting', f"Partner received {self.negative_feedback_count or 0} negative feedback. Meet to discuss concerns and create improvement plan."
-        elif self.risk_level == 'critical':
-            return 'call', "CRITICAL risk level! Call the partner TODAY to understand their situation and prevent churn. Be prepared to offer solutions."
-        elif self.risk_level == 'high':
-            return 'whatsapp', "High risk level. Send a WhatsApp message - it's quick, personal, and opens the door for conversation."
-        elif self.risk_level == 'medium':
-            return 'email', "Medium risk. Send a friendly check-in email to maintain the relationship and show you value their partnership."
-        else:
-            return 'email', "Low risk - maintain relationship with periodic check-ins. A brief email keeps communication open."
+        self.ensure_one()
+        return self._get_ai_suggestions()[self.id]
 
     def action_show_ai_advice(self):
         """
@@ -1063,15 +1115,7 @@ Please discuss:
         self.ensure_one()
 
         suggested, reason = self._get_ai_suggestion()
-
-        action_labels = {
-            'call': '📞 Phone Call',
-            'whatsapp': '💬 WhatsApp',
-            'email': '📧 Email',
-            'meeting': '🤝 In-Person Meeting',
-            'bonus': '💰 Bonus/Incentive',
-            'workload': '📊 Workload Adjustment',
-        }
+        action_labels = dict(self._fields['planned_action'].selection)
 
         # Set the planned action and AI advice text
         self.write({
@@ -1092,13 +1136,7 @@ Please discuss:
             result = engine.analyze_partner_and_generate_outreach(self.id)
 
             if result.get('success'):
-                self.write({
-                    'ai_analysis': result.get('analysis', ''),
-                    'ai_whatsapp_message': result.get('whatsapp_message', ''),
-                    'ai_recommended_action': result.get('recommended_action', ''),
-                    'ai_urgency': result.get('urgency', 'monitor'),
-                    'ai_generated_date': fields.Datetime.now(),
-                })
+                self.write(self._prepare_ai_strategy_values(result))
 
                 return {
                     'type': 'ir.actions.client',
@@ -1220,39 +1258,24 @@ class WfmPartnerIntervention(models.Model):
     @api.depends('health_id')
     def _compute_risk_level_at_intervention(self):
         """Auto-set risk level from health record"""
+        self.health_id.fetch(['risk_level'])
         for record in self:
-            if record.health_id and not record.risk_level_at_intervention:
-                record.risk_level_at_intervention = record.health_id.risk_level
-            elif not record.risk_level_at_intervention:
-                record.risk_level_at_intervention = False
+            if not record.risk_level_at_intervention:
+                record.risk_level_at_intervention = record.health_id.risk_level or False
 
     @api.depends('partner_response')
     def _compute_outcome(self):
         """Map partner response to legacy outcome field"""
-        response_to_outcome = {
-            'positive': 'positive',
-            'neutral': 'neutral',
-            'negative': 'negative',
-            'no_answer': 'pending',
-            'callback': 'pending',
-        }
         for record in self:
-            if record.partner_response:
-                record.outcome = response_to_outcome.get(record.partner_response, 'pending')
-            else:
-                record.outcome = 'pending'
+            record.outcome = PARTNER_RESPONSE_OUTCOME.get(record.partner_response, 'pending')
 
     @api.depends('health_id')
     def _compute_suggestions(self):
         """AI-powered intervention suggestions based on risk factors"""
-        suggestions_map = {
-            'call': '📞 Phone Call',
-            'meeting': '🤝 Meeting',
-            'email': '📧 Email',
-            'bonus': '💰 Bonus/Incentive',
-            'training': '📚 Training Offer',
-            'workload': '📊 Workload Adjustment',
-        }
+        self.health_id.fetch([
+            'decline_rate_score', 'inactivity_score', 'payment_issue_score', 'volume_change_score',
+            'risk_level', 'visits_declined_30d', 'days_since_last_visit',
+        ])
 
         for record in self:
             suggested_key = 'call'
@@ -1299,16 +1322,16 @@ class WfmPartnerIntervention(models.Model):
                         "and gather feedback on their experience."
                     )
 
-            record.suggested_action = suggestions_map.get(suggested_key, '📞 Phone Call')
+            record.suggested_action = INTERVENTION_SUGGESTION_LABELS.get(suggested_key, '📞 Phone Call')
             record.suggestion_reason = reason
 
     @api.model_create_multi
     def create(self, vals_list):
-        """Update ticket to in_progress when first action is logged"""
+        """Update tickets to in_progress when their first action is logged"""
         records = super().create(vals_list)
-        for record in records:
-            if record.health_id and record.health_id.ticket_state == 'open':
-                record.health_id.write({'ticket_state': 'in_progress'})
+        open_tickets = records.health_id.filtered(lambda health: health.ticket_state == 'open')
+        if open_tickets:
+            open_tickets.write({'ticket_state': 'in_progress'})
         return records
 
     def action_view_ticket(self):
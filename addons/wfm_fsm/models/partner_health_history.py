@@ -0,0 +1,207 @@
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.models import Constraint, Index
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Daily points are kept this long, older ones are folded into months
+HISTORY_DAILY_DAYS = 90
+
+
+class WfmPartnerHealthHistory(models.Model):
+    """Compact churn risk score history of partners.
+
+    One row per partner and day for the last HISTORY_DAILY_DAYS days; older
+    days are folded into one row per partner and month by the daily
+    autovacuum, so the history stays small while wfm.partner.health keeps
+    growing by one row per partner per day. Backs the risk trend of the
+    health cron and the score series served to sparklines.
+    """
+
+    _name = 'wfm.partner.health.history'
+    _description = 'Partner Health Score History'
+    _order = 'partner_id, period_start'
+    _rec_name = 'partner_id'
+    _log_access = False
+
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Partner',
+        required=True,
+        ondelete='cascade'
+    )
+    period_start = fields.Date(string='Period Start', required=True)
+    granularity = fields.Selection([
+        ('day', 'Day'),
+        ('month', 'Month'),
+    ], string='Granularity', required=True, default='day')
+    churn_risk_score = fields.Float(
+        string='Risk Score',
+        aggregator='avg',
+        help='Average risk score over the period'
+    )
+    max_risk_score = fields.Float(string='Highest Risk Score')
+    sample_count = fields.Integer(
+        string='Samples',
+        default=1,
+        help='Daily scores folded into this row'
+    )
+
+    _partner_period_unique = Constraint(
+        'UNIQUE(partner_id, granularity, period_start)',
+        'A history point already exists for this partner and period.'
+    )
+    _partner_period_idx = Index('(partner_id, period_start)')
+
+    @api.model
+    def _record_scores(self, health_records):
+        """Upsert the daily history point of the given health records."""
+        if not health_records:
+            return
+        health_records.flush_recordset(['partner_id', 'computed_date', 'churn_risk_score'])
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO wfm_partner_health_history AS hist
+                   (partner_id, period_start, granularity, churn_risk_score, max_risk_score, sample_count)
+            SELECT partner_id, computed_date, 'day', churn_risk_score, churn_risk_score, 1
+              FROM wfm_partner_health
+             WHERE id = ANY(%s)
+            ON CONFLICT (partner_id, granularity, period_start) DO UPDATE
+               SET churn_risk_score = EXCLUDED.churn_risk_score,
+                   max_risk_score = EXCLUDED.max_risk_score
+            """,
+            health_records.ids,
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def _get_previous_scores(self, partner_ids, before):
+        """Latest recorded risk score of each partner before a date.
+
+        Returns:
+            dict of partner ID -> score; partners without history are absent
+        """
+        if not partner_ids:
+            return {}
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            SELECT DISTINCT ON (partner_id) partner_id, churn_risk_score
+              FROM wfm_partner_health_history
+             WHERE partner_id = ANY(%s)
+               AND period_start < %s
+             ORDER BY partner_id, period_start DESC
+            """,
+            list(partner_ids), before,
+        ))
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def get_score_series(self, partner_ids, date_from=None, date_to=None):
+        """Risk score series of many partners, with period-over-period deltas.
+
+        Args:
+            partner_ids: partners to return
+            date_from: first period to include (default: HISTORY_DAILY_DAYS ago)
+            date_to: last period to include (default: today)
+
+        Returns:
+            dict of partner ID -> {
+                'points': [{'date', 'granularity', 'score', 'delta'}, ...],
+                'latest': last score,
+                'change': last score minus first score of the range,
+            }
+        """
+        if not partner_ids:
+            return {}
+        today = fields.Date.context_today(self)
+        date_from = date_from or today - timedelta(days=HISTORY_DAILY_DAYS)
+        date_to = date_to or today
+
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            SELECT partner_id, period_start, granularity, churn_risk_score,
+                   churn_risk_score - LAG(churn_risk_score) OVER (
+                       PARTITION BY partner_id ORDER BY period_start
+                   )
+              FROM wfm_partner_health_history
+             WHERE partner_id = ANY(%s)
+               AND period_start BETWEEN %s AND %s
+             ORDER BY partner_id, period_start
+            """,
+            list(partner_ids), date_from, date_to,
+        ))
+
+        series = {}
+        for partner_id, period_start, granularity, score, delta in self.env.cr.fetchall():
+            points = series.setdefault(partner_id, {'points': []})['points']
+            points.append({
+                'date': fields.Date.to_string(period_start),
+                'granularity': granularity,
+                'score': round(score, 1),
+                'delta': round(delta, 1) if delta is not None else None,
+            })
+        for data in series.values():
+            points = data['points']
+            data['latest'] = points[-1]['score']
+            data['change'] = round(points[-1]['score'] - points[0]['score'], 1)
+        return series
+
+    @api.model
+    def _downsample(self, cutoff=None):
+        """Fold daily points of whole months before the cutoff into monthly points.
+
+        Monthly rows keep the sample-weighted average, the maximum and the
+        number of folded days, so folding is repeatable.
+
+        Returns:
+            number of monthly points written
+        """
+        if cutoff is None:
+            cutoff = fields.Date.today() - timedelta(days=HISTORY_DAILY_DAYS)
+        # Only whole months, so daily and monthly points never overlap
+        cutoff = cutoff.replace(day=1)
+
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            WITH folded AS (
+                DELETE FROM wfm_partner_health_history
+                 WHERE granularity = 'day'
+                   AND period_start < %(cutoff)s
+             RETURNING partner_id, period_start, churn_risk_score, max_risk_score, sample_count
+            ), monthly AS (
+                SELECT partner_id,
+                       date_trunc('month', period_start)::date AS month,
+                       SUM(churn_risk_score * sample_count) / SUM(sample_count) AS score,
+                       MAX(max_risk_score) AS max_score,
+                       SUM(sample_count) AS samples
+                  FROM folded
+                 GROUP BY partner_id, date_trunc('month', period_start)
+            )
+            INSERT INTO wfm_partner_health_history AS hist
+                   (partner_id, period_start, granularity, churn_risk_score, max_risk_score, sample_count)
+            SELECT partner_id, month, 'month', score, max_score, samples
+              FROM monthly
+            ON CONFLICT (partner_id, granularity, period_start) DO UPDATE
+               SET churn_risk_score = (hist.churn_risk_score * hist.sample_count
+                                       + EXCLUDED.churn_risk_score * EXCLUDED.sample_count)
+                                      / (hist.sample_count + EXCLUDED.sample_count),
+                   max_risk_score = GREATEST(hist.max_risk_score, EXCLUDED.max_risk_score),
+                   sample_count = hist.sample_count + EXCLUDED.sample_count
+            """,
+            cutoff=cutoff,
+        ))
+        written = self.env.cr.rowcount
+        self.invalidate_model()
+        return written
+
+    @api.autovacuum
+    def _gc_downsample_history(self):
+        """Fold old daily score points into monthly ones (daily autovacuum)."""
+        written = self._downsample()
+        _logger.info(f"Folded partner health history into {written} monthly points")
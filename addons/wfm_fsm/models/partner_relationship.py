@@ -1,5 +1,27 @@
-from odoo import models, fields, api
+import logging
+from collections import defaultdict
+
+from odoo import models, fields, api, _
+from odoo.exceptions import AccessError
 from odoo.models import Constraint
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Relationship fields incremented in SQL by _record_completed_visits
+COMPLETION_COUNTER_FIELDS = [
+    'total_visits', 'completed_visits', 'first_visit_date', 'last_visit_date',
+    'installations_visited', 'installation_ids',
+]
+
+# Relationship columns recomputed from wfm.visit by _rebuild_relationships
+REBUILD_FIELDS = [
+    'total_visits', 'completed_visits', 'cancelled_visits',
+    'first_visit_date', 'last_visit_date', 'installations_visited',
+]
+
+# Corrected relationships listed in a rebuild report
+REBUILD_REPORT_SAMPLES = 20
 
 
 class WfmPartnerClientRelationship(models.Model):
@@ -87,6 +109,15 @@ class WfmPartnerClientRelationship(models.Model):
         default=0,
         help='Number of unique installations visited for this client'
     )
+    installation_ids = fields.Many2many(
+        'wfm.installation',
+        'wfm_relationship_installation_rel',
+        'relationship_id',
+        'installation_id',
+        string='Visited Installations',
+        readonly=True,
+        help='Distinct installations with a completed visit, kept in step with installations_visited'
+    )
 
     _partner_client_unique = Constraint(
         'UNIQUE(partner_id, client_id)',
@@ -97,6 +128,10 @@ class WfmPartnerClientRelationship(models.Model):
     def _compute_relationship_score(self):
         """Calculate relationship strength score (0-100).
 
+        The recency factor decays with time; the stored score is refreshed
+        daily in bulk by _cron_rescore_relationships, whose SQL
+        (_relationship_score_sql) must stay in line with this method.
+
         Scoring factors:
         - Visit count: More visits = stronger relationship (40%)
         - Completion rate: Higher completion = more reliable (20%)
@@ -161,26 +196,322 @@ class WfmPartnerClientRelationship(models.Model):
             is_completion: True if visit was just completed
         """
         self.ensure_one()
-        vals = {}
-
         if is_completion:
-            vals['completed_visits'] = self.completed_visits + 1
-            vals['total_visits'] = self.total_visits + 1
-            vals['last_visit_date'] = visit.visit_date
+            self._record_completed_visits(visit)
 
-            if not self.first_visit_date:
-                vals['first_visit_date'] = visit.visit_date
+    @api.model
+    def _record_completed_visits(self, visits):
+        """Add completed visits to their partner-client relationships.
 
-            # Track unique installations
-            visited_installations = self.env['wfm.visit'].search([
-                ('partner_id', '=', self.partner_id.id),
-                ('client_id', '=', self.client_id.id),
-                ('state', '=', 'done')
-            ]).mapped('installation_id')
-            vals['installations_visited'] = len(visited_installations)
+        Visits are grouped by (partner, client) and applied with atomic SQL
+        increments: one upsert for all relationships, one insert into the
+        visited-installation set and one counter update for the
+        installations new to that set. Concurrent completions therefore
+        never lose updates, whatever the number of visits.
+
+        Returns:
+            wfm.partner.client.relationship recordset that was updated
+        """
+        groups = defaultdict(lambda: {'count': 0, 'first': None, 'last': None, 'installations': set()})
+        for visit in visits:
+            if not (visit.partner_id and visit.client_id and visit.state == 'done'):
+                continue
+            group = groups[visit.partner_id.id, visit.client_id.id]
+            group['count'] += 1
+            if visit.visit_date:
+                group['first'] = min(filter(None, (group['first'], visit.visit_date)))
+                group['last'] = max(filter(None, (group['last'], visit.visit_date)))
+            if visit.installation_id:
+                group['installations'].add(visit.installation_id.id)
+        if not groups:
+            return self.browse()
+
+        self.flush_model()
+        cr = self.env.cr
+        now = fields.Datetime.now()
+        uid = self.env.uid
+
+        cr.execute(SQL(
+            """
+            INSERT INTO wfm_partner_client_relationship AS rel
+                   (partner_id, client_id, total_visits, completed_visits, cancelled_visits,
+                    avg_rating, on_time_rate, installations_visited,
+                    first_visit_date, last_visit_date,
+                    create_uid, create_date, write_uid, write_date)
+            VALUES %s
+            ON CONFLICT (partner_id, client_id) DO UPDATE
+               SET total_visits = rel.total_visits + EXCLUDED.total_visits,
+                   completed_visits = rel.completed_visits + EXCLUDED.completed_visits,
+                   first_visit_date = LEAST(rel.first_visit_date, EXCLUDED.first_visit_date),
+                   last_visit_date = GREATEST(rel.last_visit_date, EXCLUDED.last_visit_date),
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+            RETURNING id, partner_id, client_id
+            """,
+            SQL(", ").join(
+                SQL("(%s, %s, %s, %s, 0, 0.0, 100.0, 0, %s::date, %s::date, %s, %s, %s, %s)",
+                    partner_id, client_id, group['count'], group['count'],
+                    group['first'], group['last'], uid, now, uid, now)
+                for (partner_id, client_id), group in groups.items()
+            ),
+        ))
+        rel_ids = {(partner_id, client_id): rel_id for rel_id, partner_id, client_id in cr.fetchall()}
+
+        installation_rows = [
+            SQL("(%s, %s)", rel_ids[key], installation_id)
+            for key, group in groups.items()
+            for installation_id in group['installations']
+        ]
+        if installation_rows:
+            # Only installations new to the set come back, so the counter
+            # is incremented by exactly the number of newly visited ones.
+            cr.execute(SQL(
+                """
+                WITH added AS (
+                    INSERT INTO wfm_relationship_installation_rel (relationship_id, installation_id)
+                    VALUES %s
+                    ON CONFLICT DO NOTHING
+                    RETURNING relationship_id
+                )
+                UPDATE wfm_partner_client_relationship rel
+                   SET installations_visited = rel.installations_visited + added_count.n
+                  FROM (SELECT relationship_id, COUNT(*) AS n FROM added GROUP BY relationship_id) AS added_count
+                 WHERE rel.id = added_count.relationship_id
+                """,
+                SQL(", ").join(installation_rows),
+            ))
+
+        relationships = self.browse(list(rel_ids.values()))
+        relationships.invalidate_recordset(COMPLETION_COUNTER_FIELDS)
+        relationships.modified(COMPLETION_COUNTER_FIELDS)
+        return relationships
+
+    @api.model
+    def _relationship_score_sql(self, today, alias='rel'):
+        """SQL expression of _compute_relationship_score, to rescore in one statement."""
+        def column(name):
+            return SQL.identifier(alias, name)
+
+        return SQL(
+            """LEAST(
+                  LEAST(%(total)s / 20.0, 1.0) * 40
+                + CASE WHEN %(total)s > 0 THEN %(completed)s::float / %(total)s * 20 ELSE 0 END
+                + CASE WHEN %(rating)s > 0 THEN (%(rating)s - 1) / 4.0 * 20 ELSE 0 END
+                + CASE WHEN %(last)s IS NULL THEN 0
+                       WHEN %(today)s::date - %(last)s <= 30 THEN 20
+                       WHEN %(today)s::date - %(last)s <= 180
+                            THEN GREATEST(20 * (1 - (%(today)s::date - %(last)s - 30) / 150.0), 0)
+                       ELSE 0 END,
+                100)""",
+            total=column('total_visits'),
+            completed=column('completed_visits'),
+            rating=column('avg_rating'),
+            last=column('last_visit_date'),
+            today=today,
+        )
+
+    @api.model
+    def _rescore_relationships(self, today=None):
+        """Recompute relationship_score for all relationships in one UPDATE.
 
-        if vals:
-            self.write(vals)
+        Only rows whose score actually changes are written. The ORM cache of
+        the model is invalidated afterwards.
+
+        Returns:
+            number of relationships whose score changed
+        """
+        self.flush_model()
+        score = self._relationship_score_sql(today or fields.Date.context_today(self))
+        self.env.cr.execute(SQL(
+            """
+            UPDATE wfm_partner_client_relationship rel
+               SET relationship_score = %s
+             WHERE rel.relationship_score IS DISTINCT FROM %s
+            """,
+            score, score,
+        ))
+        rescored = self.env.cr.rowcount
+        self.invalidate_model(['relationship_score'])
+        return rescored
+
+    @api.model
+    def _cron_rescore_relationships(self):
+        """Cron: apply the daily recency decay to all stored relationship scores."""
+        rescored = self._rescore_relationships()
+        _logger.info(f"Relationship rescoring: {rescored} scores updated")
+        return rescored
+
+    @api.model
+    def _rebuild_relationships(self):
+        """Recompute every relationship from wfm.visit.
+
+        Counters, visit dates and the visited-installation set are derived
+        from active visits in one grouped pass, changed and missing rows
+        are upserted in one statement, and relationship_score is
+        recomputed for all rows in SQL. avg_rating and on_time_rate have
+        no source on wfm.visit and are kept as is.
+
+        Returns:
+            dict report: relationship count, created/corrected/rescored
+            counts, corrections per field and a sample of the diffs
+        """
+        Visit = self.env['wfm.visit']
+        Visit.flush_model(['partner_id', 'client_id', 'installation_id', 'state', 'visit_date', 'active'])
+        self.flush_model()
+        cr = self.env.cr
+
+        cr.execute(SQL(
+            """
+            SELECT partner_id, client_id,
+                   COUNT(*) FILTER (WHERE state = 'done'),
+                   COUNT(*) FILTER (WHERE state = 'done'),
+                   COUNT(*) FILTER (WHERE state = 'cancelled'),
+                   MIN(visit_date) FILTER (WHERE state = 'done'),
+                   MAX(visit_date) FILTER (WHERE state = 'done'),
+                   COUNT(DISTINCT installation_id) FILTER (WHERE state = 'done')
+              FROM wfm_visit
+             WHERE active
+               AND partner_id IS NOT NULL
+               AND client_id IS NOT NULL
+               AND state IN ('done', 'cancelled')
+             GROUP BY partner_id, client_id
+            """
+        ))
+        expected = {(partner_id, client_id): tuple(values) for partner_id, client_id, *values in cr.fetchall()}
+
+        cr.execute(SQL(
+            "SELECT partner_id, client_id, %s FROM wfm_partner_client_relationship",
+            SQL(", ").join(SQL.identifier(fname) for fname in REBUILD_FIELDS),
+        ))
+        current = {(partner_id, client_id): tuple(values) for partner_id, client_id, *values in cr.fetchall()}
+
+        empty = (0, 0, 0, None, None, 0)
+        field_corrections = dict.fromkeys(REBUILD_FIELDS, 0)
+        samples = []
+        upserts = []
+        created = 0
+        for key in current.keys() | expected.keys():
+            new = expected.get(key, empty)
+            old = current.get(key)
+            if old is None:
+                # Relationships start with a completed visit (as in _record_completed_visits)
+                if not new[1]:
+                    continue
+                created += 1
+            elif old == new:
+                continue
+            else:
+                diff = {
+                    fname: (old_value, new_value)
+                    for fname, old_value, new_value in zip(REBUILD_FIELDS, old, new)
+                    if old_value != new_value
+                }
+                for fname in diff:
+                    field_corrections[fname] += 1
+                if len(samples) < REBUILD_REPORT_SAMPLES:
+                    samples.append({'partner_id': key[0], 'client_id': key[1], 'changes': diff})
+            upserts.append((key, new))
+
+        if upserts:
+            now = fields.Datetime.now()
+            uid = self.env.uid
+            cr.execute(SQL(
+                """
+                INSERT INTO wfm_partner_client_relationship AS rel
+                       (partner_id, client_id, total_visits, completed_visits, cancelled_visits,
+                        first_visit_date, last_visit_date, installations_visited,
+                        avg_rating, on_time_rate,
+                        create_uid, create_date, write_uid, write_date)
+                VALUES %s
+                ON CONFLICT (partner_id, client_id) DO UPDATE
+                   SET total_visits = EXCLUDED.total_visits,
+                       completed_visits = EXCLUDED.completed_visits,
+                       cancelled_visits = EXCLUDED.cancelled_visits,
+                       first_visit_date = EXCLUDED.first_visit_date,
+                       last_visit_date = EXCLUDED.last_visit_date,
+                       installations_visited = EXCLUDED.installations_visited,
+                       write_uid = EXCLUDED.write_uid,
+                       write_date = EXCLUDED.write_date
+                """,
+                SQL(", ").join(
+                    SQL("(%s, %s, %s, %s, %s, %s::date, %s::date, %s, 0.0, 100.0, %s, %s, %s, %s)",
+                        *key, *values, uid, now, uid, now)
+                    for key, values in upserts
+                ),
+            ))
+
+        # Visited-installation set, from the same active completed visits
+        cr.execute(SQL(
+            """
+            DELETE FROM wfm_relationship_installation_rel r
+             WHERE NOT EXISTS (
+                   SELECT 1
+                     FROM wfm_partner_client_relationship rel
+                     JOIN wfm_visit v
+                       ON v.partner_id = rel.partner_id
+                      AND v.client_id = rel.client_id
+                    WHERE rel.id = r.relationship_id
+                      AND v.installation_id = r.installation_id
+                      AND v.state = 'done'
+                      AND v.active)
+            """
+        ))
+        cr.execute(SQL(
+            """
+            INSERT INTO wfm_relationship_installation_rel (relationship_id, installation_id)
+            SELECT DISTINCT rel.id, v.installation_id
+              FROM wfm_partner_client_relationship rel
+              JOIN wfm_visit v
+                ON v.partner_id = rel.partner_id
+               AND v.client_id = rel.client_id
+             WHERE v.state = 'done'
+               AND v.active
+               AND v.installation_id IS NOT NULL
+            ON CONFLICT DO NOTHING
+            """
+        ))
+
+        rescored = self._rescore_relationships()
+
+        self.invalidate_model()
+        report = {
+            'relationships': len(current) + created,
+            'created': created,
+            'corrected': len(upserts) - created,
+            'rescored': rescored,
+            'field_corrections': {fname: count for fname, count in field_corrections.items() if count},
+            'samples': samples,
+        }
+        _logger.info(
+            f"Relationship rebuild: {report['relationships']} relationships, "
+            f"{created} created, {report['corrected']} corrected, {rescored} rescored"
+        )
+        return report
+
+    @api.model
+    def action_rebuild_relationships(self):
+        """Rebuild all relationships from visit history and report the corrections."""
+        # Rewrites the whole table in SQL: the button is hidden for other
+        # users, but the method is reachable over RPC
+        if not self.env.user.has_group('wfm_core.group_wfm_admin') and not self.env.is_admin():
+            raise AccessError(_("Only WFM administrators can rebuild partner relationships."))
+        report = self._rebuild_relationships()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Relationships Rebuilt'),
+                'message': _(
+                    '%(total)s relationships checked: %(created)s created, '
+                    '%(corrected)s corrected, %(rescored)s rescored.',
+                    total=report['relationships'], created=report['created'],
+                    corrected=report['corrected'], rescored=report['rescored'],
+                ),
+                'type': 'success',
+                'sticky': False,
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            }
+        }
 
     def action_view_visits(self):
         """View all visits for this partner-client relationship."""
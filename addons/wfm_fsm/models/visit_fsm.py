@@ -381,14 +381,7 @@ class WfmVisitFsm(models.Model):
 
     def _update_partner_relationship(self):
         """Update partner-client relationship metrics after visit completion."""
-        Relationship = self.env['wfm.partner.client.relationship']
-        for visit in self:
-            if visit.partner_id and visit.client_id and visit.state == 'done':
-                relationship = Relationship.get_or_create_relationship(
-                    visit.partner_id.id,
-                    visit.client_id.id
-                )
-                relationship.update_from_visit(visit, is_completion=True)
+        self.env['wfm.partner.client.relationship']._record_completed_visits(self)
 
     def action_cancel(self):
         """Cancel the visit."""
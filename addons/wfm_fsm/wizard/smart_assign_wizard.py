@@ -1,6 +1,8 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 
+from ..models.llm_json import parse_json_object, request_json
+
 
 class WfmSmartAssignWizard(models.TransientModel):
     """Smart Assignment Wizard with AI-powered partner recommendations.
@@ -158,7 +160,12 @@ class WfmSmartAssignWizard(models.TransientModel):
                 wizard.recommendations_html = f'<p class="text-danger">Error: {str(e)}</p>'
 
     def _get_ai_top_2_recommendations(self, candidates):
-        """Use Claude AI to select and rank the Top 2 partners."""
+        """Use Claude AI to select and rank the Top 2 partners.
+
+        Repeated requests for an unchanged visit and candidate list are
+        answered from the LLM cache (bypass with the llm_cache_bypass
+        context key).
+        """
         import json
         import logging
         _logger = logging.getLogger(__name__)
@@ -219,30 +226,24 @@ Respond with ONLY valid JSON (no markdown):
   ]
 }"""
 
-            response = client.chat.completions.create(
-                model=CLAUDE_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert OHS coordinator. Select the best 2 partners for client visits. Prioritize relationship continuity. Respond with JSON only."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
+            messages = [
+                {
+                    "role": "system",
+                    "content": "You are an expert OHS coordinator. Select the best 2 partners for client visits. Prioritize relationship continuity. Respond with JSON only."
+                },
+                {"role": "user", "content": prompt}
+            ]
 
-            ai_response = response.choices[0].message.content
-            _logger.info(f"Claude Top 2 response: {ai_response}")
+            def request():
+                result = request_json(client, CLAUDE_MODEL, messages, 0.3, 500, required_keys=('top_2',))
+                return json.dumps(result, ensure_ascii=False)
 
-            # Parse JSON
-            json_str = ai_response
-            if '```json' in ai_response:
-                json_str = ai_response.split('```json')[1].split('```')[0]
-            elif '```' in ai_response:
-                json_str = ai_response.split('```')[1].split('```')[0]
+            ai_response = self.env['wfm.llm.cache']._get_completion(
+                CLAUDE_MODEL, messages, 0.3, request, purpose='smart_assign_top_2',
+            )
+            _logger.info(f"Claude Top 2 response: {ai_response}")
 
-            result = json.loads(json_str.strip())
+            result = parse_json_object(ai_response, ('top_2',))
             top_2 = result.get('top_2', [])
 
             # Map AI selections back to candidate data
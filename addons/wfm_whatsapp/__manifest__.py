@@ -1,6 +1,6 @@
 {
     'name': 'WFM WhatsApp Integration',
-    'version': '19.0.1.0.0',
+    'version': '19.0.1.1.0',
     'category': 'Services/Field Service',
     'summary': 'WhatsApp notifications for WFM visits via Twilio',
     'description': """
@@ -29,6 +29,7 @@
         'views/whatsapp_message_views.xml',
         'views/visit_whatsapp_views.xml',
         'wizard/whatsapp_compose_views.xml',
+        'wizard/whatsapp_bulk_compose_views.xml',
     ],
     'installable': True,
     'application': False,
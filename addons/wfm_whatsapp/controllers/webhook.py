@@ -3,6 +3,8 @@ import hashlib
 import hmac
 import os
 
+from psycopg2.errors import UniqueViolation
+
 from odoo import http, SUPERUSER_ID
 from odoo.http import request
 
@@ -70,11 +72,13 @@ class WhatsAppWebhook(http.Controller):
                 )
                 return self._twiml_empty()
 
-            # Log incoming message
-            self._log_incoming_message(env, partner, phone, message_body, message_sid)
+            # Log incoming message (Twilio retries deliver the same SID twice)
+            if not self._log_incoming_message(env, partner, phone, message_body, message_sid):
+                _logger.info(f"Duplicate WhatsApp webhook ignored: SID={message_sid}")
+                return self._twiml_empty()
 
             # Process command and send response via Twilio API
-            response = self._process_message(env, partner, message_body.upper())
+            response = self._process_message(env, partner, message_body.upper(), phone=phone)
             self._send_whatsapp_reply(from_number, response)
 
             return self._twiml_empty()
@@ -181,19 +185,34 @@ class WhatsAppWebhook(http.Controller):
         return partner
 
     def _log_incoming_message(self, env, partner, phone, message_body, message_sid):
-        """Log incoming WhatsApp message."""
-        env['wfm.whatsapp.message'].sudo().create({
-            'partner_id': partner.id,
-            'phone': phone,
-            'message_body': f"[INCOMING] {message_body}",
-            'message_type': 'custom',
-            'status': 'delivered',
-            'twilio_sid': message_sid,
-            'sent_at': False,  # Incoming, not sent
-        })
-
-    def _process_message(self, env, partner, message):
-        """Process incoming message and return response."""
+        """Log incoming WhatsApp message.
+
+        Returns False if this SID was already logged (duplicate delivery).
+        The UNIQUE constraint on twilio_sid decides, so concurrent retries
+        of the same webhook cannot both get through.
+        """
+        try:
+            with env.cr.savepoint():
+                env['wfm.whatsapp.message'].sudo().create({
+                    'partner_id': partner.id,
+                    'phone': phone,
+                    'message_body': f"[INCOMING] {message_body}",
+                    'message_type': 'custom',
+                    'direction': 'incoming',
+                    'status': 'delivered',
+                    'twilio_sid': message_sid or False,
+                    'sent_at': False,  # Incoming, not sent
+                })
+        except UniqueViolation:
+            return False
+        return True
+
+    def _process_message(self, env, partner, message, phone=None):
+        """Process incoming message and return response.
+
+        phone identifies the conversation session used to resolve
+        "visit N" commands against the list last shown.
+        """
         message_raw = message.strip()
         message = message_raw.upper()
 
@@ -203,7 +222,7 @@ class WhatsAppWebhook(http.Controller):
 
         # Handle visits command
         if message in ['VISITS', 'UPCOMING']:
-            return self._handle_visits_list(env, partner)
+            return self._handle_visits_list(env, partner, phone=phone)
 
         # Handle visit N command (e.g., visit 1, visit 2)
         # Also handles: visit 1 accept, visit 2 deny
@@ -215,11 +234,11 @@ class WhatsAppWebhook(http.Controller):
                 if len(parts) >= 3:
                     action = parts[2]
                     if action in ['ACCEPT', 'YES', 'OK', 'CONFIRM']:
-                        return self._handle_accept_visit(env, partner, visit_num)
+                        return self._handle_accept_visit(env, partner, visit_num, phone=phone)
                     elif action in ['DENY', 'NO', 'CANCEL', 'REJECT']:
-                        return self._handle_deny_visit(env, partner, visit_num)
+                        return self._handle_deny_visit(env, partner, visit_num, phone=phone)
                 # Just show visit details
-                return self._handle_visit_detail(env, partner, visit_num)
+                return self._handle_visit_detail(env, partner, visit_num, phone=phone)
 
         # Handle status command
         if message in ['STATUS']:
@@ -261,14 +280,56 @@ Available commands:
 
 Need assistance? Contact GEP support."""
 
-    def _handle_visits_list(self, env, partner):
-        """Handle visits command - list upcoming visits."""
-        Visit = env['wfm.visit'].sudo()
-
-        visits = Visit.search([
+    def _search_upcoming_visits(self, env, partner, limit):
+        """Upcoming visits of a partner, in the order they are listed."""
+        return env['wfm.visit'].sudo().search([
             ('partner_id', '=', partner.id),
             ('state', 'in', ['assigned', 'confirmed']),
-        ], order='visit_date asc', limit=5)
+        ], order='visit_date asc', limit=limit)
+
+    def _get_listed_visits(self, env, partner, phone):
+        """Visits as last shown to this phone, or a fresh listing.
+
+        Uses the conversation session when still alive, so numbers keep
+        pointing at what the partner saw even if the schedule changed since.
+        """
+        Session = env['wfm.whatsapp.session'].sudo()
+        visits = Session.get_listed_visits(phone, partner) if phone else None
+        if visits is None:
+            visits = self._search_upcoming_visits(env, partner, limit=10)
+            if phone:
+                Session.store_listed_visits(phone, partner, visits)
+        return visits
+
+    def _resolve_visit_number(self, env, partner, phone, visit_number):
+        """Resolve "visit N" to a visit.
+
+        Returns:
+            tuple (visit, error message); exactly one of them is set
+        """
+        visits = self._get_listed_visits(env, partner, phone)
+
+        if not visits:
+            return None, "📋 You have no upcoming visits."
+
+        if visit_number < 1 or visit_number > len(visits):
+            return None, f"❌ Invalid visit number. You have {len(visits)} upcoming visit(s).\n\nType *visits* to see the list."
+
+        visit = visits[visit_number - 1]
+
+        # The listed visit may have been reassigned or cancelled since
+        if not visit.exists() or visit.partner_id != partner or visit.state not in ('assigned', 'confirmed'):
+            return None, f"ℹ️ Visit #{visit_number} is no longer in your upcoming visits.\n\nType *visits* to see the updated list."
+
+        return visit, None
+
+    def _handle_visits_list(self, env, partner, phone=None):
+        """Handle visits command - list upcoming visits."""
+        visits = self._search_upcoming_visits(env, partner, limit=5)
+
+        # Remember this listing for follow-up "visit N" commands
+        if phone:
+            env['wfm.whatsapp.session'].sudo().store_listed_visits(phone, partner, visits)
 
         if not visits:
             return "📋 You have no upcoming visits assigned.\n\nCheck the Partner Portal for updates."
@@ -313,22 +374,11 @@ Need assistance? Contact GEP support."""
         encoded_address = urllib.parse.quote(address)
         return f"https://www.google.com/maps/search/?api=1&query={encoded_address}"
 
-    def _handle_visit_detail(self, env, partner, visit_number):
+    def _handle_visit_detail(self, env, partner, visit_number, phone=None):
         """Handle visit N command - show detailed visit info."""
-        Visit = env['wfm.visit'].sudo()
-
-        visits = Visit.search([
-            ('partner_id', '=', partner.id),
-            ('state', 'in', ['assigned', 'confirmed']),
-        ], order='visit_date asc', limit=10)
-
-        if not visits:
-            return "📋 You have no upcoming visits assigned."
-
-        if visit_number < 1 or visit_number > len(visits):
-            return f"❌ Invalid visit number. You have {len(visits)} upcoming visit(s).\n\nType *visits* to see the list."
-
-        visit = visits[visit_number - 1]
+        visit, error = self._resolve_visit_number(env, partner, phone, visit_number)
+        if error:
+            return error
 
         # Format date and time
         date_str = visit.visit_date.strftime('%A, %d %B %Y') if visit.visit_date else 'TBD'
@@ -516,23 +566,11 @@ If this was a mistake, please contact your coordinator immediately."""
             _logger.error(f"Error declining visit {visit.name}: {e}")
             return "❌ Error processing decline. Please try again or contact your coordinator."
 
-    def _handle_accept_visit(self, env, partner, visit_number):
+    def _handle_accept_visit(self, env, partner, visit_number, phone=None):
         """Handle visit N accept - confirm a specific visit by number."""
-        Visit = env['wfm.visit'].sudo()
-
-        # Get visits in same order as visits list
-        visits = Visit.search([
-            ('partner_id', '=', partner.id),
-            ('state', 'in', ['assigned', 'confirmed']),
-        ], order='visit_date asc', limit=10)
-
-        if not visits:
-            return "📋 You have no upcoming visits."
-
-        if visit_number < 1 or visit_number > len(visits):
-            return f"❌ Invalid visit number. You have {len(visits)} upcoming visit(s).\n\nType *visits* to see the list."
-
-        visit = visits[visit_number - 1]
+        visit, error = self._resolve_visit_number(env, partner, phone, visit_number)
+        if error:
+            return error
 
         if visit.state == 'confirmed':
             return f"ℹ️ Visit #{visit_number} ({visit.name}) is already confirmed."
@@ -564,23 +602,11 @@ See you there! Safe travels. 🚗"""
             _logger.error(f"Error confirming visit {visit.name}: {e}")
             return "❌ Error confirming visit. Please try again or contact your coordinator."
 
-    def _handle_deny_visit(self, env, partner, visit_number):
+    def _handle_deny_visit(self, env, partner, visit_number, phone=None):
         """Handle visit N deny - decline a specific visit by number."""
-        Visit = env['wfm.visit'].sudo()
-
-        # Get visits in same order as visits list
-        visits = Visit.search([
-            ('partner_id', '=', partner.id),
-            ('state', 'in', ['assigned', 'confirmed']),
-        ], order='visit_date asc', limit=10)
-
-        if not visits:
-            return "📋 You have no upcoming visits."
-
-        if visit_number < 1 or visit_number > len(visits):
-            return f"❌ Invalid visit number. You have {len(visits)} upcoming visit(s).\n\nType *visits* to see the list."
-
-        visit = visits[visit_number - 1]
+        visit, error = self._resolve_visit_number(env, partner, phone, visit_number)
+        if error:
+            return error
 
         if visit.state == 'confirmed':
             return f"⚠️ Visit #{visit_number} ({visit.name}) is already confirmed.\n\nContact your coordinator to make changes."
@@ -631,7 +657,9 @@ Reply with:
     def whatsapp_status_callback(self, **kwargs):
         """Handle Twilio status callbacks for message delivery tracking.
 
-        Configure as Status Callback URL in Twilio.
+        Configure as Status Callback URL in Twilio. Twilio may send several
+        callbacks per message, out of order; they are buffered and applied
+        by the ingestion cron (see wfm.whatsapp.status.event).
         """
         try:
             message_sid = kwargs.get('MessageSid')
@@ -640,25 +668,41 @@ Reply with:
             _logger.info(f"WhatsApp status update: SID={message_sid}, Status={message_status}")
 
             if message_sid and message_status:
+                # Buffer only; the ingestion cron coalesces bursts of
+                # callbacks and applies them in batched, monotonic updates.
                 env = request.env(user=SUPERUSER_ID)
-                message = env['wfm.whatsapp.message'].sudo().search([
-                    ('twilio_sid', '=', message_sid)
-                ], limit=1)
-
-                if message:
-                    status_map = {
-                        'queued': 'pending',
-                        'sent': 'sent',
-                        'delivered': 'delivered',
-                        'read': 'read',
-                        'failed': 'failed',
-                        'undelivered': 'failed',
-                    }
-                    new_status = status_map.get(message_status, message.status)
-                    message.write({'status': new_status})
+                env['wfm.whatsapp.status.event'].sudo().enqueue(message_sid, message_status)
 
             return "OK"
 
         except Exception as e:
             _logger.exception(f"WhatsApp status callback error: {e}")
             return "Error"
+
+    @http.route('/whatsapp/metrics', type='http', auth='public',
+                methods=['GET'], csrf=False)
+    def whatsapp_metrics(self, window_hours='24', **kwargs):
+        """Expose notification metrics in Prometheus text format.
+
+        Requires the token set in the wfm.whatsapp.metrics_token system
+        parameter, as a Bearer token or ?token= query parameter.
+        """
+        env = request.env(user=SUPERUSER_ID)
+        expected = env['ir.config_parameter'].sudo().get_param('wfm.whatsapp.metrics_token')
+
+        auth_header = request.httprequest.headers.get('Authorization', '')
+        token = auth_header[7:] if auth_header.startswith('Bearer ') else kwargs.get('token', '')
+
+        if not expected or not hmac.compare_digest(token, expected):
+            return request.make_response('Forbidden', status=403)
+
+        try:
+            window = max(1, int(window_hours))
+        except ValueError:
+            window = 24
+
+        body = env['wfm.whatsapp.metrics'].sudo().render_prometheus(window_hours=window)
+        return request.make_response(
+            body,
+            headers=[('Content-Type', 'text/plain; version=0.0.4')]
+        )
@@ -0,0 +1,48 @@
+"""Prepare existing WhatsApp messages for the new columns and constraint.
+
+- Incoming messages used to be logged once per webhook delivery, so Twilio
+  retries left several rows with the same SID (or an empty one). The first
+  row of each SID is kept before UNIQUE(twilio_sid) is installed.
+- direction and queued_at are created here rather than filled with their
+  defaults by the ORM: old incoming messages would become outgoing, and
+  every old message would look queued at upgrade time in the metrics.
+"""
+
+
+def migrate(cr, version):
+    if not version:
+        return
+
+    cr.execute("""
+        UPDATE wfm_whatsapp_message
+           SET twilio_sid = NULL
+         WHERE twilio_sid = ''
+    """)
+
+    cr.execute("""
+        DELETE FROM wfm_whatsapp_message m
+         USING (SELECT twilio_sid, MIN(id) AS keep_id
+                  FROM wfm_whatsapp_message
+                 WHERE twilio_sid IS NOT NULL
+                 GROUP BY twilio_sid
+                HAVING COUNT(*) > 1) AS dup
+         WHERE m.twilio_sid = dup.twilio_sid
+           AND m.id <> dup.keep_id
+    """)
+
+    cr.execute("""
+        ALTER TABLE wfm_whatsapp_message
+            ADD COLUMN IF NOT EXISTS direction varchar,
+            ADD COLUMN IF NOT EXISTS queued_at timestamp
+    """)
+
+    # Incoming messages were stored with an [INCOMING] prefix and no
+    # sent_at; pending and failed outgoing messages have no sent_at either
+    cr.execute("""
+        UPDATE wfm_whatsapp_message
+           SET queued_at = create_date,
+               direction = CASE WHEN message_body LIKE '[INCOMING]%'
+                                  OR (sent_at IS NULL AND status NOT IN ('pending', 'failed'))
+                                THEN 'incoming' ELSE 'outgoing' END
+         WHERE direction IS NULL
+    """)
@@ -1,2 +1,5 @@
 from . import whatsapp_message
 from . import visit_whatsapp
+from . import whatsapp_status_event
+from . import whatsapp_session
+from . import whatsapp_metrics
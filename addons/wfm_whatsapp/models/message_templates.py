@@ -0,0 +1,177 @@
+"""Precompiled WhatsApp message templates for visit notifications.
+
+Each template is parsed once at import time into literal/placeholder
+chunks. Rendering is a plain join over prepared string values, so a batch
+of visits only pays for building its values (see
+wfm.visit._get_whatsapp_render_values), not for re-parsing the template.
+"""
+from string import Formatter
+
+_FORMATTER = Formatter()
+
+SEPARATOR = '━━━━━━━━━━━━━━━━━━━━━'
+
+
+def _compile(template):
+    """Split a {placeholder} template into (literal, field) chunks."""
+    chunks = []
+    for literal, field, spec, conversion in _FORMATTER.parse(template):
+        if spec or conversion:
+            raise ValueError(f"Format specs are not supported in message templates: {field}")
+        chunks.append((literal, field))
+    return tuple(chunks)
+
+
+def _render(chunks, values):
+    out = []
+    for literal, field in chunks:
+        out.append(literal)
+        if field is not None:
+            value = values[field]
+            # Empty ORM values (False/None) render as blanks
+            out.append(value if isinstance(value, str) else '' if value is None or value is False else str(value))
+    return ''.join(out)
+
+
+class MessageTemplate:
+    """A message body compiled once, rendered many times.
+
+    Args:
+        body: main template
+        optional: tuple of (key, template) blocks appended only when
+            values[key] is truthy
+        footer: template appended last
+        defaults: fallback strings for empty values
+    """
+
+    def __init__(self, body, optional=(), footer='', defaults=None):
+        self._body = _compile(body)
+        self._optional = tuple((key, _compile(block)) for key, block in optional)
+        self._footer = _compile(footer)
+        self._defaults = defaults or {}
+
+    def render(self, values):
+        if self._defaults:
+            values = dict(values)
+            for key, default in self._defaults.items():
+                if not values.get(key):
+                    values[key] = default
+
+        message = _render(self._body, values)
+        for key, block in self._optional:
+            if values.get(key):
+                message += _render(block, values)
+        return message + _render(self._footer, values)
+
+
+MESSAGE_TEMPLATES = {
+    'assignment': MessageTemplate(
+        body=f"""🏥 *GEP OHS - New Visit Assignment*
+
+Hello {{partner_name}},
+
+You have been assigned to a new OHS visit. Please review the details below:
+
+{SEPARATOR}
+📋 *VISIT DETAILS*
+{SEPARATOR}
+
+🔖 *Reference:* {{reference}}
+📅 *Date:* {{date_long}}
+⏰ *Time:* {{start_time}} - {{end_time}}
+⏱️ *Duration:* {{duration}} hours
+
+{SEPARATOR}
+🏢 *CLIENT INFORMATION*
+{SEPARATOR}
+
+🏛️ *Client:* {{client_name}}
+📍 *Location:*
+   {{address_block}}""",
+        optional=(('maps_url', """
+
+🗺️ *Google Maps:*
+{maps_url}"""),),
+        footer=f"""
+
+{SEPARATOR}
+✅ *CONFIRM YOUR AVAILABILITY*
+{SEPARATOR}
+
+Please reply with:
+👍 *ACCEPT* - To confirm this visit
+👎 *DENY* - If you cannot attend
+
+Or contact your coordinator for any questions.""",
+        defaults={'address_block': 'Address not specified'},
+    ),
+    'confirmed': MessageTemplate(
+        body=f"""✅ *Visit Confirmed*
+
+Thank you! Your visit has been confirmed.
+
+{SEPARATOR}
+📋 *CONFIRMED VISIT*
+{SEPARATOR}
+
+🔖 *Reference:* {{reference}}
+📅 *Date:* {{date_long}}
+⏰ *Time:* {{start_time}} - {{end_time}}
+🏛️ *Client:* {{client_name}}
+📍 *Location:* {{street_city}}""",
+        optional=(('maps_url', """
+
+🗺️ *Navigate:*
+{maps_url}"""),),
+        footer=f"""
+
+{SEPARATOR}
+See you there! Safe travels. 🚗""",
+        defaults={'street_city': 'See details below'},
+    ),
+    'cancelled': MessageTemplate(
+        body=f"""❌ *Visit Cancelled*
+
+The following visit has been cancelled:
+
+{SEPARATOR}
+📋 *CANCELLED VISIT*
+{SEPARATOR}
+
+🔖 *Reference:* {{reference}}
+📅 *Date:* {{date_long}}
+🏛️ *Client:* {{client_name}}
+
+{SEPARATOR}
+
+Please check the Partner Portal for your updated schedule.
+
+If you have questions, contact your coordinator.""",
+    ),
+    'reminder': MessageTemplate(
+        body=f"""⏰ *Reminder: Visit Tomorrow*
+
+Hello {{partner_name}},
+
+This is a friendly reminder about your scheduled visit tomorrow.
+
+{SEPARATOR}
+📋 *VISIT DETAILS*
+{SEPARATOR}
+
+🔖 *Reference:* {{reference}}
+📅 *Date:* Tomorrow, {{date_reminder}}
+⏰ *Time:* {{start_time}} - {{end_time}}
+🏛️ *Client:* {{client_name}}
+📍 *Location:* {{street_city}}""",
+        optional=(('maps_url', """
+
+🗺️ *Navigate:*
+{maps_url}"""),),
+        footer=f"""
+
+{SEPARATOR}
+Safe travels! 🚗""",
+        defaults={'street_city': 'See navigation link'},
+    ),
+}
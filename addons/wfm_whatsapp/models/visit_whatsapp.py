@@ -4,6 +4,8 @@ from datetime import timedelta
 
 from odoo import models, fields, api, _
 
+from .message_templates import MESSAGE_TEMPLATES
+
 _logger = logging.getLogger(__name__)
 
 
@@ -30,6 +32,10 @@ class WfmVisitWhatsApp(models.Model):
 
     def write(self, vals):
         """Override write to trigger WhatsApp notifications on key events."""
+        # Only assignment and state changes notify (e.g. not billing updates)
+        if 'partner_id' not in vals and 'state' not in vals:
+            return super().write(vals)
+
         # Track changes before write
         partner_assigned = {}
         state_changed = {}
@@ -49,18 +55,43 @@ class WfmVisitWhatsApp(models.Model):
 
         result = super().write(vals)
 
-        # Send notifications after successful write
-        for visit_id, new_partner_id in partner_assigned.items():
-            visit = self.browse(visit_id)
-            visit._send_whatsapp_assignment()
+        # Send notifications after successful write, rendered in batch
+        if partner_assigned:
+            self.browse(list(partner_assigned))._send_whatsapp_notifications('assignment')
 
-        for visit_id, (old_state, new_state) in state_changed.items():
-            visit = self.browse(visit_id)
-            if new_state == 'cancelled':
-                visit._send_whatsapp_cancelled()
+        cancelled_ids = [
+            visit_id for visit_id, (old_state, new_state) in state_changed.items()
+            if new_state == 'cancelled'
+        ]
+        if cancelled_ids:
+            self.browse(cancelled_ids)._send_whatsapp_notifications('cancelled')
 
         return result
 
+    def _send_whatsapp_notifications(self, message_type):
+        """Render a notification for all visits at once and send each now.
+
+        Visits without partner are skipped.
+
+        Returns:
+            wfm.whatsapp.message recordset of the messages created
+        """
+        Message = self.env['wfm.whatsapp.message']
+        visits = self.filtered('partner_id')
+        bodies = visits._render_whatsapp_messages(message_type)
+
+        message_ids = []
+        for visit in visits:
+            message = Message.send_message(
+                partner_id=visit.partner_id,
+                message_body=bodies[visit.id],
+                message_type=message_type,
+                visit_id=visit
+            )
+            if message:
+                message_ids.append(message.id)
+        return Message.browse(message_ids)
+
     def _send_whatsapp_assignment(self):
         """Send WhatsApp notification when partner is assigned."""
         self.ensure_one()
@@ -125,29 +156,45 @@ class WfmVisitWhatsApp(models.Model):
             visit_id=self
         )
 
+    def _enqueue_whatsapp_notifications(self, message_type, broadcast_ref=None):
+        """Render a notification for every visit and enqueue them in one batch.
+
+        Visits without partner or partner phone are skipped.
+
+        Returns:
+            tuple (wfm.whatsapp.message recordset, skipped wfm.visit recordset)
+        """
+        Message = self.env['wfm.whatsapp.message']
+
+        phones = {}
+        skipped_ids = []
+        for visit in self:
+            phone = visit.partner_id and Message._get_partner_phone(visit.partner_id)
+            if phone:
+                phones[visit.id] = phone
+            else:
+                skipped_ids.append(visit.id)
+
+        # Render only the visits that will actually be sent
+        reachable = self.browse(list(phones))
+        bodies = reachable._render_whatsapp_messages(message_type)
+        vals_list = [{
+            'partner_id': visit.partner_id.id,
+            'phone': phones[visit.id],
+            'message_body': bodies[visit.id],
+            'message_type': message_type,
+            'visit_id': visit.id,
+        } for visit in reachable]
+
+        messages = Message.enqueue_messages(vals_list, broadcast_ref=broadcast_ref)
+        return messages, self.browse(skipped_ids)
+
     def _get_google_maps_url(self):
         """Generate Google Maps URL for the installation address."""
         self.ensure_one()
         if not self.installation_id:
             return None
-
-        # Build address string
-        address_parts = []
-        if self.installation_id.street:
-            address_parts.append(self.installation_id.street)
-        if self.installation_id.city:
-            address_parts.append(self.installation_id.city)
-        if self.installation_id.postal_code:
-            address_parts.append(self.installation_id.postal_code)
-        if self.installation_id.country_id:
-            address_parts.append(self.installation_id.country_id.name)
-
-        if not address_parts:
-            return None
-
-        address = ', '.join(address_parts)
-        encoded_address = urllib.parse.quote(address)
-        return f"https://www.google.com/maps/search/?api=1&query={encoded_address}"
+        return self._get_installation_render_values(self.installation_id)['maps_url'] or None
 
     def _format_time(self, time_float):
         """Format float time to HH:MM string."""
@@ -157,180 +204,111 @@ class WfmVisitWhatsApp(models.Model):
         minutes = int((time_float % 1) * 60)
         return f"{hours:02d}:{minutes:02d}"
 
-    def _get_assignment_message(self):
-        """Build assignment notification message with full details."""
-        self.ensure_one()
-
-        start_time = self._format_time(self.start_time)
-        end_time = self._format_time(self.end_time)
-        maps_url = self._get_google_maps_url()
+    @api.model
+    def _get_installation_render_values(self, installation):
+        """Address strings of an installation used by the message templates."""
+        street = installation.street
+        city = installation.city
+        postal_code = installation.postal_code
 
-        # Build full address
+        # Full address block: name / street / "postal city"
         address_lines = []
-        if self.installation_id.name:
-            address_lines.append(self.installation_id.name)
-        if self.installation_id.street:
-            address_lines.append(self.installation_id.street)
-        if self.installation_id.city:
-            city_line = self.installation_id.city
-            if self.installation_id.postal_code:
-                city_line = f"{self.installation_id.postal_code} {city_line}"
-            address_lines.append(city_line)
-
-        address_text = '\n   '.join(address_lines) if address_lines else 'Address not specified'
-
-        message = f"""🏥 *GEP OHS - New Visit Assignment*
-
-Hello {self.partner_id.name},
-
-You have been assigned to a new OHS visit. Please review the details below:
-
-━━━━━━━━━━━━━━━━━━━━━
-📋 *VISIT DETAILS*
-━━━━━━━━━━━━━━━━━━━━━
-
-🔖 *Reference:* {self.name}
-📅 *Date:* {self.visit_date.strftime('%A, %d %B %Y') if self.visit_date else 'TBD'}
-⏰ *Time:* {start_time} - {end_time}
-⏱️ *Duration:* {self.duration:.1f} hours
+        if installation.name:
+            address_lines.append(installation.name)
+        if street:
+            address_lines.append(street)
+        if city:
+            address_lines.append(f"{postal_code} {city}" if postal_code else city)
+
+        # Google Maps search URL
+        maps_parts = [part for part in (street, city, postal_code) if part]
+        if installation.country_id:
+            maps_parts.append(installation.country_id.name)
+        maps_url = ''
+        if maps_parts:
+            encoded_address = urllib.parse.quote(', '.join(maps_parts))
+            maps_url = f"https://www.google.com/maps/search/?api=1&query={encoded_address}"
 
-━━━━━━━━━━━━━━━━━━━━━
-🏢 *CLIENT INFORMATION*
-━━━━━━━━━━━━━━━━━━━━━
+        return {
+            'address_block': '\n   '.join(address_lines),
+            'street_city': ', '.join(part for part in (street, city) if part),
+            'maps_url': maps_url,
+        }
 
-🏛️ *Client:* {self.client_id.name or 'N/A'}
-📍 *Location:*
-   {address_text}"""
+    def _get_whatsapp_render_values(self):
+        """Prepare template values for all visits in one read pass.
 
-        if maps_url:
-            message += f"""
+        Related partners, clients and installations are fetched in batch and
+        installation addresses are built once per installation, however many
+        visits share it.
 
-🗺️ *Google Maps:*
-{maps_url}"""
+        Returns:
+            dict of visit ID -> dict of template values
+        """
+        self.fetch(['name', 'visit_date', 'start_time', 'end_time', 'duration',
+                    'partner_id', 'client_id', 'installation_id'])
+        self.mapped('partner_id').fetch(['name'])
+        self.mapped('client_id').fetch(['name'])
+        installations = self.mapped('installation_id')
+        installations.fetch(['name', 'street', 'city', 'postal_code', 'country_id'])
+        installations.mapped('country_id').fetch(['name'])
+
+        no_address = {'address_block': '', 'street_city': '', 'maps_url': ''}
+        address_values = {
+            installation.id: self._get_installation_render_values(installation)
+            for installation in installations
+        }
 
-        message += f"""
+        values = {}
+        for visit in self:
+            visit_date = visit.visit_date
+            values[visit.id] = {
+                'reference': visit.name or '',
+                'partner_name': visit.partner_id.name or '',
+                'client_name': visit.client_id.name or 'N/A',
+                'date_long': visit_date.strftime('%A, %d %B %Y') if visit_date else 'TBD',
+                'date_reminder': visit_date.strftime('%A %d %B %Y') if visit_date else 'TBD',
+                'start_time': self._format_time(visit.start_time),
+                'end_time': self._format_time(visit.end_time),
+                'duration': f"{visit.duration:.1f}",
+                **address_values.get(visit.installation_id.id, no_address),
+            }
+        return values
 
-━━━━━━━━━━━━━━━━━━━━━
-✅ *CONFIRM YOUR AVAILABILITY*
-━━━━━━━━━━━━━━━━━━━━━
+    def _render_whatsapp_messages(self, message_type):
+        """Render a notification body for every visit in the recordset.
 
-Please reply with:
-👍 *ACCEPT* - To confirm this visit
-👎 *DENY* - If you cannot attend
+        Args:
+            message_type: key of MESSAGE_TEMPLATES
 
-Or contact your coordinator for any questions."""
+        Returns:
+            dict of visit ID -> message body
+        """
+        template = MESSAGE_TEMPLATES[message_type]
+        return {
+            visit_id: template.render(values)
+            for visit_id, values in self._get_whatsapp_render_values().items()
+        }
 
-        return message
+    def _get_assignment_message(self):
+        """Build assignment notification message with full details."""
+        self.ensure_one()
+        return self._render_whatsapp_messages('assignment')[self.id]
 
     def _get_confirmed_message(self):
         """Build confirmation acknowledgment message."""
         self.ensure_one()
-
-        start_time = self._format_time(self.start_time)
-        end_time = self._format_time(self.end_time)
-        maps_url = self._get_google_maps_url()
-
-        # Build address
-        address_parts = []
-        if self.installation_id.street:
-            address_parts.append(self.installation_id.street)
-        if self.installation_id.city:
-            address_parts.append(self.installation_id.city)
-        address_text = ', '.join(address_parts) if address_parts else 'See details below'
-
-        message = f"""✅ *Visit Confirmed*
-
-Thank you! Your visit has been confirmed.
-
-━━━━━━━━━━━━━━━━━━━━━
-📋 *CONFIRMED VISIT*
-━━━━━━━━━━━━━━━━━━━━━
-
-🔖 *Reference:* {self.name}
-📅 *Date:* {self.visit_date.strftime('%A, %d %B %Y') if self.visit_date else 'TBD'}
-⏰ *Time:* {start_time} - {end_time}
-🏛️ *Client:* {self.client_id.name or 'N/A'}
-📍 *Location:* {address_text}"""
-
-        if maps_url:
-            message += f"""
-
-🗺️ *Navigate:*
-{maps_url}"""
-
-        message += """
-
-━━━━━━━━━━━━━━━━━━━━━
-See you there! Safe travels. 🚗"""
-
-        return message
+        return self._render_whatsapp_messages('confirmed')[self.id]
 
     def _get_cancelled_message(self):
         """Build cancellation notice message."""
         self.ensure_one()
-
-        return f"""❌ *Visit Cancelled*
-
-The following visit has been cancelled:
-
-━━━━━━━━━━━━━━━━━━━━━
-📋 *CANCELLED VISIT*
-━━━━━━━━━━━━━━━━━━━━━
-
-🔖 *Reference:* {self.name}
-📅 *Date:* {self.visit_date.strftime('%A, %d %B %Y') if self.visit_date else 'TBD'}
-🏛️ *Client:* {self.client_id.name or 'N/A'}
-
-━━━━━━━━━━━━━━━━━━━━━
-
-Please check the Partner Portal for your updated schedule.
-
-If you have questions, contact your coordinator."""
+        return self._render_whatsapp_messages('cancelled')[self.id]
 
     def _get_reminder_message(self):
         """Build 24-hour reminder message."""
         self.ensure_one()
-
-        start_time = self._format_time(self.start_time)
-        end_time = self._format_time(self.end_time)
-        maps_url = self._get_google_maps_url()
-
-        # Build address
-        address_parts = []
-        if self.installation_id.street:
-            address_parts.append(self.installation_id.street)
-        if self.installation_id.city:
-            address_parts.append(self.installation_id.city)
-        address_text = ', '.join(address_parts) if address_parts else 'See navigation link'
-
-        message = f"""⏰ *Reminder: Visit Tomorrow*
-
-Hello {self.partner_id.name},
-
-This is a friendly reminder about your scheduled visit tomorrow.
-
-━━━━━━━━━━━━━━━━━━━━━
-📋 *VISIT DETAILS*
-━━━━━━━━━━━━━━━━━━━━━
-
-🔖 *Reference:* {self.name}
-📅 *Date:* Tomorrow, {self.visit_date.strftime('%A %d %B %Y') if self.visit_date else 'TBD'}
-⏰ *Time:* {start_time} - {end_time}
-🏛️ *Client:* {self.client_id.name or 'N/A'}
-📍 *Location:* {address_text}"""
-
-        if maps_url:
-            message += f"""
-
-🗺️ *Navigate:*
-{maps_url}"""
-
-        message += """
-
-━━━━━━━━━━━━━━━━━━━━━
-Safe travels! 🚗"""
-
-        return message
+        return self._render_whatsapp_messages('reminder')[self.id]
 
     def action_open_whatsapp_composer(self):
         """Open WhatsApp compose wizard."""
@@ -385,20 +363,25 @@ Safe travels! 🚗"""
             ('partner_id', '!=', False),
         ])
 
+        # Skip visits whose reminder is already sent or queued
+        reminded = self.env['wfm.whatsapp.message'].search([
+            ('visit_id', 'in', visits.ids),
+            ('message_type', '=', 'reminder'),
+            ('status', 'in', ['pending', 'sent', 'delivered', 'read']),
+        ]).mapped('visit_id')
+        visits -= reminded
+
         _logger.info(f"Sending 24h reminders for {len(visits)} visits")
 
-        for visit in visits:
-            # Check if reminder already sent
-            existing = self.env['wfm.whatsapp.message'].search([
-                ('visit_id', '=', visit.id),
-                ('message_type', '=', 'reminder'),
-                ('status', 'in', ['sent', 'delivered']),
-            ], limit=1)
-
-            if not existing:
-                try:
-                    visit._send_whatsapp_reminder()
-                except Exception as e:
-                    _logger.error(f"Failed to send reminder for visit {visit.name}: {e}")
+        # Rendered in one pass and delivered by the send queue cron
+        try:
+            messages, skipped = visits._enqueue_whatsapp_notifications('reminder')
+        except Exception as e:
+            _logger.error(f"Failed to enqueue 24h reminders: {e}")
+            return False
+
+        _logger.info(f"Queued {len(messages)} 24h reminders")
+        if skipped:
+            _logger.warning(f"No phone number for reminders of visits: {', '.join(skipped.mapped('name'))}")
 
         return True
@@ -1,9 +1,12 @@
 import logging
 import os
+import uuid
 from datetime import datetime
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.models import Constraint
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
@@ -15,6 +18,28 @@ except ImportError:
     TWILIO_AVAILABLE = False
     _logger.warning("Twilio library not installed. WhatsApp notifications disabled.")
 
+# Twilio MessageStatus -> wfm.whatsapp.message status
+TWILIO_STATUS_MAP = {
+    'accepted': 'pending',
+    'queued': 'pending',
+    'sending': 'pending',
+    'sent': 'sent',
+    'delivered': 'delivered',
+    'read': 'read',
+    'failed': 'failed',
+    'undelivered': 'failed',
+}
+
+# Delivery progress order. A status may only be replaced by a higher-ranked
+# one, so late or out-of-order callbacks never move a message backwards.
+STATUS_RANK = {
+    'pending': 0,
+    'sent': 1,
+    'failed': 2,
+    'delivered': 3,
+    'read': 4,
+}
+
 
 class WfmWhatsAppMessage(models.Model):
     """WhatsApp message log for WFM notifications."""
@@ -56,6 +81,10 @@ class WfmWhatsAppMessage(models.Model):
         string='Message',
         required=True
     )
+    direction = fields.Selection([
+        ('outgoing', 'Outgoing'),
+        ('incoming', 'Incoming'),
+    ], string='Direction', default='outgoing', required=True)
 
     # Status tracking
     status = fields.Selection([
@@ -69,12 +98,36 @@ class WfmWhatsAppMessage(models.Model):
     twilio_sid = fields.Char(
         string='Twilio SID',
         readonly=True,
+        copy=False,
         help='Twilio message identifier'
     )
+    # Delivery timeline (see wfm.whatsapp.metrics)
+    queued_at = fields.Datetime(
+        string='Queued At',
+        readonly=True,
+        default=fields.Datetime.now,
+        help='When the message was created, i.e. right after the triggering event'
+    )
     sent_at = fields.Datetime(
         string='Sent At',
+        readonly=True,
+        help='When Twilio accepted the message'
+    )
+    delivered_at = fields.Datetime(
+        string='Delivered At',
+        readonly=True
+    )
+    read_at = fields.Datetime(
+        string='Read At',
         readonly=True
     )
+    broadcast_ref = fields.Char(
+        string='Broadcast',
+        readonly=True,
+        copy=False,
+        index=True,
+        help='Groups messages enqueued together by a bulk send'
+    )
     error_message = fields.Text(
         string='Error',
         readonly=True
@@ -86,6 +139,11 @@ class WfmWhatsAppMessage(models.Model):
         store=True
     )
 
+    _twilio_sid_unique = Constraint(
+        'UNIQUE(twilio_sid)',
+        'A WhatsApp message with this Twilio SID already exists.'
+    )
+
     @api.depends('partner_id', 'message_type', 'sent_at')
     def _compute_display_name(self):
         for rec in self:
@@ -182,6 +240,12 @@ class WfmWhatsAppMessage(models.Model):
             })
             return False
 
+    @api.model
+    def _get_partner_phone(self, partner):
+        """Return the WhatsApp-capable number of a partner, if any."""
+        # mobile field may not exist in all Odoo configs
+        return getattr(partner, 'mobile', None) or partner.phone
+
     @api.model
     def send_message(self, partner_id, message_body, message_type='custom', visit_id=None):
         """Create and send a WhatsApp message.
@@ -200,8 +264,7 @@ class WfmWhatsAppMessage(models.Model):
         else:
             partner = partner_id
 
-        # Get phone (mobile field may not exist in all Odoo configs)
-        phone = getattr(partner, 'mobile', None) or partner.phone
+        phone = self._get_partner_phone(partner)
         if not phone:
             _logger.warning(f"Partner {partner.name} has no phone number")
             return False
@@ -219,3 +282,145 @@ class WfmWhatsAppMessage(models.Model):
         message.action_send()
 
         return message
+
+    @api.model
+    def _new_broadcast_ref(self):
+        """Generate a reference grouping the messages of one bulk send."""
+        return f"BC-{fields.Datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+    @api.model
+    def enqueue_messages(self, vals_list, broadcast_ref=None):
+        """Create pending messages in one batch and schedule their sending.
+
+        Unlike send_message, nothing is sent within the calling request: the
+        send queue cron delivers the messages in committed chunks, so large
+        broadcasts cannot time out the HTTP worker.
+
+        Args:
+            vals_list: list of wfm.whatsapp.message values (partner_id, phone,
+                message_body, message_type, optional visit_id)
+            broadcast_ref: optional reference; generated when not given
+
+        Returns:
+            wfm.whatsapp.message recordset of the enqueued messages
+        """
+        if not vals_list:
+            return self.browse()
+
+        broadcast_ref = broadcast_ref or self._new_broadcast_ref()
+        messages = self.create([
+            dict(vals, status='pending', broadcast_ref=broadcast_ref)
+            for vals in vals_list
+        ])
+
+        cron = self.env.ref('wfm_whatsapp.ir_cron_whatsapp_send_queue', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+        _logger.info(f"Enqueued {len(messages)} WhatsApp messages ({broadcast_ref})")
+        return messages
+
+    @api.model
+    def get_broadcast_progress(self, broadcast_ref):
+        """Return message counts per status for a broadcast."""
+        counts = dict(self._read_group(
+            [('broadcast_ref', '=', broadcast_ref)],
+            ['status'],
+            ['__count'],
+        ))
+        total = sum(counts.values())
+        remaining = counts.get('pending', 0)
+        return {
+            'broadcast_ref': broadcast_ref,
+            'total': total,
+            'pending': remaining,
+            'sent': total - remaining - counts.get('failed', 0),
+            'failed': counts.get('failed', 0),
+            'progress': round((total - remaining) / total * 100, 1) if total else 100.0,
+        }
+
+    @api.model
+    def _cron_send_queue(self, batch_size=50):
+        """Cron job: send pending broadcast messages in committed chunks."""
+        IrCron = self.env['ir.cron']
+        domain = [
+            ('status', '=', 'pending'),
+            ('direction', '=', 'outgoing'),
+            ('broadcast_ref', '!=', False),
+        ]
+
+        IrCron._commit_progress(remaining=self.search_count(domain))
+        while True:
+            messages = self.search(domain, order='id', limit=batch_size)
+            if not messages:
+                break
+            for message in messages:
+                message.action_send()
+            if not IrCron._commit_progress(len(messages)):
+                # Out of time; the cron is re-triggered for the remainder
+                break
+        return True
+
+    @api.model
+    def _apply_status_updates(self, status_by_sid, received_at_by_sid=None):
+        """Apply delivery statuses reported by Twilio, in bulk.
+
+        Statuses only move forward (see STATUS_RANK); stale callbacks are
+        ignored. Messages are written in one batch per target status.
+
+        Args:
+            status_by_sid: dict of Twilio SID -> wfm.whatsapp.message status
+            received_at_by_sid: optional dict of Twilio SID -> {status:
+                datetime the callback was received}, used to stamp
+                delivered_at / read_at
+
+        Returns:
+            set of SIDs that matched an existing message
+        """
+        if not status_by_sid:
+            return set()
+
+        messages = self.search([('twilio_sid', 'in', list(status_by_sid))])
+        if received_at_by_sid:
+            self._stamp_delivery_times(messages, received_at_by_sid)
+
+        to_write = {}
+        for message in messages:
+            new_status = status_by_sid[message.twilio_sid]
+            if STATUS_RANK.get(new_status, -1) > STATUS_RANK.get(message.status, -1):
+                to_write.setdefault(new_status, []).append(message.id)
+
+        for new_status, message_ids in to_write.items():
+            self.browse(message_ids).write({'status': new_status})
+
+        return set(messages.mapped('twilio_sid'))
+
+    @api.model
+    def _stamp_delivery_times(self, messages, received_at_by_sid):
+        """Set delivered_at / read_at of many messages in one UPDATE.
+
+        Existing timestamps are kept, so only the first callback counts. A
+        read receipt implies delivery when the delivered callback is missing.
+        """
+        rows = []
+        for message in messages:
+            received = received_at_by_sid.get(message.twilio_sid) or {}
+            read_at = received.get('read')
+            delivered_at = received.get('delivered') or read_at
+            if delivered_at or read_at:
+                rows.append(SQL("(%s, %s::timestamp, %s::timestamp)", message.id, delivered_at, read_at))
+
+        if not rows:
+            return
+
+        self.env.cr.execute(SQL(
+            """
+            UPDATE wfm_whatsapp_message m
+               SET delivered_at = COALESCE(m.delivered_at, v.delivered_at),
+                   read_at = COALESCE(m.read_at, v.read_at)
+              FROM (VALUES %s) AS v(id, delivered_at, read_at)
+             WHERE m.id = v.id
+            """,
+            SQL(", ").join(rows),
+        ))
+        messages.invalidate_recordset(['delivered_at', 'read_at'])
@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+# Latency histogram upper bounds, in seconds (cumulative, Prometheus style)
+LATENCY_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 900, 3600)
+
+# Histogram name -> (start timestamp column, end timestamp column)
+LATENCY_STAGES = {
+    'queue': ('queued_at', 'sent_at'),
+    'delivery': ('sent_at', 'delivered_at'),
+    'read': ('delivered_at', 'read_at'),
+}
+
+
+class WfmWhatsAppMetrics(models.AbstractModel):
+    """Delivery latency, throughput and error metrics for WhatsApp messages.
+
+    Aggregated in SQL over the outgoing messages of a time window; served
+    as JSON via get_metrics and as Prometheus text on /whatsapp/metrics.
+    """
+
+    _name = 'wfm.whatsapp.metrics'
+    _description = 'WhatsApp Notification Metrics'
+
+    @api.model
+    def get_metrics(self, window_hours=24):
+        """Compute notification metrics over the last window_hours.
+
+        Returns:
+            dict with per message type counts, error rate and latency
+            histograms, plus current queue depth
+        """
+        since = fields.Datetime.now() - timedelta(hours=window_hours)
+
+        histogram_columns = []
+        for stage, (start, end) in LATENCY_STAGES.items():
+            latency = SQL("EXTRACT(EPOCH FROM (%s - %s))", SQL.identifier(end), SQL.identifier(start))
+            valid = SQL("%s IS NOT NULL AND %s IS NOT NULL", SQL.identifier(start), SQL.identifier(end))
+            histogram_columns.append(SQL("COUNT(*) FILTER (WHERE %s)", valid))
+            histogram_columns.append(SQL("COALESCE(SUM(%s) FILTER (WHERE %s), 0)", latency, valid))
+            for bound in LATENCY_BUCKETS:
+                histogram_columns.append(SQL("COUNT(*) FILTER (WHERE %s AND %s <= %s)", valid, latency, bound))
+
+        self.env['wfm.whatsapp.message'].flush_model()
+        self.env.cr.execute(SQL(
+            """
+            SELECT message_type,
+                   COUNT(*),
+                   COUNT(*) FILTER (WHERE status = 'pending'),
+                   COUNT(*) FILTER (WHERE status = 'failed'),
+                   COUNT(*) FILTER (WHERE sent_at IS NOT NULL),
+                   COUNT(*) FILTER (WHERE delivered_at IS NOT NULL),
+                   COUNT(*) FILTER (WHERE read_at IS NOT NULL),
+                   %s
+              FROM wfm_whatsapp_message
+             WHERE direction = 'outgoing'
+               AND queued_at >= %s
+             GROUP BY message_type
+            """,
+            SQL(", ").join(histogram_columns),
+            since,
+        ))
+
+        by_type = {}
+        for row in self.env.cr.fetchall():
+            message_type, total, pending, failed, sent, delivered, read = row[:7]
+            values = iter(row[7:])
+            histograms = {}
+            for stage in LATENCY_STAGES:
+                count = next(values)
+                total_seconds = float(next(values))
+                buckets = {bound: next(values) for bound in LATENCY_BUCKETS}
+                histograms[stage] = {
+                    'count': count,
+                    'sum': total_seconds,
+                    'avg': round(total_seconds / count, 2) if count else 0.0,
+                    'buckets': buckets,
+                }
+            attempted = total - pending
+            by_type[message_type] = {
+                'total': total,
+                'pending': pending,
+                'failed': failed,
+                'sent': sent,
+                'delivered': delivered,
+                'read': read,
+                'error_rate': round(failed / attempted, 4) if attempted else 0.0,
+                'latency': histograms,
+            }
+
+        return {
+            'window_hours': window_hours,
+            'message_types': by_type,
+            'queue': self._get_queue_depth(),
+        }
+
+    @api.model
+    def _get_queue_depth(self):
+        """Messages waiting to be sent and status callbacks waiting to be applied."""
+        Message = self.env['wfm.whatsapp.message']
+        pending_domain = [('status', '=', 'pending'), ('direction', '=', 'outgoing')]
+        oldest = Message.search(pending_domain, order='queued_at asc', limit=1)
+        oldest_age = (fields.Datetime.now() - oldest.queued_at).total_seconds() if oldest.queued_at else 0.0
+        return {
+            'pending_messages': Message.search_count(pending_domain),
+            'oldest_pending_seconds': oldest_age,
+            'pending_status_callbacks': self.env['wfm.whatsapp.status.event'].search_count([]),
+        }
+
+    @api.model
+    def render_prometheus(self, window_hours=24):
+        """Render get_metrics in the Prometheus text exposition format."""
+        metrics = self.get_metrics(window_hours=window_hours)
+        lines = []
+
+        def add(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_str = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+        types = metrics['message_types']
+        for status in ('total', 'pending', 'sent', 'delivered', 'read', 'failed'):
+            add(f"wfm_whatsapp_messages_{status}", 'gauge',
+                f"Outgoing messages ({status}) queued in the last {window_hours}h",
+                [({'type': t}, data[status]) for t, data in types.items()])
+
+        add('wfm_whatsapp_error_rate', 'gauge',
+            'Share of attempted sends that failed',
+            [({'type': t}, data['error_rate']) for t, data in types.items()])
+
+        for stage, (start, end) in LATENCY_STAGES.items():
+            name = f"wfm_whatsapp_{stage}_latency_seconds"
+            lines.append(f"# HELP {name} Latency from {start} to {end}")
+            lines.append(f"# TYPE {name} histogram")
+            for message_type, data in types.items():
+                histogram = data['latency'][stage]
+                for bound, count in histogram['buckets'].items():
+                    lines.append(f'{name}_bucket{{type="{message_type}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{type="{message_type}",le="+Inf"}} {histogram["count"]}')
+                lines.append(f'{name}_sum{{type="{message_type}"}} {histogram["sum"]}')
+                lines.append(f'{name}_count{{type="{message_type}"}} {histogram["count"]}')
+
+        queue = metrics['queue']
+        add('wfm_whatsapp_queue_pending_messages', 'gauge',
+            'Outgoing messages waiting to be sent', [({}, queue['pending_messages'])])
+        add('wfm_whatsapp_queue_oldest_pending_seconds', 'gauge',
+            'Age of the oldest pending message', [({}, queue['oldest_pending_seconds'])])
+        add('wfm_whatsapp_queue_status_callbacks', 'gauge',
+            'Buffered status callbacks not yet applied', [({}, queue['pending_status_callbacks'])])
+
+        return '\n'.join(lines) + '\n'
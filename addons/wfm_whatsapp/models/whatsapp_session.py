@@ -0,0 +1,82 @@
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.models import Constraint
+
+_logger = logging.getLogger(__name__)
+
+
+class WfmWhatsAppSession(models.Model):
+    """Short-lived conversation state of a partner's WhatsApp number.
+
+    Remembers the visit list last shown to the partner, in display order,
+    so follow-up commands like "visit 3 accept" resolve the number with a
+    single lookup and always refer to what the partner actually saw.
+    Stored in the database so every worker sees the same session.
+    """
+
+    _name = 'wfm.whatsapp.session'
+    _description = 'WhatsApp Conversation Session'
+    _rec_name = 'phone'
+
+    # Sessions expire after this many minutes without a new listing
+    SESSION_TTL_MINUTES = 30
+
+    phone = fields.Char(
+        string='Phone Number',
+        required=True
+    )
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Partner',
+        required=True,
+        ondelete='cascade'
+    )
+    visit_sequence = fields.Char(
+        string='Listed Visits',
+        help='Comma-separated visit IDs, in the order shown to the partner'
+    )
+    expires_at = fields.Datetime(
+        string='Expires At',
+        required=True
+    )
+
+    _phone_unique = Constraint(
+        'UNIQUE(phone)',
+        'A WhatsApp session already exists for this phone number.'
+    )
+
+    @api.model
+    def get_listed_visits(self, phone, partner):
+        """Return the visits last listed to this phone, in display order.
+
+        Returns None when there is no live session for the partner.
+        """
+        session = self.search([('phone', '=', phone)], limit=1)
+        if not session or session.partner_id != partner or session.expires_at < fields.Datetime.now():
+            return None
+        visit_ids = [int(vid) for vid in (session.visit_sequence or '').split(',') if vid]
+        return self.env['wfm.visit'].browse(visit_ids)
+
+    @api.model
+    def store_listed_visits(self, phone, partner, visits):
+        """Remember the visits shown to this phone and restart the TTL."""
+        vals = {
+            'partner_id': partner.id,
+            'visit_sequence': ','.join(str(vid) for vid in visits.ids),
+            'expires_at': fields.Datetime.now() + timedelta(minutes=self.SESSION_TTL_MINUTES),
+        }
+        session = self.search([('phone', '=', phone)], limit=1)
+        if session:
+            session.write(vals)
+        else:
+            self.create(dict(vals, phone=phone))
+        return True
+
+    @api.autovacuum
+    def _gc_expired_sessions(self):
+        """Delete expired sessions (daily autovacuum)."""
+        expired = self.search([('expires_at', '<', fields.Datetime.now())])
+        expired.unlink()
+        _logger.info(f"Removed {len(expired)} expired WhatsApp sessions")
@@ -0,0 +1,104 @@
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+from .whatsapp_message import TWILIO_STATUS_MAP, STATUS_RANK
+
+_logger = logging.getLogger(__name__)
+
+
+class WfmWhatsAppStatusEvent(models.Model):
+    """Buffered Twilio status callback, waiting to be applied.
+
+    The status webhook only inserts a row here; the ingestion cron
+    coalesces all pending callbacks per SID and applies them to
+    wfm.whatsapp.message in a few batched writes.
+    """
+
+    _name = 'wfm.whatsapp.status.event'
+    _description = 'WhatsApp Status Callback'
+    _order = 'id'
+    _log_access = False
+
+    twilio_sid = fields.Char(
+        string='Twilio SID',
+        required=True,
+        index=True
+    )
+    twilio_status = fields.Char(
+        string='Twilio Status',
+        required=True,
+        help='Raw MessageStatus value sent by Twilio'
+    )
+    received_at = fields.Datetime(
+        string='Received At',
+        required=True,
+        default=fields.Datetime.now
+    )
+
+    # Callbacks whose message is not (yet) known are retried for this long
+    UNMATCHED_RETENTION_HOURS = 1
+
+    @api.model
+    def enqueue(self, message_sid, message_status):
+        """Buffer one status callback and wake up the ingestion cron."""
+        self.create({
+            'twilio_sid': message_sid,
+            'twilio_status': message_status,
+        })
+        cron = self.env.ref('wfm_whatsapp.ir_cron_whatsapp_status_ingest', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+        return True
+
+    @api.model
+    def _cron_process_status_events(self, batch_size=5000):
+        """Cron job: coalesce buffered callbacks into batched status updates.
+
+        For each SID only the most advanced status is kept, so a burst of
+        queued/sent/delivered/read callbacks results in a single write.
+        """
+        Message = self.env['wfm.whatsapp.message']
+        processed = 0
+        last_id = 0
+
+        while True:
+            events = self.search([('id', '>', last_id)], limit=batch_size)
+            if not events:
+                break
+
+            status_by_sid = {}
+            received_at_by_sid = {}
+            for event in events:
+                new_status = TWILIO_STATUS_MAP.get(event.twilio_status)
+                if not new_status:
+                    continue
+                current = status_by_sid.get(event.twilio_sid)
+                if current is None or STATUS_RANK[new_status] > STATUS_RANK[current]:
+                    status_by_sid[event.twilio_sid] = new_status
+                # Earliest callback per status, for latency metrics
+                received = received_at_by_sid.setdefault(event.twilio_sid, {})
+                if new_status not in received or event.received_at < received[new_status]:
+                    received[new_status] = event.received_at
+
+            matched_sids = Message._apply_status_updates(status_by_sid, received_at_by_sid)
+
+            # Keep callbacks for messages not committed yet (Twilio can call
+            # back before action_send has stored the SID) until they expire.
+            expiry = fields.Datetime.now() - timedelta(hours=self.UNMATCHED_RETENTION_HOURS)
+            done = events.filtered(
+                lambda e: e.twilio_sid in matched_sids
+                or e.twilio_sid not in status_by_sid
+                or e.received_at < expiry
+            )
+            last_id = events[-1].id
+            done.unlink()
+            processed += len(done)
+
+            if len(events) < batch_size:
+                break
+
+        if processed:
+            _logger.info(f"Applied {processed} WhatsApp status callbacks")
+        return processed
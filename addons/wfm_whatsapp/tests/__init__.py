@@ -0,0 +1 @@
+from . import test_status_updates
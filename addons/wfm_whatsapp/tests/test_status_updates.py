@@ -0,0 +1,52 @@
+from odoo.tests.common import TransactionCase
+
+
+class TestWhatsAppStatusUpdates(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Message = cls.env['wfm.whatsapp.message']
+        cls.StatusEvent = cls.env['wfm.whatsapp.status.event']
+        partner = cls.env['res.partner'].create({'name': 'WhatsApp Partner', 'phone': '+306900000000'})
+        cls.messages = cls.Message.create([{
+            'partner_id': partner.id,
+            'phone': partner.phone,
+            'message_body': f'Message {sid}',
+            'status': 'sent',
+            'twilio_sid': sid,
+        } for sid in ('SM1', 'SM2', 'SM3')])
+
+    def test_status_only_moves_forward(self):
+        matched = self.Message._apply_status_updates({'SM1': 'read', 'SM2': 'delivered', 'SMX': 'read'})
+        self.assertEqual(matched, {'SM1', 'SM2'})
+        self.assertEqual(self.messages.mapped('status'), ['read', 'delivered', 'sent'])
+
+        # Late callbacks of a lower rank are ignored
+        self.Message._apply_status_updates({'SM1': 'delivered', 'SM2': 'sent', 'SM3': 'pending'})
+        self.assertEqual(self.messages.mapped('status'), ['read', 'delivered', 'sent'])
+
+    def test_apply_is_idempotent(self):
+        updates = {'SM1': 'delivered', 'SM2': 'failed'}
+        self.Message._apply_status_updates(updates)
+        self.Message._apply_status_updates(updates)
+        self.assertEqual(self.messages.mapped('status'), ['delivered', 'failed', 'sent'])
+
+    def test_events_coalesced_by_rank(self):
+        # Out-of-order callbacks of one SID: the most advanced one wins
+        for status in ('read', 'sent', 'delivered', 'queued'):
+            self.StatusEvent.enqueue('SM1', status)
+        self.StatusEvent.enqueue('SM2', 'undelivered')
+        self.StatusEvent.enqueue('SM2', 'sent')
+
+        self.StatusEvent._cron_process_status_events()
+
+        self.assertEqual(self.messages.mapped('status'), ['read', 'failed', 'sent'])
+        self.assertTrue(self.messages[0].read_at)
+        self.assertTrue(self.messages[0].delivered_at)
+        self.assertFalse(self.StatusEvent.search([]))
+
+        # Replaying the same callbacks changes nothing
+        self.StatusEvent.enqueue('SM1', 'delivered')
+        self.StatusEvent._cron_process_status_events()
+        self.assertEqual(self.messages[0].status, 'read')
@@ -1 +1,2 @@
 from . import whatsapp_compose
+from . import whatsapp_bulk_compose
@@ -0,0 +1,211 @@
+from markupsafe import Markup
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+
+class _PlaceholderValues(dict):
+    """Leave unknown {placeholders} untouched instead of raising KeyError."""
+
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+
+class WfmWhatsAppBulkCompose(models.TransientModel):
+    """Wizard to broadcast a WhatsApp template to many visits or partners.
+
+    Messages are rendered per recipient, created in one batch and sent by
+    the send queue cron, so the request returns immediately.
+    """
+
+    _name = 'wfm.whatsapp.bulk.compose'
+    _description = 'Bulk WhatsApp Message'
+
+    mode = fields.Selection([
+        ('visit', 'Visits'),
+        ('partner', 'Partners'),
+    ], string='Recipients', required=True, default=lambda self: self._default_mode())
+
+    visit_ids = fields.Many2many(
+        'wfm.visit',
+        string='Visits',
+        default=lambda self: self._default_active_ids('wfm.visit')
+    )
+    partner_ids = fields.Many2many(
+        'res.partner',
+        string='Partners',
+        default=lambda self: self._default_active_ids('res.partner')
+    )
+
+    template = fields.Selection([
+        ('assignment', 'Assignment Notification'),
+        ('confirmed', 'Confirmation'),
+        ('reminder', '24h Reminder'),
+        ('cancelled', 'Cancellation Notice'),
+        ('custom', 'Custom Message'),
+    ], string='Template', default='custom', required=True)
+
+    message_body = fields.Text(
+        string='Message',
+        help='Custom message. Placeholders: {partner_name}, and for visits '
+             '{visit_ref}, {visit_date}, {client_name}'
+    )
+
+    # Summary and sample preview
+    recipient_count = fields.Integer(
+        string='Recipients',
+        compute='_compute_recipients'
+    )
+    skipped_count = fields.Integer(
+        string='Without Phone',
+        compute='_compute_recipients'
+    )
+    preview = fields.Html(
+        string='Sample Preview',
+        compute='_compute_preview',
+        sanitize=False
+    )
+
+    def _default_mode(self):
+        return 'partner' if self.env.context.get('active_model') == 'res.partner' else 'visit'
+
+    def _default_active_ids(self, model):
+        """Get selected records from context."""
+        if self.env.context.get('active_model') == model:
+            active_ids = self.env.context.get('active_ids', [])
+            if active_ids:
+                return [(6, 0, active_ids)]
+        return []
+
+    @api.onchange('mode')
+    def _onchange_mode(self):
+        if self.mode == 'partner':
+            self.template = 'custom'
+
+    @api.depends('mode', 'visit_ids', 'partner_ids')
+    def _compute_recipients(self):
+        Message = self.env['wfm.whatsapp.message']
+        for wizard in self:
+            if wizard.mode == 'visit':
+                selection = wizard.visit_ids
+                reachable = selection.filtered(
+                    lambda v: v.partner_id and Message._get_partner_phone(v.partner_id)
+                )
+            else:
+                selection = wizard.partner_ids
+                reachable = selection.filtered(Message._get_partner_phone)
+            wizard.recipient_count = len(reachable)
+            wizard.skipped_count = len(selection) - len(reachable)
+
+    @api.depends('mode', 'template', 'message_body', 'visit_ids', 'partner_ids')
+    def _compute_preview(self):
+        """Render the message for the first recipient only."""
+        for wizard in self:
+            sample = wizard.visit_ids[:1] if wizard.mode == 'visit' else wizard.partner_ids[:1]
+            if not sample:
+                wizard.preview = Markup('<p class="text-muted">Select recipients to see a sample</p>')
+                continue
+            try:
+                body = wizard._render_body(sample)
+            except UserError as e:
+                wizard.preview = Markup('<p class="text-danger">%s</p>') % e
+                continue
+            partner = sample.partner_id if wizard.mode == 'visit' else sample
+            # Message text and names are user input: escaped by Markup
+            html_body = Markup('<br/>').join((body or '').split('\n'))
+            wizard.preview = Markup("""
+            <div style="background: #dcf8c6; border-radius: 10px; padding: 15px; max-width: 400px; font-family: sans-serif;">
+                <div style="font-size: 12px; color: #666; margin-bottom: 5px;">
+                    Sample to: %s (1 of %s)
+                </div>
+                <div style="font-size: 14px;">
+                    %s
+                </div>
+            </div>
+            """) % (partner.name or 'No partner', wizard.recipient_count, html_body)
+
+    def _render_body(self, record):
+        """Render the selected template for one visit or partner."""
+        self.ensure_one()
+        if self.template != 'custom':
+            return record._render_whatsapp_messages(self.template)[record.id]
+
+        if self.mode == 'visit':
+            values = _PlaceholderValues(
+                partner_name=record.partner_id.name or '',
+                visit_ref=record.name or '',
+                visit_date=record.visit_date.strftime('%d/%m/%Y') if record.visit_date else 'TBD',
+                client_name=record.client_id.name or 'N/A',
+            )
+        else:
+            values = _PlaceholderValues(partner_name=record.name or '')
+
+        try:
+            return (self.message_body or '').format_map(values)
+        except (ValueError, IndexError) as e:
+            raise UserError(_("Invalid placeholder in message: %s") % e)
+
+    def action_send(self):
+        """Render and enqueue all messages, then show the broadcast progress."""
+        self.ensure_one()
+
+        if self.template == 'custom' and not self.message_body:
+            raise UserError(_("Please enter a message."))
+        if self.mode == 'partner' and self.template != 'custom':
+            raise UserError(_("Visit templates can only be sent to a visit selection."))
+
+        Message = self.env['wfm.whatsapp.message']
+        broadcast_ref = Message._new_broadcast_ref()
+
+        if self.mode == 'visit':
+            visits = self.visit_ids
+            if not visits:
+                raise UserError(_("No visits selected."))
+            if self.template != 'custom':
+                messages, _skipped = visits._enqueue_whatsapp_notifications(
+                    self.template, broadcast_ref=broadcast_ref
+                )
+            else:
+                vals_list = []
+                for visit in visits:
+                    phone = visit.partner_id and Message._get_partner_phone(visit.partner_id)
+                    if not phone:
+                        continue
+                    vals_list.append({
+                        'partner_id': visit.partner_id.id,
+                        'phone': phone,
+                        'message_body': self._render_body(visit),
+                        'message_type': 'custom',
+                        'visit_id': visit.id,
+                    })
+                messages = Message.enqueue_messages(vals_list, broadcast_ref=broadcast_ref)
+            skipped_count = len(visits) - len(messages)
+        else:
+            if not self.partner_ids:
+                raise UserError(_("No partners selected."))
+            vals_list = []
+            for partner in self.partner_ids:
+                phone = Message._get_partner_phone(partner)
+                if not phone:
+                    continue
+                vals_list.append({
+                    'partner_id': partner.id,
+                    'phone': phone,
+                    'message_body': self._render_body(partner),
+                    'message_type': 'custom',
+                })
+            messages = Message.enqueue_messages(vals_list, broadcast_ref=broadcast_ref)
+            skipped_count = len(self.partner_ids) - len(messages)
+
+        if not messages:
+            raise UserError(_("None of the selected recipients has a phone number."))
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Broadcast %(ref)s: %(count)d queued, %(skipped)d skipped',
+                      ref=broadcast_ref, count=len(messages), skipped=skipped_count),
+            'res_model': 'wfm.whatsapp.message',
+            'view_mode': 'list,form',
+            'domain': [('broadcast_ref', '=', broadcast_ref)],
+            'context': {'group_by': 'status'},
+        }